@@ -1,6 +1,45 @@
+from collections import defaultdict
+
+from django import forms
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.forms import UserChangeForm
 
+from accounts.lookups import email_taken
 from accounts.models import AccountProfile
+from organizations.domains import match_domains
+from organizations.text import email_domain
+from regions.sharding import region_context
+
+
+@admin.action(description="Approve coaches whose email domain matches their association")
+def approve_domain_matched_coaches(modeladmin, request, queryset):
+    pending = list(
+        queryset.filter(
+            role=AccountProfile.Roles.COACH,
+            is_coach_approved=False,
+            association__isnull=False,
+        ).select_related("user", "association__region")
+    )
+    by_region = defaultdict(list)
+    for profile in pending:
+        by_region[profile.association.region].append(profile)
+
+    approved = []
+    for region, profiles in by_region.items():
+        with region_context(region):
+            matches = match_domains(region, {email_domain(profile.user.email) for profile in profiles})
+        approved.extend(
+            profile.pk
+            for profile in profiles
+            if profile.association in matches.get(email_domain(profile.user.email), [])
+        )
+    AccountProfile.objects.filter(pk__in=approved).update(is_coach_approved=True)
+    modeladmin.message_user(
+        request,
+        f"Approved {len(approved)} of {len(pending)} pending coaches; the rest need manual review.",
+    )
 
 
 @admin.register(AccountProfile)
@@ -8,3 +47,31 @@ class AccountProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "role", "phone_number", "is_coach_approved", "created_at")
     list_filter = ("role", "is_coach_approved")
     search_fields = ("user__username", "user__email")
+    actions = [approve_domain_matched_coaches]
+    readonly_fields = ("email_domain_matches",)
+
+    @admin.display(description="Associations matching email domain")
+    def email_domain_matches(self, obj):
+        region = obj.association.region if obj.association_id else None
+        if region is None or not obj.user_id:
+            return "-"
+        domain = email_domain(obj.user.email)
+        with region_context(region):
+            matches = match_domains(region, [domain])[domain] if domain else []
+        return ", ".join(association.name for association in matches) or "None"
+
+
+class AccountUserChangeForm(UserChangeForm):
+    def clean_email(self):
+        email = self.cleaned_data["email"]
+        if email_taken(email, self.instance):
+            raise forms.ValidationError("Another account already uses this email address.")
+        return email
+
+
+admin.site.unregister(get_user_model())
+
+
+@admin.register(get_user_model())
+class AccountUserAdmin(UserAdmin):
+    form = AccountUserChangeForm
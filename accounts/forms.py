@@ -1,14 +1,20 @@
 from django import forms
-from django.contrib.auth import get_user_model
 
+from accounts.lookups import email_in_use
+from organizations.domains import associations_for_email
 from organizations.models import Association
+from organizations.widgets import AssociationTypeaheadSelect, AssociationTypeaheadSelectMultiple
 from profiles.models import PlayerProfile
 
 
 class CoachSignupForm(forms.Form):
     first_name = forms.CharField(max_length=150)
     last_name = forms.CharField(max_length=150)
-    association = forms.ModelChoiceField(queryset=Association.objects.none())
+    association = forms.ModelChoiceField(
+        queryset=Association.objects.none(),
+        required=False,
+        widget=AssociationTypeaheadSelect,
+    )
     email = forms.EmailField()
     phone_number = forms.CharField(max_length=30)
     password = forms.CharField(widget=forms.PasswordInput)
@@ -17,6 +23,8 @@ class CoachSignupForm(forms.Form):
     def __init__(self, *args, **kwargs):
         region = kwargs.pop("region", None)
         super().__init__(*args, **kwargs)
+        self.region = region
+        self.domain_match = False
         if region is not None:
             self.fields["association"].queryset = Association.objects.filter(
                 region=region,
@@ -34,8 +42,7 @@ class CoachSignupForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data.get("email", "").strip().lower()
-        user_model = get_user_model()
-        if user_model.objects.filter(email__iexact=email).exists():
+        if email_in_use(email):
             raise forms.ValidationError("An account with this email already exists.")
         return email
 
@@ -45,6 +52,18 @@ class CoachSignupForm(forms.Form):
         confirm = cleaned_data.get("confirm_password")
         if password and confirm and password != confirm:
             self.add_error("confirm_password", "Passwords do not match.")
+
+        email = cleaned_data.get("email")
+        matches = associations_for_email(self.region, email) if email and self.region else []
+        association = cleaned_data.get("association")
+        if association is None:
+            if len(matches) == 1:
+                association = cleaned_data["association"] = matches[0]
+            elif matches:
+                self.add_error("association", "Your email domain matches several associations; select yours.")
+            else:
+                self.add_error("association", "Select your association.")
+        self.domain_match = association is not None and association in matches
         return cleaned_data
 
 
@@ -57,13 +76,14 @@ class PlayerSignupForm(forms.Form):
     current_association = forms.ModelChoiceField(
         queryset=Association.objects.none(),
         required=False,
+        widget=AssociationTypeaheadSelect,
     )
     available_for_transfer = forms.BooleanField(required=False)
     profile_visibility = forms.ChoiceField(choices=PlayerProfile.Visibility.choices)
     visible_associations = forms.ModelMultipleChoiceField(
         queryset=Association.objects.none(),
         required=False,
-        widget=forms.SelectMultiple,
+        widget=AssociationTypeaheadSelectMultiple,
     )
     pbr_url = forms.URLField(required=False)
     pg_url = forms.URLField(required=False)
@@ -106,8 +126,7 @@ class PlayerSignupForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data.get("email", "").strip().lower()
-        user_model = get_user_model()
-        if user_model.objects.filter(email__iexact=email).exists():
+        if email_in_use(email):
             raise forms.ValidationError("An account with this email already exists.")
         return email
 
@@ -143,3 +162,13 @@ class ResendVerificationForm(forms.Form):
         field = self.fields["email"]
         if isinstance(field.widget, (forms.TextInput, forms.EmailInput)):
             field.widget.attrs.setdefault("class", "form-control")
+
+
+class RosterUploadForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row; XLSX also works when openpyxl is installed.")
+    dry_run = forms.BooleanField(required=False, initial=True, help_text="Only validate and report.")
+    send_invitations = forms.BooleanField(
+        required=False,
+        initial=True,
+        help_text="Email each new account a link to set its password.",
+    )
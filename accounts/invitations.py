@@ -0,0 +1,53 @@
+"""Invitations for accounts created on a member's behalf, e.g. by a roster import.
+
+Those accounts start inactive with an unusable password. An invitation link
+carries a password-reset token; choosing a password through it activates the
+account, and the new password hash retires the link.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mass_mail
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+INVITATION_SUBJECT = "Set up your transfer portal account"
+
+
+def invitation_path(user) -> str:
+    uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
+    return reverse("accept_invitation", args=[uidb64, default_token_generator.make_token(user)])
+
+
+def invited_user(uidb64: str, token: str):
+    """The account an invitation link was issued for, or ``None`` if it is invalid, expired or used."""
+    user_model = get_user_model()
+    try:
+        user = user_model._default_manager.get(pk=urlsafe_base64_decode(uidb64).decode())
+    except (TypeError, ValueError, OverflowError, user_model.DoesNotExist):
+        return None
+    if user.has_usable_password() or not default_token_generator.check_token(user, token):
+        return None
+    return user
+
+
+def invitation_message(user, url: str) -> tuple[str, str, str, list[str]]:
+    days = settings.PASSWORD_RESET_TIMEOUT // (60 * 60 * 24)
+    body = (
+        "An account has been created for you. Choose a password to activate it:\n\n"
+        f"{url}\n\n"
+        f"The link works once and expires in {days} days. If you were not expecting this "
+        "email, you can ignore it."
+    )
+    return INVITATION_SUBJECT, body, settings.DEFAULT_FROM_EMAIL, [user.email]
+
+
+def send_invitations(users, base_url: str) -> int:
+    """Email each of ``users`` an invitation link under ``base_url``; returns the number sent."""
+    base_url = base_url.rstrip("/")
+    return send_mass_mail(
+        [invitation_message(user, f"{base_url}{invitation_path(user)}") for user in users if user.email]
+    )
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from accounts.models import AccountProfile
+
+
+def normalize_identifier(value) -> str:
+    return (value or "").strip().lower()
+
+
+def normalized_email(email):
+    return normalize_identifier(email) or None
+
+
+def _identifier_q(prefix: str, value: str) -> Q:
+    return Q(**{f"{prefix}normalized_email": value}) | Q(**{f"{prefix}normalized_username": value})
+
+
+def email_in_use(email: str) -> bool:
+    """True if any account has this email, or uses it as its username."""
+    value = normalize_identifier(email)
+    return bool(value) and AccountProfile.objects.filter(_identifier_q("", value)).exists()
+
+
+def email_taken(email: str, user) -> bool:
+    """True if another account already holds this email in ``normalized_email``."""
+    value = normalized_email(email)
+    return value is not None and AccountProfile.objects.filter(normalized_email=value).exclude(user=user).exists()
+
+
+def user_for_email(email: str):
+    value = normalize_identifier(email)
+    if not value:
+        return None
+    return get_user_model().objects.filter(_identifier_q("profile__", value)).select_related("profile").first()
+
+
+def backfill_normalized_identifiers(profile_model=AccountProfile, batch_size=2000):
+    """Recompute the normalized columns of every profile from its user.
+
+    When several accounts share an email case-insensitively the oldest profile
+    keeps it and the others are stored as NULL. Returns the number of updated
+    profiles and the ``(user_id, email)`` pairs that lost their email.
+    """
+    seen = set()
+    duplicates = []
+    changed = []
+    profiles = (
+        profile_model.objects.select_related("user")
+        .only("id", "normalized_email", "normalized_username", "user__email", "user__username")
+        .order_by("pk")
+    )
+    for profile in profiles.iterator(chunk_size=batch_size):
+        email = normalized_email(profile.user.email)
+        if email in seen:
+            duplicates.append((profile.user_id, profile.user.email))
+            email = None
+        elif email is not None:
+            seen.add(email)
+        username = normalize_identifier(profile.user.username)
+        if (profile.normalized_email, profile.normalized_username) != (email, username):
+            profile.normalized_email = email
+            profile.normalized_username = username
+            changed.append(profile)
+
+    # Release the old values first so swapped emails do not trip the unique index.
+    for start in range(0, len(changed), batch_size):
+        ids = [profile.pk for profile in changed[start:start + batch_size]]
+        profile_model.objects.filter(pk__in=ids).update(normalized_email=None)
+    profile_model.objects.bulk_update(changed, ["normalized_email", "normalized_username"], batch_size=batch_size)
+    return len(changed), duplicates
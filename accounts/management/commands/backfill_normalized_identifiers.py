@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from accounts.lookups import backfill_normalized_identifiers
+
+
+class Command(BaseCommand):
+    help = "Recompute the normalized email/username columns used for signup and login lookups."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        updated, duplicates = backfill_normalized_identifiers(batch_size=options["batch_size"])
+        for user_id, email in duplicates:
+            self.stdout.write(self.style.WARNING(f"User {user_id} shares email {email} with an older account."))
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} account profiles."))
@@ -0,0 +1,157 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+from accounts.services import PlayerSignup, register_players
+from availability.models import OpenPlayerDocument
+from contacts.models import ContactRequest
+from organizations.models import Association, Team
+from regions.models import Region
+from tryouts.models import TryoutEvent
+
+SOURCE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the tryout, open player and contact request lists with --rows rows each, "
+        "comparing template loaders and cold/warm row fragment caches. "
+        "All rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--region", default="bc")
+
+    def handle(self, *args, **options):
+        region = Region.objects.get(code=options["region"])
+        with transaction.atomic():
+            pages = self._seed(region, options["rows"])
+            self._run(region, pages, options["repeat"])
+            transaction.set_rollback(True)
+        caches["template_fragments"].clear()
+
+    def _seed(self, region, count):
+        user_model = get_user_model()
+        started = time.perf_counter()
+        association = Association.objects.create(region=region, name="Benchmark Association")
+        team = Team.objects.create(
+            region=region, association=association, name="Benchmark Team", age_group="13U", level="AAA"
+        )
+        coach = user_model.objects.create_user(username="benchmark-coach")
+        player = user_model.objects.create_user(username="benchmark-player")
+
+        TryoutEvent.objects.bulk_create(
+            [
+                TryoutEvent(
+                    region=region,
+                    association=association,
+                    team=team,
+                    name=f"Benchmark Tryout {index}",
+                    start_date=date(2030, 1, 1) + timedelta(days=index % 365),
+                    end_date=date(2030, 1, 1) + timedelta(days=index % 365),
+                    location="Benchmark Field",
+                    registration_url="https://example.com/register",
+                    notes="Bring a glove and water.",
+                    is_active=True,
+                )
+                for index in range(count)
+            ],
+            batch_size=500,
+        )
+        register_players(
+            region,
+            [
+                PlayerSignup(
+                    email=f"benchmark-player-{index}@example.com",
+                    first_name="Benchmark",
+                    last_name=f"Player {index}",
+                    birth_year=2012,
+                    available_for_transfer=True,
+                )
+                for index in range(count)
+            ],
+        )
+        documents = list(OpenPlayerDocument.objects.filter(region=region, username__startswith="benchmark-player-"))
+        for document in documents:
+            document.positions = ["SS", "2B", "P"]
+            document.levels = ["AAA", "AA"]
+        OpenPlayerDocument.objects.bulk_update(documents, ["positions", "levels"], batch_size=500)
+        ContactRequest.objects.bulk_create(
+            [
+                ContactRequest(
+                    player=player,
+                    requesting_team=team,
+                    requesting_association=association,
+                    requested_by=coach,
+                    region=region,
+                    status=ContactRequest.Status.DECLINED,
+                    message="We would like to talk about next season.",
+                )
+                for _ in range(count)
+            ],
+            batch_size=500,
+        )
+        self.stdout.write(f"Seeded {count} rows per list in {time.perf_counter() - started:.2f}s")
+
+        tryouts = TryoutEvent.objects.filter(association=association).select_related("association", "team")
+        requests = ContactRequest.objects.filter(player=player).select_related(
+            "requesting_team", "requesting_association", "requested_by"
+        )
+        return [
+            ("tryouts/list.html", AnonymousUser(), {"tryouts": list(tryouts), "filters": {}}),
+            ("coaches/open_players.html", coach, {"players": documents}),
+            ("players/requests.html", player, {"requests": list(requests)}),
+        ]
+
+    def _run(self, region, pages, repeat):
+        cached = engines["django"].engine
+        uncached = Engine(
+            dirs=cached.dirs,
+            context_processors=cached.context_processors,
+            loaders=SOURCE_LOADERS,
+            libraries=cached.libraries,
+            debug=cached.debug,
+        )
+        fragments = caches["template_fragments"]
+        factory = RequestFactory()
+
+        for name, user, context in pages:
+            request = factory.get("/", HTTP_HOST=f"{region.code}.localhost")
+            request.user = user
+            request.region = region
+            request.region_code = region.code
+
+            def render(engine):
+                return engine.get_template(name).render(RequestContext(request, context))
+
+            def cold(engine):
+                fragments.clear()
+                return render(engine)
+
+            cases = [
+                ("source loaders, cold fragments", lambda: cold(uncached)),
+                ("cached loader, cold fragments", lambda: cold(cached)),
+                ("cached loader, warm fragments", lambda: render(cached)),
+            ]
+            self.stdout.write(name)
+            for label, func in cases:
+                # Also warms the fragments for the last case.
+                func()
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    func()
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(f"  {label}: best of {repeat} = {min(timings) * 1000:.1f} ms")
@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.lookups import email_in_use, normalize_identifier
+from accounts.models import AccountProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark case-insensitive email/username lookups against synthetic accounts. "
+        "All rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options["users"])
+            self._run(options["users"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def _seed(self, count):
+        user_model = get_user_model()
+        started = time.perf_counter()
+        users = user_model.objects.bulk_create(
+            [
+                user_model(username=f"Benchmark-User-{index}", email=f"Benchmark-User-{index}@Example.com")
+                for index in range(count)
+            ],
+            batch_size=2000,
+        )
+        # bulk_create skips post_save, so create the profiles the signal would have.
+        AccountProfile.objects.bulk_create(
+            [
+                AccountProfile(
+                    user=user,
+                    normalized_email=normalize_identifier(user.email),
+                    normalized_username=normalize_identifier(user.username),
+                )
+                for user in users
+            ],
+            batch_size=2000,
+        )
+        self.stdout.write(f"Seeded {count} accounts in {time.perf_counter() - started:.2f}s")
+
+    def _run(self, count, repeat):
+        user_model = get_user_model()
+        email = f"benchmark-user-{count // 2}@example.COM"
+
+        def iexact():
+            return user_model.objects.filter(Q(email__iexact=email) | Q(username__iexact=email)).exists()
+
+        cases = [
+            ("iexact on auth_user (email or username)", iexact),
+            ("normalized columns on account profile", lambda: email_in_use(email)),
+        ]
+        for label, func in cases:
+            timings = []
+            result = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - started)
+            best = min(timings) * 1000
+            self.stdout.write(f"{label}: found={result}, best of {repeat} = {best:.2f} ms")
+
+        value = normalize_identifier(email)
+        plans = [
+            ("iexact", user_model.objects.filter(Q(email__iexact=email) | Q(username__iexact=email))),
+            (
+                "normalized",
+                AccountProfile.objects.filter(Q(normalized_email=value) | Q(normalized_username=value)),
+            ),
+        ]
+        for label, queryset in plans:
+            self.stdout.write(f"{label} plan:\n{queryset.explain()}")
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.invitations import send_invitations
+from accounts.roster import CHUNK_SIZE, RosterError, import_roster, read_roster
+from organizations.models import Association
+from regions.models import Region
+from regions.sharding import region_context
+
+
+class Command(BaseCommand):
+    help = (
+        "Import players and coaches from a roster CSV (or XLSX with openpyxl). Columns: "
+        "role, email, first_name, last_name, phone_number, birth_year, association, team, "
+        "available_for_transfer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--region", required=True, help="Region code the roster belongs to.")
+        parser.add_argument("--association", type=int, help="Association id for rows without one.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and report without writing.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "--invite",
+            metavar="BASE_URL",
+            help="Email every new account a link to set its password, e.g. https://bc.example.com.",
+        )
+
+    def handle(self, *args, **options):
+        region = Region.objects.filter(code=options["region"].lower()).first()
+        if region is None:
+            raise CommandError(f"Unknown region: {options['region']}")
+
+        with region_context(region):
+            association = None
+            if options["association"]:
+                association = Association.objects.filter(region=region, pk=options["association"]).first()
+                if association is None:
+                    raise CommandError(f"Unknown association {options['association']} in {region.code}")
+            try:
+                with open(options["path"], "rb") as file:
+                    result = import_roster(
+                        region,
+                        read_roster(file, options["path"]),
+                        association=association,
+                        dry_run=options["dry_run"],
+                        chunk_size=options["chunk_size"],
+                    )
+            except (OSError, RosterError) as exc:
+                raise CommandError(str(exc)) from exc
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error.line} ({error.email or 'no email'}): {error.message}")
+        verb = "Would import" if result.dry_run else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.players} players and {result.coaches} coaches from {result.rows} rows "
+            f"({len(result.errors)} errors) in {result.seconds:.2f}s, {result.rows_per_second:.0f} rows/s."
+        ))
+        if options["invite"] and not result.dry_run:
+            sent = send_invitations(result.users, options["invite"])
+            self.stdout.write(f"Sent {sent} invitations.")
+        elif not result.dry_run and result.users:
+            self.stdout.write(
+                "No invitations sent (--invite); members can request one from the resend-verification page."
+            )
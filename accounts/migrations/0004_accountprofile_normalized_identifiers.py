@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+from accounts.lookups import backfill_normalized_identifiers
+
+
+def backfill(apps, schema_editor):
+    backfill_normalized_identifiers(apps.get_model("accounts", "AccountProfile"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_accountprofile_association'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountprofile',
+            name='normalized_email',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='accountprofile',
+            name='normalized_username',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=150),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -29,6 +29,10 @@ class AccountProfile(models.Model):
         blank=True,
         related_name="coaches",
     )
+    # Lowercased copies of user.email / user.username for indexed equality
+    # lookups; kept in sync by accounts.signals. Blank emails are stored as NULL.
+    normalized_email = models.CharField(max_length=254, null=True, blank=True, unique=True, editable=False)
+    normalized_username = models.CharField(max_length=150, blank=True, db_index=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
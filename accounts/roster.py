@@ -0,0 +1,248 @@
+"""Bulk roster import for association onboarding.
+
+Rows are streamed from CSV (or XLSX when openpyxl is installed) and handled
+in chunks: each chunk is validated with one query per lookup table and then
+written through ``accounts.services`` in its own transaction, so a bad row
+is reported without stopping the rest of the file.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from accounts.lookups import normalize_identifier
+from accounts.services import CoachSignup, PlayerSignup, existing_identifiers, register_coaches, register_players
+from organizations.models import Association, Team
+from organizations.text import normalize_search_text
+from regions.sharding import region_context
+
+ROSTER_COLUMNS = (
+    "role",
+    "email",
+    "first_name",
+    "last_name",
+    "phone_number",
+    "birth_year",
+    "association",
+    "team",
+    "available_for_transfer",
+)
+ROLES = ("player", "coach")
+TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+CHUNK_SIZE = 1000
+MAX_LENGTHS = {"email": 150, "first_name": 150, "last_name": 150, "phone_number": 30}
+# Same bounds as PlayerSignupForm.birth_year.
+MIN_BIRTH_YEAR, MAX_BIRTH_YEAR = 1900, 2100
+
+
+class RosterError(Exception):
+    """The file as a whole cannot be read."""
+
+
+@dataclass
+class RowError:
+    line: int
+    email: str
+    message: str
+
+
+@dataclass
+class RosterImportResult:
+    rows: int = 0
+    players: int = 0
+    coaches: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    users: list = field(default_factory=list)
+    seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_roster(file, name: str = ""):
+    """Yield ``(line, row)`` pairs with lowercased column names from a binary file."""
+    if name.lower().endswith(".xlsx"):
+        yield from _read_xlsx(file)
+        return
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    try:
+        if not reader.fieldnames or "email" not in {_column(column) for column in reader.fieldnames}:
+            raise RosterError("The file needs a header row with at least an email column.")
+        for row in reader:
+            yield reader.line_num, {_column(key): (value or "").strip() for key, value in row.items() if key}
+    except UnicodeDecodeError as exc:
+        raise RosterError("The file is not UTF-8 text; save the roster as a UTF-8 CSV.") from exc
+
+
+def _read_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RosterError("XLSX rosters need openpyxl installed; upload a CSV instead.") from exc
+    rows = load_workbook(file, read_only=True, data_only=True).active.iter_rows(values_only=True)
+    header = [_column(value or "") for value in next(rows, [])]
+    if "email" not in header:
+        raise RosterError("The file needs a header row with at least an email column.")
+    for line, values in enumerate(rows, start=2):
+        yield line, {
+            key: "" if value is None else str(value).strip()
+            for key, value in zip(header, values)
+            if key
+        }
+
+
+def _column(name: str) -> str:
+    return name.strip().lower().replace(" ", "_")
+
+
+def import_roster(region, rows, *, association=None, dry_run=False, chunk_size=CHUNK_SIZE):
+    """Import ``(line, row)`` pairs into ``region``.
+
+    ``association`` is used for rows that leave the association column blank.
+    Accounts are created inactive without a password and collected in
+    ``result.users``; ``accounts.invitations.send_invitations`` emails their
+    members a link to choose one, which activates the account.
+    """
+    result = RosterImportResult(dry_run=dry_run)
+    seen = set()
+    started = time.perf_counter()
+    rows = iter(rows)
+    with region_context(region):
+        while chunk := list(islice(rows, chunk_size)):
+            result.rows += len(chunk)
+            _import_chunk(region, chunk, association, dry_run, seen, result)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _import_chunk(region, chunk, default_association, dry_run, seen, result):
+    associations = _associations_by_name(region, chunk)
+    association_ids = {association.id for association in associations.values()}
+    if default_association is not None:
+        association_ids.add(default_association.id)
+    teams = _teams_by_name(association_ids, chunk)
+    taken = existing_identifiers([normalize_identifier(row.get("email")) for _, row in chunk])
+
+    players, coaches = [], []
+    lines = {}
+    for line, row in chunk:
+        email = normalize_identifier(row.get("email"))
+        try:
+            signup = _signup(row, email, associations, teams, default_association)
+        except ValidationError as exc:
+            result.errors.append(RowError(line, email, " ".join(exc.messages)))
+            continue
+        if email in seen:
+            result.errors.append(RowError(line, email, "Repeats an earlier row."))
+            continue
+        if email in taken:
+            result.errors.append(RowError(line, email, "An account with this email already exists."))
+            continue
+        seen.add(email)
+        lines[email] = line
+        (players if isinstance(signup, PlayerSignup) else coaches).append(signup)
+
+    if dry_run:
+        result.players += len(players)
+        result.coaches += len(coaches)
+        return
+    for register, signups, counter in (
+        (register_players, players, "players"),
+        (register_coaches, coaches, "coaches"),
+    ):
+        if not signups:
+            continue
+        users, skipped = register(region, signups)
+        setattr(result, counter, getattr(result, counter) + len(users))
+        result.users.extend(users)
+        for signup in skipped:
+            # Created by someone else since the chunk was validated.
+            email = normalize_identifier(signup.email)
+            result.errors.append(RowError(lines[email], email, "An account with this email already exists."))
+
+
+def _associations_by_name(region, chunk) -> dict:
+    names = {normalize_search_text(row.get("association")) for _, row in chunk} - {""}
+    if not names:
+        return {}
+    return {
+        association.search_name: association
+        for association in Association.objects.filter(region=region, search_name__in=names)
+    }
+
+
+def _teams_by_name(association_ids, chunk) -> dict:
+    if not association_ids or not any(row.get("team") for _, row in chunk):
+        return {}
+    return {
+        (team.association_id, team.name.casefold()): team
+        for team in Team.objects.filter(association_id__in=association_ids, is_active=True)
+    }
+
+
+def _signup(row, email, associations, teams, default_association):
+    errors = []
+    role = (row.get("role") or "player").lower()
+    if role not in ROLES:
+        errors.append(f"Unknown role {role!r}; use player or coach.")
+    try:
+        validate_email(email)
+    except ValidationError:
+        errors.append("Enter a valid email address.")
+
+    association = default_association
+    if row.get("association"):
+        association = associations.get(normalize_search_text(row["association"]))
+        if association is None:
+            errors.append(f"Unknown association {row['association']!r}.")
+
+    team = None
+    if role == "coach" and row.get("team"):
+        team = teams.get((association.id, row["team"].casefold())) if association else None
+        if team is None:
+            errors.append(f"Unknown team {row['team']!r} for this association.")
+
+    for column, limit in MAX_LENGTHS.items():
+        if len(row.get(column) or "") > limit:
+            errors.append(f"{column} is longer than {limit} characters.")
+
+    birth_year = None
+    if row.get("birth_year"):
+        try:
+            birth_year = int(float(row["birth_year"]))
+        except (ValueError, OverflowError):
+            errors.append(f"Birth year {row['birth_year']!r} is not a number.")
+        else:
+            if not MIN_BIRTH_YEAR <= birth_year <= MAX_BIRTH_YEAR:
+                errors.append(f"Birth year {birth_year} is not between {MIN_BIRTH_YEAR} and {MAX_BIRTH_YEAR}.")
+    if errors:
+        raise ValidationError(errors)
+
+    names = {
+        "email": email,
+        "first_name": row.get("first_name", ""),
+        "last_name": row.get("last_name", ""),
+        "phone_number": row.get("phone_number", ""),
+    }
+    if role == "coach":
+        # Rosters are uploaded by staff for the association, so its coaches start approved.
+        return CoachSignup(
+            **names,
+            association=association,
+            teams=[team] if team else [],
+            is_coach_approved=association is not None,
+        )
+    return PlayerSignup(
+        **names,
+        birth_year=birth_year,
+        current_association=association,
+        available_for_transfer=(row.get("available_for_transfer") or "").lower() in TRUE_VALUES,
+    )
@@ -0,0 +1,243 @@
+"""Player and coach account provisioning shared by web signup and roster imports.
+
+Every row is written with ``bulk_create`` (one INSERT per table per batch)
+inside one transaction per database involved, so nothing is left half
+created. ``bulk_create`` bypasses ``post_save``, so the work the signals
+would have done (account profile, search document, change feed, cache
+versions, shard reference rows) is done here in bulk instead.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack
+from dataclasses import dataclass, field, fields
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models import Q
+
+from accounts.lookups import normalize_identifier, normalized_email
+from accounts.models import AccountProfile
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from availability.search import build_open_player_document, bump_search_cache_version
+from feeds.changes import record_changes
+from feeds.models import ChangeEntry
+from organizations.models import TeamCoach
+from profiles.models import PlayerProfile
+from regions.cache import bump_version
+from regions.sharding import bulk_create_with_references, region_context
+
+BATCH_SIZE = 1000
+
+
+@dataclass
+class PlayerSignup:
+    email: str
+    first_name: str = ""
+    last_name: str = ""
+    # None leaves the account with an unusable password (set on first reset).
+    password: str | None = None
+    phone_number: str = ""
+    birth_year: int | None = None
+    current_association: object = None
+    profile_visibility: str = PlayerProfile.Visibility.NONE
+    visible_associations: list = field(default_factory=list)
+    available_for_transfer: bool = False
+    pbr_url: str = ""
+    pg_url: str = ""
+    youtube_url: str = ""
+    instagram_handle: str = ""
+    twitter_handle: str = ""
+    bio: str = ""
+
+    @classmethod
+    def from_cleaned_data(cls, data) -> PlayerSignup:
+        names = {f.name for f in fields(cls)}
+        return cls(**{name: value for name, value in data.items() if name in names and value is not None})
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+@dataclass
+class CoachSignup:
+    email: str
+    first_name: str = ""
+    last_name: str = ""
+    password: str | None = None
+    phone_number: str = ""
+    association: object = None
+    teams: list = field(default_factory=list)
+    is_coach_approved: bool = False
+
+
+def _atomic(*models):
+    stack = ExitStack()
+    for alias in sorted({DEFAULT_DB_ALIAS, *(router.db_for_write(model) for model in models)}):
+        stack.enter_context(transaction.atomic(using=alias))
+    return stack
+
+
+def existing_identifiers(values) -> set[str]:
+    """Normalized emails and usernames among ``values`` that already have an account."""
+    profiles = AccountProfile.objects.filter(Q(normalized_email__in=values) | Q(normalized_username__in=values))
+    found = set()
+    for email, username in profiles.values_list("normalized_email", "normalized_username"):
+        found.update((email, username))
+    return found
+
+
+def _accept(signups):
+    """Split ``signups`` into new accounts and ones whose email is taken or repeated."""
+    taken = existing_identifiers([normalize_identifier(signup.email) for signup in signups])
+    accepted, skipped = [], []
+    for signup in signups:
+        email = normalized_email(signup.email)
+        if email is None or email in taken:
+            skipped.append(signup)
+            continue
+        taken.add(email)
+        accepted.append(signup)
+    return accepted, skipped
+
+
+def register_players(region, signups, *, is_active=False, batch_size=BATCH_SIZE):
+    """Create players for ``signups``; returns ``(users, skipped)``.
+
+    Signups whose email already belongs to an account, or repeats an earlier
+    one in the same call, are skipped and returned unchanged.
+    """
+    signups = list(signups)
+    with region_context(region):
+        accepted, skipped = _accept(signups)
+        if not accepted:
+            return [], skipped
+        with _atomic(PlayerAvailability, OpenPlayerDocument):
+            users = _create_players(region, accepted, is_active, batch_size)
+    return users, skipped
+
+
+def register_player(region, signup: PlayerSignup, *, is_active=False):
+    """Web signup: the single-row case of ``register_players``; ``None`` if the email is taken."""
+    users, _ = register_players(region, [signup], is_active=is_active)
+    return users[0] if users else None
+
+
+def register_coaches(region, signups, *, is_active=False, batch_size=BATCH_SIZE):
+    """Create coaches and their team memberships; same contract as ``register_players``."""
+    signups = list(signups)
+    with region_context(region):
+        accepted, skipped = _accept(signups)
+        if not accepted:
+            return [], skipped
+        with _atomic(TeamCoach):
+            users = _create_users(accepted, is_active, batch_size)
+            bulk_create_with_references(
+                AccountProfile,
+                [
+                    _account_profile(
+                        user,
+                        signup,
+                        role=AccountProfile.Roles.COACH,
+                        association=signup.association,
+                        is_coach_approved=signup.is_coach_approved,
+                    )
+                    for user, signup in zip(users, accepted)
+                ],
+                batch_size,
+            )
+            bulk_create_with_references(
+                TeamCoach,
+                [TeamCoach(user=user, team=team) for user, signup in zip(users, accepted) for team in signup.teams],
+                batch_size,
+            )
+    return users, skipped
+
+
+def _create_users(signups, is_active, batch_size):
+    user_model = get_user_model()
+    users = []
+    for signup in signups:
+        email = normalize_identifier(signup.email)
+        users.append(user_model(
+            username=email,
+            email=email,
+            first_name=signup.first_name,
+            last_name=signup.last_name,
+            is_active=is_active,
+            password=make_password(signup.password),
+        ))
+    return bulk_create_with_references(user_model, users, batch_size)
+
+
+def _account_profile(user, signup, **values):
+    profile = AccountProfile(
+        user=user,
+        phone_number=signup.phone_number,
+        normalized_email=normalized_email(user.email),
+        normalized_username=normalize_identifier(user.username),
+        **values,
+    )
+    user.profile = profile
+    return profile
+
+
+def _create_players(region, signups, is_active, batch_size):
+    users = _create_users(signups, is_active, batch_size)
+    account_profiles = []
+    player_profiles = []
+    for user, signup in zip(users, signups):
+        account_profiles.append(_account_profile(user, signup, role=AccountProfile.Roles.PLAYER))
+        player_profile = PlayerProfile(
+            user=user,
+            display_name=signup.display_name,
+            birth_year=signup.birth_year,
+            current_association=signup.current_association,
+            profile_visibility=signup.profile_visibility,
+            pbr_url=signup.pbr_url,
+            pg_url=signup.pg_url,
+            youtube_url=signup.youtube_url,
+            instagram_handle=signup.instagram_handle,
+            twitter_handle=signup.twitter_handle,
+            bio=signup.bio,
+        )
+        user.player_profile = player_profile
+        player_profiles.append(player_profile)
+    bulk_create_with_references(AccountProfile, account_profiles, batch_size)
+    bulk_create_with_references(PlayerProfile, player_profiles, batch_size)
+
+    through = PlayerProfile.visible_associations.through
+    visible = [
+        through(playerprofile=profile, association_id=getattr(association, "pk", association))
+        for profile, signup in zip(player_profiles, signups)
+        if signup.profile_visibility == PlayerProfile.Visibility.SPECIFIC
+        for association in signup.visible_associations
+    ]
+    bulk_create_with_references(through, visible, batch_size)
+
+    availabilities = [
+        PlayerAvailability(
+            player=user,
+            region=region,
+            is_open=True,
+            is_committed=False,
+        )
+        for user, signup in zip(users, signups)
+        if signup.available_for_transfer
+    ]
+    if availabilities:
+        bulk_create_with_references(PlayerAvailability, availabilities, batch_size)
+        documents = [
+            build_open_player_document(availability, availability.player.player_profile)
+            for availability in availabilities
+        ]
+        bulk_create_with_references(OpenPlayerDocument, documents, batch_size)
+        bump_version(region, PlayerAvailability)
+        bump_search_cache_version(region.id)
+        record_changes(
+            region.id,
+            ChangeEntry.Streams.OPEN_PLAYERS,
+            [availability.player_id for availability in availabilities],
+        )
+    return users
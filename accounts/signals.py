@@ -1,10 +1,27 @@
+import logging
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from accounts.lookups import email_taken, normalize_identifier, normalized_email
 from accounts.models import AccountProfile
 
+logger = logging.getLogger(__name__)
+
 
 @receiver(post_save, sender="auth.User")
-def create_account_profile(sender, instance, created, **kwargs):
+def create_account_profile(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not created and (raw or (update_fields is not None and not {"email", "username"} & set(update_fields))):
+        return
+    identifiers = {
+        "normalized_email": normalized_email(instance.email),
+        "normalized_username": normalize_identifier(instance.username),
+    }
+    if email_taken(instance.email, instance):
+        # Same rule as the backfill: the existing holder keeps the email.
+        logger.warning("User %s shares email with another account; stored without it", instance.pk)
+        identifiers["normalized_email"] = None
     if created:
-        AccountProfile.objects.create(user=instance)
+        AccountProfile.objects.create(user=instance, **identifiers)
+        return
+    AccountProfile.objects.filter(user=instance).exclude(**identifiers).update(**identifiers)
@@ -1,11 +1,22 @@
+import re
+import tempfile
+from io import StringIO
+from pathlib import Path
+
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase, override_settings
 from rest_framework.test import APIRequestFactory
 
+from accounts.lookups import email_in_use, user_for_email
 from accounts.models import AccountProfile
 from accounts.permissions import IsAdminRole, IsApprovedCoach
+from accounts.services import PlayerSignup, register_player, register_players
 from availability.models import PlayerAvailability
+from availability.search import open_player_documents
 from contacts.models import ContactRequest
 from organizations.models import Association, Team, TeamCoach
 from profiles.models import PlayerProfile
@@ -39,6 +50,77 @@ class AccountProfileTests(TestCase):
         self.assertTrue(IsAdminRole().has_permission(request, None))
 
 
+class NormalizedIdentifierTests(TestCase):
+    def test_identifiers_follow_user_changes(self):
+        user = User.objects.create_user(username="Sam.Player", email=" Sam@Example.com", password="testpass")
+        self.assertEqual(user.profile.normalized_email, "sam@example.com")
+        self.assertEqual(user.profile.normalized_username, "sam.player")
+
+        user.email = "SAM2@example.com"
+        user.save()
+        user.profile.refresh_from_db()
+        self.assertEqual(user.profile.normalized_email, "sam2@example.com")
+        self.assertTrue(email_in_use("sam2@EXAMPLE.com"))
+        self.assertFalse(email_in_use("sam@example.com"))
+
+        user.email = ""
+        user.save()
+        user.profile.refresh_from_db()
+        self.assertIsNone(user.profile.normalized_email)
+
+    def test_lookups_match_username_used_as_email(self):
+        user = User.objects.create_user(username="Pat@Example.com", password="testpass")
+        self.assertTrue(email_in_use("pat@example.COM"))
+        self.assertEqual(user_for_email("PAT@example.com"), user)
+        self.assertIsNone(user_for_email(""))
+
+    def test_backfill_keeps_oldest_duplicate_email(self):
+        first = User.objects.create_user(username="first", email="dup@example.com")
+        second = User.objects.create_user(username="second", email="other@example.com")
+        # Simulate rows written before the columns existed.
+        User.objects.filter(pk=second.pk).update(email="DUP@example.com")
+        AccountProfile.objects.update(normalized_email=None, normalized_username="")
+
+        stdout = StringIO()
+        call_command("backfill_normalized_identifiers", stdout=stdout)
+
+        first.profile.refresh_from_db()
+        second.profile.refresh_from_db()
+        self.assertEqual(first.profile.normalized_email, "dup@example.com")
+        self.assertIsNone(second.profile.normalized_email)
+        self.assertEqual(second.profile.normalized_username, "second")
+        self.assertIn(f"User {second.pk} shares email", stdout.getvalue())
+
+    def test_colliding_email_is_left_out_of_lookups(self):
+        first = User.objects.create_user(username="first", email="dup@example.com")
+        with self.assertLogs("accounts.signals", "WARNING"):
+            second = User.objects.create_user(username="second", email="DUP@example.com")
+        self.assertIsNone(second.profile.normalized_email)
+        self.assertEqual(user_for_email("dup@example.com"), first)
+
+    def test_admin_rejects_colliding_email_edit(self):
+        User.objects.create_user(username="first", email="dup@example.com")
+        second = User.objects.create_user(username="second", email="second@example.com")
+        admin_user = User.objects.create_superuser(username="root", email="root@example.com", password="testpass")
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            f"/admin/auth/user/{second.pk}/change/",
+            {
+                "username": "second",
+                "email": "Dup@Example.com",
+                "is_active": "on",
+                "date_joined_0": "2026-01-01",
+                "date_joined_1": "00:00:00",
+            },
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Another account already uses this email address.")
+        second.refresh_from_db()
+        self.assertEqual(second.email, "second@example.com")
+
+
 class WebRoleGuardTests(TestCase):
     def setUp(self):
         self.player = User.objects.create_user(username="player1", password="testpass")
@@ -208,6 +290,59 @@ class CoachSignupTests(TestCase):
         self.assertEqual(user.profile.role, AccountProfile.Roles.COACH)
         self.assertFalse(user.profile.is_coach_approved)
 
+    def _signup(self, email, association=""):
+        return self.client.post(
+            "/signup/coach/",
+            {
+                "first_name": "Sam",
+                "last_name": "Coach",
+                "association": association,
+                "email": email,
+                "phone_number": "555-0303",
+                "password": "testpass123",
+                "confirm_password": "testpass123",
+            },
+            HTTP_HOST="bc.localhost:8000",
+        )
+
+    def test_blank_association_routed_by_email_subdomain(self):
+        response = self._signup("sam@mail.vancouverminor.com")
+        self.assertEqual(response.status_code, 302)
+        profile = User.objects.get(email="sam@mail.vancouverminor.com").profile
+        self.assertEqual(profile.association, self.assoc_match)
+        self.assertTrue(profile.is_coach_approved)
+
+    def test_blank_association_without_domain_match_is_rejected(self):
+        response = self._signup("sam@gmail.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Select your association.")
+        self.assertFalse(User.objects.filter(email="sam@gmail.com").exists())
+
+    def test_admin_bulk_action_approves_only_domain_matches(self):
+        self._signup("sam@vancouverminor.com", self.assoc_nomatch.id)
+        self._signup("lee@vancouverminor.com", self.assoc_match.id)
+        AccountProfile.objects.filter(user__email="lee@vancouverminor.com").update(is_coach_approved=False)
+        admin_user = User.objects.create_superuser(username="root", password="rootpass", email="root@example.com")
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            "/admin/accounts/accountprofile/",
+            {
+                "action": "approve_domain_matched_coaches",
+                "_selected_action": list(AccountProfile.objects.values_list("pk", flat=True)),
+            },
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 302)
+        approved = set(
+            AccountProfile.objects.filter(is_coach_approved=True).values_list("user__email", flat=True)
+        )
+        self.assertEqual(approved, {"lee@vancouverminor.com"})
+
+        profile = AccountProfile.objects.get(user__email="sam@vancouverminor.com")
+        response = self.client.get(f"/admin/accounts/accountprofile/{profile.pk}/change/", HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, '<div class="readonly">BC Assoc</div>')
+
 
 @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
 class PlayerSignupTests(TestCase):
@@ -269,6 +404,215 @@ class PlayerSignupTests(TestCase):
         self.assertTrue(user.is_active)
         self.assertTrue(self.client.login(username=user.username, password="testpass123"))
 
+    def test_player_signup_rejects_email_in_other_case(self):
+        User.objects.create_user(username="existing", email="Sam@Example.com", password="testpass")
+        response = self.client.post(
+            "/signup/player/",
+            {
+                "first_name": "Sam",
+                "last_name": "Player",
+                "birth_year": 2011,
+                "email": "sam@EXAMPLE.com",
+                "phone_number": "555-0303",
+                "current_association": self.assoc.id,
+                "profile_visibility": "all",
+                "password": "testpass123",
+                "confirm_password": "testpass123",
+            },
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertContains(response, "An account with this email already exists.")
+        self.assertEqual(User.objects.filter(email__iexact="sam@example.com").count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class PlayerSignupServiceTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="bc")
+        self.assoc = Association.objects.create(region=self.region, name="BC Assoc")
+
+    def test_register_player_writes_each_table_once(self):
+        signup = PlayerSignup(
+            email="Sam@Example.com",
+            first_name="Sam",
+            last_name="Player",
+            password="testpass123",
+            birth_year=2011,
+            profile_visibility=PlayerProfile.Visibility.SPECIFIC,
+            visible_associations=[self.assoc],
+            available_for_transfer=True,
+        )
+        # Lookup, savepoint, seven inserts (user, account profile, player profile,
+        # visibility, availability, search document, change entry), release.
+        with self.assertNumQueries(10):
+            user = register_player(self.region, signup)
+
+        user = User.objects.get(pk=user.pk)
+        self.assertEqual(user.username, "sam@example.com")
+        self.assertTrue(user.check_password("testpass123"))
+        self.assertFalse(user.is_active)
+        self.assertEqual(user.profile.normalized_email, "sam@example.com")
+        self.assertEqual(user.player_profile.display_name, "Sam Player")
+        self.assertEqual(list(user.player_profile.visible_associations.all()), [self.assoc])
+        self.assertTrue(open_player_documents(self.region).filter(player=user, birth_year=2011).exists())
+
+    def test_register_players_skips_taken_and_repeated_emails(self):
+        User.objects.create_user(username="existing", email="taken@example.com")
+        signups = [
+            PlayerSignup(email="one@example.com"),
+            PlayerSignup(email="TAKEN@example.com"),
+            PlayerSignup(email="two@example.com", available_for_transfer=True),
+            PlayerSignup(email="One@Example.com"),
+        ]
+
+        users, skipped = register_players(self.region, signups)
+
+        self.assertEqual([user.email for user in users], ["one@example.com", "two@example.com"])
+        self.assertEqual([signup.email for signup in skipped], ["TAKEN@example.com", "One@Example.com"])
+        self.assertFalse(users[0].has_usable_password())
+        self.assertEqual(
+            AccountProfile.objects.filter(user__in=users, role=AccountProfile.Roles.PLAYER).count(),
+            2,
+        )
+        self.assertEqual(PlayerAvailability.objects.filter(player__in=users).count(), 1)
+        self.assertIsNone(register_player(self.region, PlayerSignup(email="two@example.com")))
+
+
+class RosterImportTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="bc")
+        self.assoc = Association.objects.create(region=self.region, name="North Shore Baseball")
+        self.team = Team.objects.create(region=self.region, association=self.assoc, name="13U AAA", age_group="13U")
+        User.objects.create_user(username="taken", email="taken@example.com")
+        self.roster = (
+            "Role,Email,First Name,Last Name,Birth Year,Association,Team,Available For Transfer\n"
+            "player,Ava@Example.com,Ava,Lee,2011,north shore baseball,,yes\n"
+            "coach,coach@example.com,Cam,Coach,,North Shore Baseball,13u aaa,\n"
+            "player,taken@example.com,Tia,Taken,2011,,,\n"
+            "player,ava@example.com,Ava,Again,2011,,,\n"
+            "umpire,not-an-email,,,,Nowhere,,\n"
+            "player,ben@example.com,Ben,Ng,twenty,,,\n"
+        )
+
+    def _write(self, content):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "roster.csv"
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def test_import_creates_accounts_and_reports_bad_rows(self):
+        path = self._write(self.roster)
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_roster", path, "--region", "bc", "--chunk-size", "2",
+            stdout=stdout, stderr=stderr,
+        )
+
+        player = User.objects.get(email="ava@example.com")
+        self.assertFalse(player.is_active)
+        self.assertEqual(player.player_profile.current_association, self.assoc)
+        self.assertEqual(player.player_profile.birth_year, 2011)
+        self.assertTrue(PlayerAvailability.objects.filter(player=player, region=self.region).exists())
+
+        coach = User.objects.get(email="coach@example.com")
+        self.assertEqual(coach.profile.role, AccountProfile.Roles.COACH)
+        self.assertTrue(coach.profile.is_coach_approved)
+        self.assertTrue(TeamCoach.objects.filter(user=coach, team=self.team).exists())
+
+        errors = stderr.getvalue()
+        self.assertIn("Line 4 (taken@example.com): An account with this email already exists.", errors)
+        self.assertIn("Line 5 (ava@example.com): Repeats an earlier row.", errors)
+        self.assertIn("Unknown role 'umpire'", errors)
+        self.assertIn("Unknown association 'Nowhere'", errors)
+        self.assertIn("Birth year 'twenty' is not a number.", errors)
+        self.assertIn("Imported 1 players and 1 coaches from 6 rows (4 errors)", stdout.getvalue())
+
+    def test_out_of_range_birth_years_are_row_errors(self):
+        path = self._write("email,birth_year\na@example.com,inf\nb@example.com,1e6\nc@example.com,2011\n")
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_roster", path, "--region", "bc", stdout=stdout, stderr=stderr)
+        self.assertIn("Birth year 'inf' is not a number.", stderr.getvalue())
+        self.assertIn("Birth year 1000000 is not between 1900 and 2100.", stderr.getvalue())
+        self.assertIn("Imported 1 players and 0 coaches from 3 rows (2 errors)", stdout.getvalue())
+
+    def test_non_utf8_file_is_rejected(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "roster.csv"
+        path.write_bytes("email,first_name\nzoe@example.com,Zoë\n".encode("latin-1"))
+        with self.assertRaisesMessage(CommandError, "not UTF-8"):
+            call_command("import_roster", str(path), "--region", "bc", stdout=StringIO(), stderr=StringIO())
+
+        admin_user = User.objects.create_superuser(username="root", email="root@example.com", password="testpass")
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile("roster.csv", path.read_bytes(), content_type="text/csv")
+        response = self.client.post(
+            f"/admin/organizations/association/{self.assoc.pk}/import-roster/",
+            {"file": upload},
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertContains(response, "not UTF-8")
+
+    def test_invited_member_sets_password_and_signs_in(self):
+        path = self._write("email,first_name\nnia@example.com,Nia\n")
+        stdout = StringIO()
+        call_command(
+            "import_roster", path, "--region", "bc", "--invite", "http://bc.localhost:8000/",
+            stdout=stdout, stderr=StringIO(),
+        )
+        self.assertIn("Sent 1 invitations.", stdout.getvalue())
+        [message] = mail.outbox
+        self.assertEqual(message.to, ["nia@example.com"])
+        link = re.search(r"http://bc\.localhost:8000(/accounts/invitation/\S+/)", message.body).group(1)
+
+        response = self.client.get(link, HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, "Set your password")
+        response = self.client.post(
+            link,
+            {"new_password1": "Sl1der-Grip-42", "new_password2": "Sl1der-Grip-42"},
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertRedirects(response, "/dashboard/", fetch_redirect_response=False)
+        user = User.objects.get(email="nia@example.com")
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.check_password("Sl1der-Grip-42"))
+        self.assertEqual(int(self.client.session["_auth_user_id"]), user.pk)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(link, HTTP_HOST="bc.localhost:8000").status_code, 400)
+        self.assertTrue(self.client.login(username="nia@example.com", password="Sl1der-Grip-42"))
+
+    def test_resend_verification_reinvites_imported_members(self):
+        path = self._write("email\nomar@example.com\n")
+        call_command("import_roster", path, "--region", "bc", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(mail.outbox, [])
+
+        self.client.post(
+            "/accounts/resend-verification/", {"email": "omar@example.com"}, HTTP_HOST="bc.localhost:8000"
+        )
+        [message] = mail.outbox
+        self.assertIn("/accounts/invitation/", message.body)
+
+    def test_dry_run_writes_nothing(self):
+        path = self._write(self.roster)
+        stdout = StringIO()
+        call_command("import_roster", path, "--region", "bc", "--dry-run", stdout=stdout, stderr=StringIO())
+        self.assertIn("Would import 1 players and 1 coaches", stdout.getvalue())
+        self.assertFalse(User.objects.filter(email__in=["ava@example.com", "coach@example.com"]).exists())
+
+    def test_admin_upload_defaults_to_selected_association(self):
+        admin_user = User.objects.create_superuser(username="root", email="root@example.com", password="testpass")
+        self.client.force_login(admin_user)
+        url = f"/admin/organizations/association/{self.assoc.pk}/import-roster/"
+        upload = SimpleUploadedFile("roster.csv", b"email,first_name\nnew@example.com,Nia\n", content_type="text/csv")
+
+        response = self.client.post(
+            url, {"file": upload, "send_invitations": "on"}, HTTP_HOST="bc.localhost:8000"
+        )
+
+        self.assertContains(response, "Imported 1 players and 0 coaches from 1 rows")
+        self.assertContains(response, "Sent 1 invitations.")
+        self.assertIn("http://bc.localhost:8000/accounts/invitation/", mail.outbox[0].body)
+        profile = PlayerProfile.objects.get(user__email="new@example.com")
+        self.assertEqual(profile.current_association, self.assoc)
+
 
 class CoachContactDetailsTests(TestCase):
     def setUp(self):
@@ -321,3 +665,26 @@ class CoachContactDetailsTests(TestCase):
         content = response.content.decode("utf-8")
         self.assertIn("player_contact@example.com", content)
         self.assertIn("555-1111", content)
+
+    def test_request_lists_are_paginated(self):
+        ContactRequest.objects.bulk_create([
+            ContactRequest(
+                player=self.player,
+                requesting_team=self.team,
+                requesting_association=self.assoc,
+                requested_by=self.coach,
+                region=self.region,
+                status=ContactRequest.Status.DECLINED,
+            )
+            for _ in range(30)
+        ])
+        newest_first = list(ContactRequest.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        for username, url in (("coach_contact", "/coach/requests/"), ("player_contact", "/player/requests/")):
+            self.assertTrue(self.client.login(username=username, password="testpass"))
+            first = self.client.get(url, HTTP_HOST="bc.localhost:8000").context["page"]
+            self.assertTrue(first.has_next)
+            self.assertFalse(first.has_previous)
+            second = self.client.get(f"{url}?{first.next_query}", HTTP_HOST="bc.localhost:8000").context["page"]
+            self.assertFalse(second.has_next)
+            self.assertEqual([item.id for item in first] + [item.id for item in second], newest_first)
@@ -2,20 +2,27 @@ from django import forms
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login
+from django.contrib.auth.forms import SetPasswordForm
 from django.contrib.auth.decorators import login_required
 from django.core.mail import send_mail
 from django.core.signing import BadSignature, SignatureExpired, TimestampSigner
-from django.db.models import Q
+from django.db import IntegrityError
 from django.http import Http404, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
 from accounts.forms import CoachSignupForm, PlayerContactForm, PlayerSignupForm, ResendVerificationForm
+from accounts.invitations import invitation_message, invitation_path, invited_user
+from accounts.lookups import email_in_use, user_for_email
 from accounts.models import AccountProfile
+from accounts.services import PlayerSignup, register_player
 from accounts.web_helpers import get_region_or_404, require_approved_coach, require_player
+from api.pagination import Keyset, paginate_request
+from api.throttling import ResendVerificationThrottle, SignupThrottle, throttle_view
 from availability.forms import PlayerAvailabilityForm
 from availability.models import PlayerAvailability
+from availability.search import coach_association_ids, open_player_documents
 from availability.views import AUDIT_COMMITTED_CLEARED, AUDIT_COMMITTED_SET
 from contacts.forms import ContactRequestForm, ContactRequestRespondForm
 from contacts.models import AuditLog, ContactRequest
@@ -24,6 +31,9 @@ from organizations.models import Team, TeamCoach
 from profiles.forms import PlayerProfileForm
 from profiles.models import PlayerProfile
 
+CONTACT_REQUEST_KEYSET = Keyset("-created_at", "-id")
+OPEN_PLAYER_KEYSET = Keyset("-updated_at", "-id")
+
 
 @login_required
 def dashboard_router(request):
@@ -36,16 +46,6 @@ def dashboard_router(request):
     return redirect("player_dashboard")
 
 
-def _email_domain(email: str) -> str:
-    if "@" not in email:
-        return ""
-    return email.split("@")[-1].strip().lower()
-
-
-def _normalize_domain(domain: str) -> str:
-    return domain.strip().lower().lstrip("@")
-
-
 def _build_verification_token(user) -> str:
     signer = TimestampSigner(salt="coach-signup")
     return signer.sign(f"{user.pk}:{user.is_active}")
@@ -108,6 +108,7 @@ def coach_dashboard(request):
     return render(request, "dashboards/coach.html", context)
 
 
+@throttle_view(SignupThrottle)
 def coach_signup(request):
     region = get_region_or_404(request)
     if request.method == "POST":
@@ -115,10 +116,10 @@ def coach_signup(request):
         if form.is_valid():
             email = form.cleaned_data["email"]
             association = form.cleaned_data["association"]
-            domain_match = _email_domain(email) == _normalize_domain(association.official_domain)
+            domain_match = form.domain_match
 
             user_model = get_user_model()
-            if user_model.objects.filter(username__iexact=email).exists():
+            if email_in_use(email):
                 form.add_error("email", "An account with this email already exists.")
             else:
                 user = user_model.objects.create_user(
@@ -210,58 +211,21 @@ def coach_verify(request, token):
     )
 
 
+@throttle_view(SignupThrottle)
 def player_signup(request):
     region = get_region_or_404(request)
     if request.method == "POST":
         form = PlayerSignupForm(request.POST, region=region)
         if form.is_valid():
             email = form.cleaned_data["email"]
-            user_model = get_user_model()
-            if user_model.objects.filter(username__iexact=email).exists():
+            try:
+                user = register_player(region, PlayerSignup.from_cleaned_data(form.cleaned_data))
+            except IntegrityError:
+                # Lost a race with a concurrent signup for the same email.
+                user = None
+            if user is None:
                 form.add_error("email", "An account with this email already exists.")
             else:
-                user = user_model.objects.create_user(
-                    username=email,
-                    email=email,
-                    first_name=form.cleaned_data["first_name"],
-                    last_name=form.cleaned_data["last_name"],
-                    password=form.cleaned_data["password"],
-                    is_active=False,
-                )
-                profile = user.profile
-                profile.role = AccountProfile.Roles.PLAYER
-                profile.phone_number = form.cleaned_data["phone_number"]
-                profile.save()
-
-                player_profile, _ = PlayerProfile.objects.get_or_create(user=user)
-                player_profile.display_name = f"{user.first_name} {user.last_name}".strip()
-                player_profile.birth_year = form.cleaned_data["birth_year"]
-                player_profile.current_association = form.cleaned_data.get("current_association")
-                player_profile.profile_visibility = form.cleaned_data["profile_visibility"]
-                player_profile.pbr_url = form.cleaned_data.get("pbr_url", "")
-                player_profile.pg_url = form.cleaned_data.get("pg_url", "")
-                player_profile.youtube_url = form.cleaned_data.get("youtube_url", "")
-                player_profile.instagram_handle = form.cleaned_data.get("instagram_handle", "")
-                player_profile.twitter_handle = form.cleaned_data.get("twitter_handle", "")
-                player_profile.bio = form.cleaned_data.get("bio", "")
-                player_profile.save()
-
-                visibility = form.cleaned_data["profile_visibility"]
-                if visibility == PlayerProfile.Visibility.SPECIFIC:
-                    player_profile.visible_associations.set(form.cleaned_data.get("visible_associations"))
-                else:
-                    player_profile.visible_associations.clear()
-
-                if form.cleaned_data.get("available_for_transfer"):
-                    availability, _ = PlayerAvailability.objects.get_or_create(
-                        player=user,
-                        defaults={"region": region},
-                    )
-                    availability.region = region
-                    availability.is_open = True
-                    availability.is_committed = False
-                    availability.save(update_fields=["region", "is_open", "is_committed"])
-
                 token = _build_player_verification_token(user)
                 verify_url = request.build_absolute_uri(
                     reverse("player_verify", args=[token])
@@ -333,15 +297,41 @@ def player_verify(request, token):
     return redirect("dashboard")
 
 
+def accept_invitation(request, uidb64, token):
+    user = invited_user(uidb64, token)
+    if user is None:
+        return render(
+            request,
+            "accounts/verify_complete.html",
+            {"success": False, "message": "This invitation link is invalid, expired or already used."},
+            status=400,
+        )
+    form = SetPasswordForm(user, request.POST or None)
+    for field in form.fields.values():
+        field.widget.attrs.setdefault("class", "form-control")
+    if request.method == "POST" and form.is_valid():
+        user = form.save(commit=False)
+        user.is_active = True
+        user.save()
+        login(request, user, backend=settings.AUTHENTICATION_BACKENDS[0])
+        messages.success(request, "Your password is set and your account is active.")
+        return redirect("dashboard")
+
+    context = {
+        "form": form,
+        "page_title": "Set your password",
+        "page_subtitle": f"Choose a password to activate the account for {user.email}.",
+    }
+    return render(request, "accounts/accept_invitation.html", context)
+
+
+@throttle_view(ResendVerificationThrottle)
 def resend_verification(request):
     if request.method == "POST":
         form = ResendVerificationForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data["email"].strip().lower()
-            user_model = get_user_model()
-            user = user_model.objects.filter(
-                Q(email__iexact=email) | Q(username__iexact=email)
-            ).select_related("profile").first()
+            user = user_for_email(email)
             if not user:
                 messages.info(
                     request,
@@ -351,6 +341,11 @@ def resend_verification(request):
             if user.is_active:
                 messages.info(request, "Your account is already verified. Please sign in.")
                 return redirect("login")
+            if not user.has_usable_password():
+                # Created for the member (roster import): they still need to choose a password.
+                send_mail(*invitation_message(user, request.build_absolute_uri(invitation_path(user))))
+                messages.success(request, "We sent you a link to set your password. Please check your email.")
+                return redirect("login")
 
             if user.profile.role == AccountProfile.Roles.COACH:
                 token = _build_verification_token(user)
@@ -506,10 +501,13 @@ def player_requests(request):
     region = get_region_or_404(request)
     requests_qs = ContactRequest.objects.filter(player=request.user, region=region).select_related(
         "requesting_team",
+        "requesting_association",
         "requested_by",
     )
+    page = paginate_request(request, requests_qs, CONTACT_REQUEST_KEYSET)
     context = {
-        "requests": requests_qs,
+        "requests": page.items,
+        "page": page,
         "page_title": "Contact Requests",
         "page_subtitle": "Respond to incoming coach requests.",
     }
@@ -533,7 +531,7 @@ def player_request_respond(request, request_id):
     if form.is_valid():
         contact_request.status = form.cleaned_data["status"]
         contact_request.responded_at = timezone.now()
-        contact_request.save(update_fields=["status", "responded_at"])
+        contact_request.save(update_fields=["status", "responded_at", "updated_at"])
         action = (
             AUDIT_CONTACT_REQUEST_APPROVED
             if contact_request.status == ContactRequest.Status.APPROVED
@@ -566,47 +564,18 @@ def coach_teams(request):
     return render(request, "coaches/teams.html", context)
 
 
-def _open_players_queryset(region):
-    now = timezone.now()
-    return PlayerAvailability.objects.filter(
-        region=region,
-        is_open=True,
-        is_committed=False,
-    ).filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
-
-
 @require_approved_coach
 def coach_open_players(request):
     region = get_region_or_404(request)
-    association_ids = set(TeamCoach.objects.filter(
-        user=request.user,
-        is_active=True,
-        team__region=region,
-    ).values_list("team__association_id", flat=True))
-    profile_association = getattr(getattr(request.user, "profile", None), "association", None)
-    if profile_association and profile_association.region_id == region.id:
-        association_ids.add(profile_association.id)
+    association_ids = coach_association_ids(request.user, region)
     if not association_ids:
-        players = []
+        page = None
     else:
-        queryset = (
-            _open_players_queryset(region)
-            .filter(allowed_associations__in=association_ids)
-            .distinct()
-            .select_related("player")
-            .order_by("-updated_at")
-        )
-        profiles = {
-            profile.user_id: profile
-            for profile in PlayerProfile.objects.filter(user__in=queryset.values("player_id"))
-        }
-        players = [
-            {"availability": availability, "profile": profiles.get(availability.player_id)}
-            for availability in queryset
-        ]
+        page = paginate_request(request, open_player_documents(region, association_ids), OPEN_PLAYER_KEYSET)
 
     context = {
-        "players": players,
+        "players": page.items if page else [],
+        "page": page,
         "page_title": "Open Players",
         "page_subtitle": "Players who have allowed your associations to view availability.",
     }
@@ -616,14 +585,7 @@ def coach_open_players(request):
 @require_approved_coach
 def coach_open_player_detail(request, player_id):
     region = get_region_or_404(request)
-    association_ids = set(TeamCoach.objects.filter(
-        user=request.user,
-        is_active=True,
-        team__region=region,
-    ).values_list("team__association_id", flat=True))
-    profile_association = getattr(getattr(request.user, "profile", None), "association", None)
-    if profile_association and profile_association.region_id == region.id:
-        association_ids.add(profile_association.id)
+    association_ids = coach_association_ids(request.user, region)
     if not association_ids:
         raise Http404
 
@@ -675,10 +637,14 @@ def coach_requests(request):
     requests_qs = ContactRequest.objects.filter(
         requested_by=request.user,
         region=region,
-    ).select_related("player", "player__profile", "requesting_team")
+    ).select_related("requesting_team")
+    # Players are prefetched from their home database; shard stubs lack contact details.
+    requests_qs = requests_qs.prefetch_related("player", "player__profile")
+    page = paginate_request(request, requests_qs, CONTACT_REQUEST_KEYSET)
 
     context = {
-        "requests": requests_qs,
+        "requests": page.items,
+        "page": page,
         "page_title": "Sent Requests",
         "page_subtitle": "Track the status of your outreach.",
     }
@@ -691,27 +657,22 @@ def _available_players_for_coach(region, request):
         is_active=True,
         team__region=region,
     ).values_list("team_id", flat=True))
-    association_ids = set(TeamCoach.objects.filter(
-        user=request.user,
-        is_active=True,
-        team__region=region,
-    ).values_list("team__association_id", flat=True))
-    profile_association = getattr(getattr(request.user, "profile", None), "association", None)
-    if profile_association and profile_association.region_id == region.id:
-        association_ids.add(profile_association.id)
+    association_ids = coach_association_ids(request.user, region)
     if not association_ids:
         return {}, Team.objects.none()
-    queryset = _open_players_queryset(region).filter(allowed_associations__in=association_ids).distinct()
-    queryset = queryset.select_related("player", "player__player_profile")
+    documents = open_player_documents(region, association_ids).only(
+        "player_id",
+        "username",
+        "display_name",
+        "birth_year",
+    )
 
     players = {}
-    for availability in queryset:
-        profile = getattr(availability.player, "player_profile", None)
-        name = profile.display_name if profile and profile.display_name else availability.player.username
-        label = name
-        if profile and profile.birth_year:
-            label = f"{label} ({profile.birth_year})"
-        players[str(availability.player_id)] = label
+    for document in documents:
+        label = document.label
+        if document.birth_year:
+            label = f"{label} ({document.birth_year})"
+        players[str(document.player_id)] = label
 
     teams = Team.objects.filter(id__in=team_ids).order_by("name")
     return players, teams
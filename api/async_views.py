@@ -0,0 +1,80 @@
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.views import APIView
+
+API_SETTINGS = (
+    "renderer_classes",
+    "parser_classes",
+    "authentication_classes",
+    "throttle_classes",
+    "permission_classes",
+)
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers are coroutines.
+
+    Authentication, permissions and throttling may touch the database, so
+    ``initial()`` runs in a worker thread; the handler itself runs on the
+    event loop and should use the async ORM (``aget``, ``afirst``, ``async for``)
+    or wrap sync helpers with ``sync_to_async``.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, "__await__"):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names=None):
+    """``@api_view`` for ``async def`` views; stack ``@permission_classes`` etc. below it."""
+    http_method_names = ["GET"] if http_method_names is None else http_method_names
+
+    def decorator(func):
+        attrs = {
+            "http_method_names": [method.lower() for method in http_method_names] + ["options"],
+            "__doc__": func.__doc__,
+        }
+        for setting in API_SETTINGS:
+            if hasattr(func, setting):
+                attrs[setting] = getattr(func, setting)
+
+        async def handler(self, request, *args, **kwargs):
+            return await func(request, *args, **kwargs)
+
+        for method in http_method_names:
+            attrs[method.lower()] = handler
+
+        view_class = type(func.__name__, (AsyncAPIView,), attrs)
+        view_class.__module__ = func.__module__
+        return view_class.as_view()
+
+    return decorator
+
+
+def split_by_method(async_view, sync_view, methods=("GET", "HEAD")):
+    """Serve read methods from an async view and everything else from a sync one."""
+
+    async def view(request, *args, **kwargs):
+        if request.method in methods:
+            return await async_view(request, *args, **kwargs)
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    return csrf_exempt(view)
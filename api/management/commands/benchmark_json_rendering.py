@@ -0,0 +1,111 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONRenderer
+from contacts.models import ContactRequest
+from contacts.serializers import ContactRequestSerializer
+from organizations.models import Association, Team
+from regions.models import Region
+from tryouts.models import TryoutEvent
+from tryouts.serializers import TryoutEventSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Render --rows serialized tryouts and contact requests with DRF's stdlib JSONRenderer "
+        "and with FastJSONRenderer, reporting time per 10k rows. "
+        "All rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--region", default="bc")
+
+    def handle(self, *args, **options):
+        region = Region.objects.get(code=options["region"])
+        with transaction.atomic():
+            payloads = self._seed(region, options["rows"])
+            self._run(payloads, options["rows"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def _seed(self, region, count):
+        user_model = get_user_model()
+        started = time.perf_counter()
+        association = Association.objects.create(region=region, name="Benchmark Association")
+        team = Team.objects.create(
+            region=region, association=association, name="Benchmark Team", age_group="13U", level="AAA"
+        )
+        coach = user_model.objects.create_user(username="benchmark-coach")
+        player = user_model.objects.create_user(username="benchmark-player")
+        TryoutEvent.objects.bulk_create(
+            [
+                TryoutEvent(
+                    region=region,
+                    association=association,
+                    team=team,
+                    name=f"Benchmark Tryout {index} – Élite",
+                    start_date=date(2030, 1, 1) + timedelta(days=index % 365),
+                    end_date=date(2030, 1, 1) + timedelta(days=index % 365),
+                    location="Benchmark Field",
+                    registration_url="https://example.com/register",
+                    notes="Bring a glove and water.",
+                    is_active=True,
+                )
+                for index in range(count)
+            ],
+            batch_size=500,
+        )
+        responded_at = timezone.now()
+        ContactRequest.objects.bulk_create(
+            [
+                ContactRequest(
+                    player=player,
+                    requesting_team=team,
+                    requesting_association=association,
+                    requested_by=coach,
+                    region=region,
+                    status=ContactRequest.Status.DECLINED,
+                    responded_at=responded_at,
+                    message="We would like to talk about next season.",
+                )
+                for _ in range(count)
+            ],
+            batch_size=500,
+        )
+        tryouts = TryoutEvent.objects.filter(association=association)
+        requests = ContactRequest.objects.filter(player=player).select_related(
+            "player", "requesting_team", "requesting_association", "requested_by"
+        )
+        payloads = [
+            ("tryouts", TryoutEventSerializer(tryouts, many=True).data),
+            ("contact requests", ContactRequestSerializer(requests, many=True).data),
+        ]
+        self.stdout.write(f"Seeded and serialized {count} rows per payload in {time.perf_counter() - started:.2f}s")
+        return payloads
+
+    def _run(self, payloads, rows, repeat):
+        if renderers.orjson is None:
+            self.stdout.write("orjson is not installed: FastJSONRenderer falls back to the stdlib renderer.")
+        cases = [("stdlib JSONRenderer", JSONRenderer()), ("FastJSONRenderer", FastJSONRenderer())]
+        for name, data in payloads:
+            self.stdout.write(name)
+            outputs = []
+            for label, renderer in cases:
+                outputs.append(renderer.render(data))
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    renderer.render(data)
+                    timings.append(time.perf_counter() - started)
+                per_10k = min(timings) * 10000 / max(rows, 1)
+                self.stdout.write(f"  {label}: {per_10k * 1000:.1f} ms per 10k rows ({len(outputs[-1])} bytes)")
+            identical = "identical" if outputs[0] == outputs[1] else "DIFFERENT"
+            self.stdout.write(f"  output: {identical}")
@@ -0,0 +1,179 @@
+"""Keyset (cursor) pagination shared by the HTML lists and the API.
+
+A cursor holds the signed ordering values of the row a page starts after (or
+before, going back), so every page is one range query on the ordering
+columns however deep it is. One row more than the page size is fetched to
+tell whether another page follows instead of counting the table.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+
+CURSOR_SALT = "api.pagination.cursor"
+PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+    params: QueryDict | None = None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    @property
+    def next_query(self) -> str:
+        return self.query(self.next_cursor)
+
+    @property
+    def previous_query(self) -> str:
+        return self.query(self.previous_cursor)
+
+    def query(self, cursor) -> str:
+        """The current query string (filters included) pointing at ``cursor``."""
+        params = self.params.copy() if self.params is not None else QueryDict(mutable=True)
+        params.pop("cursor", None)
+        if cursor is not None:
+            params["cursor"] = cursor
+        return params.urlencode()
+
+
+class Keyset:
+    """A stable ordering (``"-"`` for descending) that ends in a unique field.
+
+    The ordering fields must be non-null concrete fields of the model.
+    """
+
+    def __init__(self, *ordering):
+        if not ordering:
+            raise ValueError("A keyset needs at least one ordering field.")
+        self.ordering = ordering
+        self.fields = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+        self.signature = ",".join(ordering)
+
+    def encode(self, obj, direction) -> str:
+        opts = obj._meta
+        values = [opts.get_field(name).value_to_string(obj) for name, _ in self.fields]
+        return signing.dumps([self.signature, direction, values], salt=CURSOR_SALT)
+
+    def decode(self, model, cursor) -> tuple[str, list]:
+        try:
+            signature, direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor("Invalid cursor.")
+        if signature != self.signature or direction not in (NEXT, PREVIOUS) or len(values) != len(self.fields):
+            raise InvalidCursor("Cursor belongs to a different list.")
+        try:
+            values = [model._meta.get_field(name).to_python(value) for (name, _), value in zip(self.fields, values)]
+        except ValidationError:
+            raise InvalidCursor("Invalid cursor.")
+        return direction, values
+
+    def _after(self, values, backwards) -> Q:
+        # (a, b, c) > (x, y, z) spelled out per column, since the directions
+        # can differ: a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z).
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.fields, values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def slice(self, queryset, cursor=None, size=PAGE_SIZE):
+        """The lazy queryset for one page (plus the probe row) and its direction."""
+        direction = NEXT
+        if cursor:
+            direction, values = self.decode(queryset.model, cursor)
+            queryset = queryset.filter(self._after(values, direction == PREVIOUS))
+        ordering = self.ordering
+        if direction == PREVIOUS:
+            ordering = [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+        return queryset.order_by(*ordering)[: size + 1], direction
+
+    def page(self, rows, direction, size, *, cursor=None, params=None) -> KeysetPage:
+        """Build the page from the rows fetched for ``slice()``."""
+        rows = list(rows)
+        more = len(rows) > size
+        rows = rows[:size]
+        if direction == PREVIOUS:
+            rows.reverse()
+            has_next, has_previous = True, more
+        else:
+            has_next, has_previous = more, bool(cursor)
+        page = KeysetPage(rows, params=params)
+        if rows and has_next:
+            page.next_cursor = self.encode(rows[-1], NEXT)
+        if rows and has_previous:
+            page.previous_cursor = self.encode(rows[0], PREVIOUS)
+        return page
+
+    def paginate(self, queryset, cursor=None, size=PAGE_SIZE, params=None) -> KeysetPage:
+        queryset, direction = self.slice(queryset, cursor, size)
+        return self.page(queryset, direction, size, cursor=cursor, params=params)
+
+    async def apaginate(self, queryset, cursor=None, size=PAGE_SIZE, params=None) -> KeysetPage:
+        queryset, direction = self.slice(queryset, cursor, size)
+        rows = [row async for row in queryset]
+        return self.page(rows, direction, size, cursor=cursor, params=params)
+
+
+def page_size(params, default=PAGE_SIZE) -> int:
+    try:
+        size = int(params.get("page_size") or default)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def paginate_request(request, queryset, keyset: Keyset, size=PAGE_SIZE) -> KeysetPage:
+    """Page for an HTML list; a tampered or stale cursor shows the first page."""
+    try:
+        return keyset.paginate(queryset, request.GET.get("cursor"), size, request.GET)
+    except InvalidCursor:
+        return keyset.paginate(queryset, None, size, request.GET)
+
+
+def wants_page(params) -> bool:
+    """API lists stay plain lists unless the client asks for a cursor page."""
+    return "cursor" in params or "page_size" in params
+
+
+def page_response_data(request, page: KeysetPage | None, results) -> dict:
+    """The API envelope: ``results`` plus absolute ``next``/``previous`` links."""
+    links = {"next": None, "previous": None}
+    if page is not None:
+        if page.has_next:
+            links["next"] = request.build_absolute_uri(f"{request.path}?{page.next_query}")
+        if page.has_previous:
+            links["previous"] = request.build_absolute_uri(f"{request.path}?{page.previous_query}")
+    return {**links, "results": results}
@@ -0,0 +1,44 @@
+"""JSON rendering through orjson when it is installed.
+
+The bytes match DRF's ``JSONRenderer`` for strings, integers, booleans and
+containers: compact, UTF-8, with U+2028/U+2029 escaped. Datetimes, dates,
+times, decimals and anything else orjson does not handle natively go through
+DRF's own encoder, so they render exactly as before. Without orjson, or for
+pretty-printed (``indent``) responses, the stdlib renderer is used.
+
+Floats differ. orjson writes exponents without padding (``1e16``, ``1e-7``
+where the stdlib writes ``1e+16``, ``1e-07``); both parse to the same value.
+Non-finite floats become ``null`` where the stdlib renderer refuses them.
+No endpoint returns floats today.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    if orjson is not None
+    else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; the stdlib renderer handles or reports them.
+            return super().render(data, accepted_media_type, renderer_context)
+        return content.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
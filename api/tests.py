@@ -1,8 +1,48 @@
+import gzip
+import json
+import tempfile
+import threading
+import zlib
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.files.storage import FileSystemStorage
+from django.db import DatabaseError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models import AccountProfile
+from api import renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from api.throttling import UserTokenBucketThrottle
+from availability.models import PlayerAvailability
+from organizations.models import Association
+from regions.cache import cache_stats, reset_cache_stats
+from regions.models import Region
+from transferportal.middleware.compression import (
+    CompressionMiddleware,
+    compression_stats,
+    reset_compression_stats,
+)
+from transferportal.middleware.fastpath import reset_readiness
+from transferportal.middleware.overload import ConcurrencyLimiter, limiter_stats
+from transferportal.middleware.static import StaticFilesMiddleware
+from transferportal.staticfiles import PortalStaticFilesStorage
+from transferportal.test_runner import THROTTLE_DIR_PREFIX
+from tryouts.models import TryoutEvent
 
 
 User = get_user_model()
@@ -32,3 +72,398 @@ class MeEndpointTests(TestCase):
         self.assertEqual(response.data["role"], AccountProfile.Roles.PLAYER)
         self.assertEqual(response.data["is_coach_approved"], False)
         self.assertEqual(response.data["region_code"], "bc")
+
+
+class AsyncRequestPathTests(TestCase):
+    """Exercise the async views through the ASGI handler."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="coach1", password="testpass")
+        self.user.profile.role = AccountProfile.Roles.COACH
+        self.user.profile.is_coach_approved = True
+        self.user.profile.save()
+        token = RefreshToken.for_user(self.user).access_token
+        # AsyncClient always sends host "testserver", which falls back to the default region.
+        self.headers = {"authorization": f"Bearer {token}"}
+        self.client = AsyncClient()
+
+    async def test_health(self):
+        response = await self.client.get("/api/v1/health/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    async def test_me_uses_region_from_async_middleware(self):
+        response = await self.client.get("/api/v1/me/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["role"], AccountProfile.Roles.COACH)
+        self.assertEqual(response.json()["region_code"], "bc")
+
+    async def test_me_requires_auth(self):
+        response = await self.client.get("/api/v1/me/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_search_endpoints(self):
+        for url in ("/api/v1/availability/search/", "/api/v1/open-players/", "/api/v1/tryouts/"):
+            response = await self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.json(), [])
+
+        response = await self.client.get("/api/v1/open-players/?position=XX", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_open_player_search_is_scoped_and_cached(self):
+        await sync_to_async(self._open_players_in_two_associations)()
+        reset_cache_stats()
+
+        for url in ("/api/v1/open-players/", "/api/v1/open-players/"):
+            response = await self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row["player_id"] for row in response.json()], [self.visible.id])
+        response = await self.client.get("/api/v1/availability/search/facets/", headers=self.headers)
+        self.assertEqual(response.json()["total"], 1)
+        self.assertEqual(cache_stats()["open-players:results"], {"hits": 1, "misses": 1, "bumps": 0, "cross_region": 0})
+
+    def _open_players_in_two_associations(self):
+        region = Region.objects.get(code="bc")
+        mine = Association.objects.create(region=region, name="Mine")
+        other = Association.objects.create(region=region, name="Other")
+        self.user.profile.association = mine
+        self.user.profile.save()
+        for username, association in (("visible", mine), ("hidden", other)):
+            player = User.objects.create_user(username=username, password="testpass")
+            availability = PlayerAvailability.objects.create(player=player, region=region, is_open=True)
+            availability.allowed_associations.add(association)
+            setattr(self, username, player)
+
+
+def _overload_settings(search_concurrency):
+    config = {**settings.OVERLOAD_PROTECTION}
+    config["CLASSES"] = {
+        **config["CLASSES"],
+        "search": {"concurrency": search_concurrency, "queue": 0, "timeout": 0},
+    }
+    return config
+
+
+class OverloadProtectionTests(TestCase):
+    def test_limiter_sheds_when_queue_full(self):
+        limiter = ConcurrencyLimiter("test", concurrency=1, queue=0, timeout=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+        stats = limiter.snapshot()
+        self.assertEqual(stats["admitted"], 2)
+        self.assertEqual(stats["shed"], 1)
+        self.assertEqual(stats["active"], 1)
+
+    def test_queued_request_admitted_on_release_or_times_out(self):
+        limiter = ConcurrencyLimiter("test", concurrency=1, queue=1, timeout=0.01)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        self.assertEqual(limiter.snapshot()["timed_out"], 1)
+
+        limiter.timeout = 5
+        releaser = threading.Timer(0.05, limiter.release)
+        releaser.start()
+        self.assertTrue(limiter.acquire())
+        releaser.join()
+        self.assertEqual(limiter.snapshot()["waiting"], 0)
+
+    def test_full_route_class_returns_503_but_health_passes(self):
+        with override_settings(OVERLOAD_PROTECTION=_overload_settings(0)):
+            client = APIClient()
+            response = client.get("/api/v1/open-players/", HTTP_HOST="bc.localhost:8000")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "2")
+
+            response = client.get("/api/v1/health/", HTTP_HOST="bc.localhost:8000")
+            self.assertEqual(response.status_code, 200)
+            response = client.get("/api/v1/tryouts/", HTTP_HOST="bc.localhost:8000")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(limiter_stats()["search"]["shed"], 1)
+
+    def test_limiter_stats_endpoint_is_admin_only(self):
+        client = APIClient()
+        user = User.objects.create_user(username="player1", password="testpass")
+        client.force_authenticate(user=user)
+        response = client.get("/api/v1/ops/limiter/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 403)
+
+        admin = User.objects.create_user(username="admin1", password="testpass", is_staff=True)
+        client.force_authenticate(user=admin)
+        response = client.get("/api/v1/ops/limiter/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["default"]["active"], 1)
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.factory = RequestFactory()
+
+    def test_tests_never_touch_the_shared_bucket_directory(self):
+        self.assertTrue(Path(caches["throttle"]._dir).name.startswith(THROTTLE_DIR_PREFIX))
+
+    def test_bucket_drains_then_refills(self):
+        now = [1000.0]
+
+        class TwoPerMinute(UserTokenBucketThrottle):
+            scope = "test"
+            rate = "2/min"
+            timer = staticmethod(lambda: now[0])
+
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+        throttle = TwoPerMinute()
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertAlmostEqual(throttle.wait(), 30.0)
+
+        now[0] += 30
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+
+        other = self.factory.get("/", REMOTE_ADDR="10.0.0.2")
+        other.user = AnonymousUser()
+        self.assertTrue(throttle.allow_request(other, None))
+
+    def test_resend_verification_is_throttled_per_ip(self):
+        for _ in range(5):
+            response = self.client.post(
+                "/accounts/resend-verification/",
+                {"email": "nobody@example.com"},
+                HTTP_HOST="bc.localhost:8000",
+            )
+            self.assertEqual(response.status_code, 302)
+        response = self.client.post(
+            "/accounts/resend-verification/",
+            {"email": "nobody@example.com"},
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+        response = self.client.get("/accounts/resend-verification/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+
+    def test_health_is_never_throttled(self):
+        for _ in range(130):
+            response = self.client.get("/api/v1/health/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+
+
+class FastPathTests(TestCase):
+    def setUp(self):
+        reset_readiness()
+
+    def test_liveness_skips_middleware_and_db(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/healthz", HTTP_HOST="10.0.0.5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertNotIn("sessionid", response.cookies)
+
+    def test_readiness_check_is_cached(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            self.client.get("/readyz")
+
+    def test_readiness_reports_database_failure(self):
+        with mock.patch("transferportal.middleware.fastpath.check_database", return_value=(False, "down")):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["error"], "down")
+
+    def test_readiness_hides_database_error_details(self):
+        error = DatabaseError('could not connect to server: host "db.internal" port 5432')
+        with mock.patch("transferportal.middleware.fastpath.connection.cursor", side_effect=error):
+            with self.assertLogs("transferportal.middleware.fastpath", "ERROR"):
+                response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["error"], "database unavailable")
+        self.assertNotIn("db.internal", response.content.decode())
+
+    def test_favicon_short_circuits(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/favicon.ico")
+        self.assertEqual(response.status_code, 204)
+
+
+class StaticFilesTests(TestCase):
+    def setUp(self):
+        source = tempfile.TemporaryDirectory()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        self.addCleanup(root.cleanup)
+        self.css = "body { color: #123456; }\n" * 40
+        (Path(source.name) / "css").mkdir()
+        (Path(source.name) / "css" / "site.css").write_text(self.css)
+        (Path(source.name) / "css" / "tiny.css").write_text("a{}")
+        self.root = root.name
+
+        storage = PortalStaticFilesStorage(location=self.root, base_url="/static/")
+        source_storage = FileSystemStorage(location=source.name)
+        paths = {name: (source_storage, name) for name in ("css/site.css", "css/tiny.css")}
+        for name, (origin, path) in paths.items():
+            with origin.open(path) as content:
+                storage.save(name, content)
+        list(storage.post_process(paths))
+        self.hashed = storage.stored_name("css/site.css")
+
+        with override_settings(STATIC_ROOT=self.root, STATIC_SERVE=True):
+            self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+        self.factory = RequestFactory()
+
+    def _get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def test_collectstatic_writes_hashed_and_compressed_copies(self):
+        self.assertNotEqual(self.hashed, "css/site.css")
+        compressed = Path(self.root) / f"{self.hashed}.gz"
+        self.assertEqual(gzip.decompress(compressed.read_bytes()).decode(), self.css)
+        self.assertFalse((Path(self.root) / "css" / "tiny.css.gz").exists())
+
+    def test_hashed_files_are_immutable_and_precompressed(self):
+        response = self._get(f"/static/{self.hashed}", accept_encoding="gzip, deflate")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)).decode(), self.css)
+
+        plain = self._get(f"/static/{self.hashed}", accept_encoding="gzip;q=0")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(b"".join(plain.streaming_content).decode(), self.css)
+
+    def test_unhashed_files_revalidate(self):
+        response = self._get("/static/css/site.css")
+        self.assertEqual(response["Cache-Control"], f"public, max-age={settings.STATIC_MAX_AGE}")
+        again = self._get("/static/css/site.css", if_none_match=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_other_paths_fall_through(self):
+        self.assertEqual(self._get("/static/css/missing.css").content, b"app")
+        self.assertEqual(self._get("/tryouts/").content, b"app")
+        response = self.middleware(self.factory.post(f"/static/{self.hashed}"))
+        self.assertEqual(response.status_code, 405)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        reset_compression_stats()
+        self.factory = RequestFactory()
+
+    def test_large_json_is_gzipped_and_counted(self):
+        region = Region.objects.get(code="bc")
+        association = Association.objects.create(region=region, name="BC Assoc")
+        TryoutEvent.objects.bulk_create([
+            TryoutEvent(
+                region=region,
+                association=association,
+                name=f"Tryout {index}",
+                start_date=date(2025, 3, 1),
+                end_date=date(2025, 3, 2),
+                location="Field",
+                registration_url="https://example.com",
+                is_active=True,
+            )
+            for index in range(30)
+        ])
+        plain = self.client.get("/api/v1/tryouts/", HTTP_HOST="bc.localhost:8000")
+        self.assertNotIn("Content-Encoding", plain)
+
+        response = self.client.get("/api/v1/tryouts/", HTTP_HOST="bc.localhost:8000", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        stats = compression_stats()["tryout-list"]
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(stats["bytes_saved"], len(plain.content) - len(response.content))
+
+        admin = User.objects.create_user(username="admin1", password="testpass", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        response = client.get("/api/v1/ops/compression/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.data["tryout-list"]["compressed"], 1)
+
+    def test_small_bodies_and_csrf_pages_are_not_compressed(self):
+        response = self.client.get("/api/v1/health/", HTTP_HOST="bc.localhost:8000", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", response)
+
+        response = self.client.get("/accounts/login/", HTTP_HOST="bc.localhost:8000", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertContains(response, "csrfmiddlewaretoken")
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_already_compressed_types_are_skipped(self):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(b"\x89PNG" * 1000, content_type="image/png"))
+        response = middleware(self.factory.get("/image.png", headers={"accept-encoding": "gzip"}))
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_streaming_responses_are_flushed_per_chunk(self):
+        chunks = [f"data: event {index}\n\n".encode() for index in range(50)]
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter(chunks), content_type="text/event-stream")
+        )
+        response = middleware(self.factory.get("/events/", headers={"accept-encoding": "gzip"}))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parts = iter(response.streaming_content)
+        self.assertEqual(decompressor.decompress(next(parts)), chunks[0])
+        rest = b"".join(decompressor.decompress(part) for part in parts) + decompressor.flush()
+        self.assertEqual(rest, b"".join(chunks[1:]))
+        self.assertEqual(compression_stats()["unresolved"]["bytes_in"], len(b"".join(chunks)))
+
+
+class FastJSONTests(TestCase):
+    payload = {
+        "at": datetime(2030, 5, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        "on": date(2030, 5, 1),
+        "fee": Decimal("12.50"),
+        "name": "Équipe \u2028 Nord\u2029",
+        "rows": [{"id": 1, "ok": True, "none": None}],
+    }
+
+    @skipUnless(renderers.orjson, "orjson is not installed")
+    def test_output_matches_stdlib_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    @skipUnless(renderers.orjson, "orjson is not installed")
+    def test_floats_differ_only_in_formatting(self):
+        payload = {"values": [0.1, 1.5, 1e16, 1e-7, -2.5e-300]}
+        fast = FastJSONRenderer().render(payload)
+        stdlib = JSONRenderer().render(payload)
+        self.assertEqual(json.loads(fast), json.loads(stdlib))
+        self.assertIn(b"1e16", fast)
+        self.assertIn(b"1e+16", stdlib)
+        self.assertEqual(FastJSONRenderer().render({"value": float("nan")}), b'{"value":null}')
+
+    def test_falls_back_without_orjson_and_for_indented_output(self):
+        with mock.patch("api.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+        context = {"indent": 2}
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, renderer_context=context),
+            JSONRenderer().render(self.payload, renderer_context=context),
+        )
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"name": "Équipe"}'.encode())), {"name": "Équipe"})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b"{not json"))
+
+    def test_api_uses_fast_renderer_and_parser(self):
+        user = User.objects.create_user(username="json-user", email="old@example.com", password="pass")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.patch(
+            "/api/v1/me/", data="{broken", content_type="application/json", HTTP_HOST="bc.localhost:8000"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = client.get("/api/v1/me/", HTTP_HOST="bc.localhost:8000")
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
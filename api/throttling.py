@@ -0,0 +1,111 @@
+import itertools
+from functools import wraps
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.http import HttpResponse
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
+
+class BucketFileCache(FileBasedCache):
+    """File cache shared by every worker on a node, with amortized culling.
+
+    The stock backend lists the whole directory on every ``set()`` to decide
+    whether to cull; here that only happens every ``CULL_EVERY`` writes, so
+    a throttle check costs one read and one write.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_every = int(params.get("OPTIONS", {}).get("CULL_EVERY", 1000))
+        self._writes = itertools.count(1)
+
+    def _cull(self):
+        if next(self._writes) % self._cull_every == 0:
+            super()._cull()
+
+
+class TokenBucketMixin:
+    """Token bucket on top of DRF's rate parsing and cache keys.
+
+    A rate of ``"N/period"`` is a bucket of N tokens refilled continuously at
+    N per period, stored as one ``(tokens, updated_at)`` entry per key.
+    Concurrent workers can race on the read-modify-write, which at worst lets
+    a request or two through early.
+    """
+
+    cache_alias = THROTTLE_CACHE_ALIAS
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        tokens, updated_at = self.cache.get(self.key, (self.num_requests, now))
+        refill = (now - updated_at) * self.num_requests / self.duration
+        tokens = min(self.num_requests, tokens + refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.tokens = tokens
+        self.cache.set(self.key, (tokens, now), self.duration)
+        return allowed
+
+    def wait(self):
+        return max(0.0, (1 - self.tokens) * self.duration / self.num_requests)
+
+
+class AnonTokenBucketThrottle(TokenBucketMixin, AnonRateThrottle):
+    pass
+
+
+class UserTokenBucketThrottle(TokenBucketMixin, UserRateThrottle):
+    """Keyed by user id, or by client IP for anonymous requests."""
+
+
+class SearchThrottle(UserTokenBucketThrottle):
+    scope = "search"
+
+
+class AuthTokenThrottle(UserTokenBucketThrottle):
+    scope = "auth"
+
+
+class SignupThrottle(UserTokenBucketThrottle):
+    scope = "signup"
+
+
+class ResendVerificationThrottle(UserTokenBucketThrottle):
+    scope = "resend_verification"
+
+
+def throttle_view(*throttle_classes, methods=("POST",)):
+    """Apply DRF-style throttles to a plain Django view."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                for throttle_class in throttle_classes:
+                    throttle = throttle_class()
+                    if not throttle.allow_request(request, None):
+                        response = HttpResponse(
+                            "Too many attempts. Please wait a moment and try again.",
+                            status=429,
+                        )
+                        response["Retry-After"] = str(int(throttle.wait()) + 1)
+                        return response
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
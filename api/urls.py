@@ -3,20 +3,26 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from api import views
+from api.throttling import AuthTokenThrottle
 from availability import views as availability_views
 from contacts.views import ContactRequestViewSet, contact_request_respond, open_players
+from feeds import views as feed_views
 from profiles import views as profile_views
 from organizations.views import AssociationViewSet, TeamViewSet
-from tryouts.views import TryoutEventViewSet
+from tryouts.views import TryoutEventViewSet, TryoutSeriesViewSet, tryout_collection
 
 router = DefaultRouter()
 router.register(r"associations", AssociationViewSet, basename="association")
 router.register(r"teams", TeamViewSet, basename="team")
 router.register(r"tryouts", TryoutEventViewSet, basename="tryout")
+router.register(r"tryout-series", TryoutSeriesViewSet, basename="tryout_series")
 router.register(r"contact-requests", ContactRequestViewSet, basename="contact_request")
 
 urlpatterns = [
     path("health/", views.health, name="health"),
+    path("ops/limiter/", views.limiter_stats, name="limiter_stats"),
+    path("ops/cache/", views.cache_stats, name="cache_stats"),
+    path("ops/compression/", views.compression_stats, name="compression_stats"),
     path("me/", views.me, name="me"),
     path("availability/me/", availability_views.availability_me, name="availability_me"),
     path(
@@ -30,11 +36,28 @@ urlpatterns = [
         name="availability_allowed_association_delete",
     ),
     path("availability/search/", availability_views.availability_search, name="availability_search"),
+    path(
+        "availability/search/facets/",
+        availability_views.availability_search_facets,
+        name="availability_search_facets",
+    ),
+    path("feeds/open-players/", feed_views.open_players_changes, name="feed_open_players"),
+    path("feeds/tryouts/", feed_views.tryouts_changes, name="feed_tryouts"),
     path("profile/me/", profile_views.profile_me, name="profile_me"),
     path("contact-requests/<int:pk>/respond/", contact_request_respond, name="contact_request_respond"),
     path("open-players/", open_players, name="open_players"),
     path("protected/", views.protected, name="protected"),
-    path("auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    # Listing is async; creation still goes through the viewset.
+    path("tryouts/", tryout_collection, name="tryout-list"),
+    path(
+        "auth/token/",
+        TokenObtainPairView.as_view(throttle_classes=[AuthTokenThrottle]),
+        name="token_obtain_pair",
+    ),
+    path(
+        "auth/token/refresh/",
+        TokenRefreshView.as_view(throttle_classes=[AuthTokenThrottle]),
+        name="token_refresh",
+    ),
     path("", include(router.urls)),
 ]
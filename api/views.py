@@ -1,35 +1,68 @@
-from rest_framework.decorators import api_view, permission_classes
+from asgiref.sync import sync_to_async
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from accounts.models import AccountProfile
+from accounts.permissions import IsAdminRole
+from api.async_views import async_api_view
 from api.serializers import MeSerializer
+from regions.cache import cache_stats as region_cache_stats
+from transferportal.middleware import overload
+from transferportal.middleware.compression import compression_stats as response_compression_stats
 
 
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def health(request):
+@throttle_classes([])
+async def health(request):
     return Response({"status": "ok"})
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def limiter_stats(request):
+    return Response(overload.limiter_stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def cache_stats(request):
+    return Response(region_cache_stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def compression_stats(request):
+    return Response(response_compression_stats())
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def protected(request):
     return Response({"detail": "authenticated"})
 
 
-@api_view(["GET", "PATCH"])
+def _update_me(request):
+    serializer = MeSerializer(
+        instance=request.user,
+        data=request.data,
+        partial=True,
+        context={"request": request},
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer.data
+
+
+@async_api_view(["GET", "PATCH"])
 @permission_classes([IsAuthenticated])
-def me(request):
+async def me(request):
     if request.method == "PATCH":
-        serializer = MeSerializer(
-            instance=request.user,
-            data=request.data,
-            partial=True,
-            context={"request": request},
-        )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
-
-    serializer = MeSerializer(instance=request.user, context={"request": request})
+        return Response(await sync_to_async(_update_me)(request))
+
+    user = request.user
+    # Prime the reverse one-to-one cache so serialization never hits the DB.
+    user.profile = await AccountProfile.objects.filter(user=user).afirst()
+    serializer = MeSerializer(instance=user, context={"request": request})
     return Response(serializer.data)
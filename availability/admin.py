@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from availability.models import PlayerAvailability
+from availability.models import OpenPlayerDocument, PlayerAvailability
 
 
 @admin.register(PlayerAvailability)
@@ -21,3 +21,16 @@ class PlayerAvailabilityAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     )
+
+
+@admin.register(OpenPlayerDocument)
+class OpenPlayerDocumentAdmin(admin.ModelAdmin):
+    list_display = ("username", "display_name", "region", "birth_year", "expires_at", "updated_at")
+    list_filter = ("region",)
+    search_fields = ("username", "display_name")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AvailabilityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "availability"
+
+    def ready(self) -> None:
+        from availability import signals  # noqa: F401
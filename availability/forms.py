@@ -2,28 +2,9 @@ from django import forms
 from django.utils import timezone
 
 from availability.models import PlayerAvailability
+from availability.positions import LEVEL_CHOICES, POSITION_CHOICES
 from organizations.models import Association
-
-
-POSITION_CHOICES = [
-    ("P", "Pitcher"),
-    ("C", "Catcher"),
-    ("1B", "First Base"),
-    ("2B", "Second Base"),
-    ("3B", "Third Base"),
-    ("SS", "Shortstop"),
-    ("OF", "Outfield"),
-    ("IF", "Infield"),
-    ("UTL", "Utility"),
-]
-
-LEVEL_CHOICES = [
-    ("AAA", "AAA"),
-    ("AA", "AA"),
-    ("A", "A"),
-    ("B", "B"),
-    ("C", "C"),
-]
+from organizations.widgets import AssociationTypeaheadSelectMultiple
 
 
 class PlayerAvailabilityForm(forms.ModelForm):
@@ -40,7 +21,7 @@ class PlayerAvailabilityForm(forms.ModelForm):
     allowed_associations = forms.ModelMultipleChoiceField(
         queryset=Association.objects.none(),
         required=False,
-        widget=forms.SelectMultiple,
+        widget=AssociationTypeaheadSelectMultiple,
         help_text="Only these associations can view your availability.",
     )
 
@@ -0,0 +1,116 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from availability.positions import (
+    LEVEL_BITS,
+    LEVEL_CHOICES,
+    MATCH_ALL,
+    MATCH_ANY,
+    POSITION_BITS,
+    POSITION_CHOICES,
+    encode_mask,
+)
+from availability.search import filter_levels, filter_positions
+from regions.models import Region
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark position/level filters against synthetic open players. "
+        "All rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=13)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            region = self._seed(options["players"], options["seed"])
+            self._run(region, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _seed(self, count, seed):
+        rng = random.Random(seed)
+        position_codes = [code for code, _ in POSITION_CHOICES]
+        level_codes = [code for code, _ in LEVEL_CHOICES]
+        region = Region.objects.create(code="benchmark", name="Benchmark", is_active=False)
+
+        started = time.perf_counter()
+        users = get_user_model().objects.bulk_create(
+            [get_user_model()(username=f"benchmark-player-{index}") for index in range(count)],
+            batch_size=2000,
+        )
+        availabilities = []
+        for user in users:
+            positions = rng.sample(position_codes, rng.randint(1, 3))
+            levels = rng.sample(level_codes, rng.randint(1, 2))
+            availabilities.append(PlayerAvailability(
+                player=user,
+                region=region,
+                positions=positions,
+                levels=levels,
+                position_mask=encode_mask(positions, POSITION_BITS),
+                level_mask=encode_mask(levels, LEVEL_BITS),
+            ))
+        availabilities = PlayerAvailability.objects.bulk_create(availabilities, batch_size=2000)
+        OpenPlayerDocument.objects.bulk_create(
+            [
+                OpenPlayerDocument(
+                    availability=availability,
+                    player_id=availability.player_id,
+                    region=region,
+                    username=f"benchmark-player-{index}",
+                    positions=availability.positions,
+                    levels=availability.levels,
+                    position_mask=availability.position_mask,
+                    level_mask=availability.level_mask,
+                )
+                for index, availability in enumerate(availabilities)
+            ],
+            batch_size=2000,
+        )
+        self.stdout.write(f"Seeded {count} players in {time.perf_counter() - started:.2f}s")
+        return region
+
+    def _run(self, region, repeat):
+        documents = OpenPlayerDocument.objects.filter(region=region)
+
+        def json_scan():
+            # The pre-bitmask approach on SQLite: load every list and filter in Python.
+            rows = PlayerAvailability.objects.filter(region=region).values_list("positions", "levels")
+            return sum(1 for positions, levels in rows if "SS" in positions and "AAA" in levels)
+
+        cases = [
+            ("JSON lists scanned in Python (SS and AAA)", json_scan),
+            (
+                "bitmask: any of SS at AAA",
+                lambda: filter_levels(filter_positions(documents, ["SS"]), ["AAA"]).count(),
+            ),
+            (
+                "bitmask: any of P, C",
+                lambda: filter_positions(documents, ["P", "C"], MATCH_ANY).count(),
+            ),
+            (
+                "bitmask: all of SS, 2B at AAA or AA",
+                lambda: filter_levels(
+                    filter_positions(documents, ["SS", "2B"], MATCH_ALL),
+                    ["AAA", "AA"],
+                ).count(),
+            ),
+        ]
+        for label, func in cases:
+            timings = []
+            result = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - started)
+            best = min(timings) * 1000
+            self.stdout.write(f"{label}: {result} rows, best of {repeat} = {best:.1f} ms")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from availability.search import rebuild_open_player_documents
+from regions.models import Region
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized open-player search documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--region", help="Only rebuild documents for this region code.")
+
+    def handle(self, *args, **options):
+        region = None
+        if options["region"]:
+            region = Region.objects.filter(code=options["region"].lower()).first()
+            if region is None:
+                raise CommandError(f"Unknown region: {options['region']}")
+
+        count = rebuild_open_player_documents(region=region)
+        scope = region.code if region else "all regions"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} open-player documents for {scope}."))
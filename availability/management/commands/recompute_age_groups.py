@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from availability.search import recompute_age_groups
+from regions.age_groups import season_year
+from regions.models import Region
+
+
+class Command(BaseCommand):
+    help = "Recompute stored player age groups, e.g. after the season rolls over."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--region", help="Only recompute this region code.")
+        parser.add_argument(
+            "--as-of",
+            type=date.fromisoformat,
+            help="Evaluate the season rule as of this date (YYYY-MM-DD) instead of today.",
+        )
+
+    def handle(self, *args, **options):
+        regions = Region.objects.all()
+        if options["region"]:
+            regions = regions.filter(code=options["region"].lower())
+            if not regions.exists():
+                raise CommandError(f"Unknown region: {options['region']}")
+
+        for region in regions:
+            updated = recompute_age_groups(region, today=options["as_of"])
+            self.stdout.write(
+                f"{region.code}: season {season_year(region, options['as_of'])}, {updated} players updated"
+            )
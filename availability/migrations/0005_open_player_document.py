@@ -0,0 +1,74 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_documents(apps, schema_editor):
+    PlayerAvailability = apps.get_model("availability", "PlayerAvailability")
+    OpenPlayerDocument = apps.get_model("availability", "OpenPlayerDocument")
+    PlayerProfile = apps.get_model("profiles", "PlayerProfile")
+    profiles = {profile.user_id: profile for profile in PlayerProfile.objects.all()}
+    rows = []
+    for availability in (
+        PlayerAvailability.objects.filter(is_open=True, is_committed=False)
+        .select_related("player")
+        .prefetch_related("allowed_associations")
+    ):
+        profile = profiles.get(availability.player_id)
+        association_ids = sorted(association.id for association in availability.allowed_associations.all())
+        rows.append(OpenPlayerDocument(
+            availability=availability,
+            player_id=availability.player_id,
+            region_id=availability.region_id,
+            username=availability.player.username,
+            display_name=profile.display_name if profile else "",
+            birth_year=profile.birth_year if profile else None,
+            bats=profile.bats if profile else "",
+            throws=profile.throws if profile else "",
+            positions=availability.positions,
+            levels=availability.levels,
+            allowed_association_ids=(
+                "," + ",".join(str(value) for value in association_ids) + "," if association_ids else ""
+            ),
+            expires_at=availability.expires_at,
+        ))
+    OpenPlayerDocument.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0004_allowed_associations'),
+        ('profiles', '0002_playerprofile_extended_fields'),
+        ('regions', '0002_seed_bc_region'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenPlayerDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150)),
+                ('display_name', models.CharField(blank=True, max_length=100)),
+                ('birth_year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('bats', models.CharField(blank=True, max_length=1)),
+                ('throws', models.CharField(blank=True, max_length=1)),
+                ('positions', models.JSONField(blank=True, null=True)),
+                ('levels', models.JSONField(blank=True, null=True)),
+                ('allowed_association_ids', models.TextField(blank=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('availability', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='availability.playeravailability')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='open_player_documents', to=settings.AUTH_USER_MODEL)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='open_player_documents', to='regions.region')),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['region', '-updated_at'], name='openplayer_region_updated'), models.Index(fields=['region', 'expires_at'], name='openplayer_region_expires'), models.Index(fields=['region', 'birth_year'], name='openplayer_region_birth_year')],
+            },
+        ),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
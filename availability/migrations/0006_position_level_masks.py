@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+from availability.positions import LEVEL_BITS, POSITION_BITS, encode_mask
+
+
+def backfill_masks(apps, schema_editor):
+    for model_name in ("PlayerAvailability", "OpenPlayerDocument"):
+        model = apps.get_model("availability", model_name)
+        rows = list(model.objects.only("id", "positions", "levels"))
+        for row in rows:
+            row.position_mask = encode_mask(row.positions, POSITION_BITS)
+            row.level_mask = encode_mask(row.levels, LEVEL_BITS)
+        model.objects.bulk_update(rows, ["position_mask", "level_mask"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0005_open_player_document'),
+        ('regions', '0002_seed_bc_region'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='openplayerdocument',
+            name='level_mask',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='openplayerdocument',
+            name='position_mask',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='playeravailability',
+            name='level_mask',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='playeravailability',
+            name='position_mask',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='openplayerdocument',
+            index=models.Index(fields=['region', 'position_mask'], name='openplayer_region_positions'),
+        ),
+        migrations.AddIndex(
+            model_name='openplayerdocument',
+            index=models.Index(fields=['region', 'level_mask'], name='openplayer_region_levels'),
+        ),
+        migrations.RunPython(backfill_masks, migrations.RunPython.noop),
+    ]
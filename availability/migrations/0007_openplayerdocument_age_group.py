@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+from regions.age_groups import age_group_for
+
+
+def backfill_age_groups(apps, schema_editor):
+    Region = apps.get_model("regions", "Region")
+    OpenPlayerDocument = apps.get_model("availability", "OpenPlayerDocument")
+    for region in Region.objects.all():
+        documents = OpenPlayerDocument.objects.filter(region=region, birth_year__isnull=False)
+        for birth_year in set(documents.values_list("birth_year", flat=True)):
+            documents.filter(birth_year=birth_year).update(age_group=age_group_for(birth_year, region))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0006_position_level_masks'),
+        ('regions', '0003_region_season_rules'),
+        ('regions', '0003_region_season_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='openplayerdocument',
+            name='age_group',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='openplayerdocument',
+            index=models.Index(fields=['region', 'age_group'], name='openplayer_region_age_group'),
+        ),
+        migrations.RunPython(backfill_age_groups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_allowed_associations(apps, schema_editor):
+    OpenPlayerDocument = apps.get_model("availability", "OpenPlayerDocument")
+    OpenPlayerDocumentAssociation = apps.get_model("availability", "OpenPlayerDocumentAssociation")
+    AllowedAssociation = apps.get_model("availability", "PlayerAvailability").allowed_associations.through
+    documents = dict(OpenPlayerDocument.objects.values_list("availability_id", "id"))
+    OpenPlayerDocumentAssociation.objects.bulk_create(
+        [
+            OpenPlayerDocumentAssociation(document_id=documents[availability_id], association_id=association_id)
+            for availability_id, association_id in AllowedAssociation.objects.filter(
+                playeravailability_id__in=list(documents)
+            ).values_list("playeravailability_id", "association_id")
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0007_openplayerdocument_age_group'),
+        ('organizations', '0007_association_domain_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpenPlayerDocumentAssociation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('association', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.association')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='association_links', to='availability.openplayerdocument')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='openplayerdocument',
+            name='allowed_associations',
+            field=models.ManyToManyField(related_name='+', through='availability.OpenPlayerDocumentAssociation', to='organizations.association'),
+        ),
+        migrations.AddIndex(
+            model_name='openplayerdocumentassociation',
+            index=models.Index(fields=['association', 'document'], name='openplayer_association_doc'),
+        ),
+        migrations.AddConstraint(
+            model_name='openplayerdocumentassociation',
+            constraint=models.UniqueConstraint(fields=('document', 'association'), name='openplayer_association_unique'),
+        ),
+        migrations.RunPython(link_allowed_associations, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='openplayerdocument',
+            name='allowed_association_ids',
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.db import models
 from django.utils import timezone
 
 from accounts.models import AccountProfile
+from availability.positions import LEVEL_BITS, POSITION_BITS, encode_mask
 from organizations.models import Association
 from regions.models import Region
 
@@ -20,6 +21,8 @@ class PlayerAvailability(models.Model):
     committed_at = models.DateTimeField(null=True, blank=True)
     positions = models.JSONField(null=True, blank=True)
     levels = models.JSONField(null=True, blank=True)
+    position_mask = models.PositiveIntegerField(default=0, editable=False)
+    level_mask = models.PositiveIntegerField(default=0, editable=False)
     expires_at = models.DateTimeField(null=True, blank=True)
     allowed_associations = models.ManyToManyField(
         Association,
@@ -37,6 +40,19 @@ class PlayerAvailability(models.Model):
         if profile and profile.role != AccountProfile.Roles.PLAYER:
             raise ValidationError({"player": "Only players can have availability records."})
 
+    def save(self, *args, **kwargs):
+        self.position_mask = encode_mask(self.positions, POSITION_BITS)
+        self.level_mask = encode_mask(self.levels, LEVEL_BITS)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "positions" in update_fields:
+                update_fields.add("position_mask")
+            if "levels" in update_fields:
+                update_fields.add("level_mask")
+            kwargs["update_fields"] = update_fields
+        return super().save(*args, **kwargs)
+
     @property
     def is_open_effective(self) -> bool:
         if self.is_committed:
@@ -49,3 +65,72 @@ class PlayerAvailability(models.Model):
 
     def __str__(self) -> str:
         return f"Availability for {self.player.username}"
+
+
+class OpenPlayerDocument(models.Model):
+    """Flattened, coach-searchable row for one open player in one region."""
+
+    availability = models.OneToOneField(
+        PlayerAvailability,
+        on_delete=models.CASCADE,
+        related_name="search_document",
+    )
+    player = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="open_player_documents",
+    )
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="open_player_documents")
+    username = models.CharField(max_length=150)
+    display_name = models.CharField(max_length=100, blank=True)
+    birth_year = models.PositiveSmallIntegerField(null=True, blank=True)
+    age_group = models.CharField(max_length=10, blank=True)
+    bats = models.CharField(max_length=1, blank=True)
+    throws = models.CharField(max_length=1, blank=True)
+    positions = models.JSONField(null=True, blank=True)
+    levels = models.JSONField(null=True, blank=True)
+    position_mask = models.PositiveIntegerField(default=0)
+    level_mask = models.PositiveIntegerField(default=0)
+    allowed_associations = models.ManyToManyField(
+        Association,
+        through="OpenPlayerDocumentAssociation",
+        related_name="+",
+    )
+    expires_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["region", "-updated_at"], name="openplayer_region_updated"),
+            models.Index(fields=["region", "expires_at"], name="openplayer_region_expires"),
+            models.Index(fields=["region", "birth_year"], name="openplayer_region_birth_year"),
+            models.Index(fields=["region", "age_group"], name="openplayer_region_age_group"),
+            models.Index(fields=["region", "position_mask"], name="openplayer_region_positions"),
+            models.Index(fields=["region", "level_mask"], name="openplayer_region_levels"),
+        ]
+
+    @property
+    def label(self) -> str:
+        return self.display_name or self.username
+
+    def __str__(self) -> str:
+        return f"Open player {self.username} ({self.region_id})"
+
+
+class OpenPlayerDocumentAssociation(models.Model):
+    """One association allowed to see an open player; the coach scope filter."""
+
+    document = models.ForeignKey(OpenPlayerDocument, on_delete=models.CASCADE, related_name="association_links")
+    association = models.ForeignKey(Association, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["document", "association"], name="openplayer_association_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["association", "document"], name="openplayer_association_doc"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.document_id} -> {self.association_id}"
@@ -0,0 +1,50 @@
+POSITION_CHOICES = [
+    ("P", "Pitcher"),
+    ("C", "Catcher"),
+    ("1B", "First Base"),
+    ("2B", "Second Base"),
+    ("3B", "Third Base"),
+    ("SS", "Shortstop"),
+    ("OF", "Outfield"),
+    ("IF", "Infield"),
+    ("UTL", "Utility"),
+]
+
+LEVEL_CHOICES = [
+    ("AAA", "AAA"),
+    ("AA", "AA"),
+    ("A", "A"),
+    ("B", "B"),
+    ("C", "C"),
+]
+
+# Bit positions follow the choice order above. Only ever append new codes so
+# stored masks keep their meaning.
+POSITION_BITS = {code: 1 << index for index, (code, _) in enumerate(POSITION_CHOICES)}
+LEVEL_BITS = {code: 1 << index for index, (code, _) in enumerate(LEVEL_CHOICES)}
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+
+
+def encode_mask(codes, bits) -> int:
+    mask = 0
+    for code in codes or []:
+        mask |= bits.get(code, 0)
+    return mask
+
+
+def decode_mask(mask: int, bits) -> list[str]:
+    return [code for code, bit in bits.items() if mask & bit]
+
+
+def matching_masks(required: int, bits, match: str = MATCH_ANY) -> list[int]:
+    """Every stored mask value that satisfies an any-of/all-of filter.
+
+    The vocabularies are small (9 positions, 5 levels), so the candidate list
+    stays short enough for a plain ``IN`` lookup on an indexed column.
+    """
+    width = len(bits)
+    if match == MATCH_ALL:
+        return [mask for mask in range(1 << width) if mask & required == required]
+    return [mask for mask in range(1 << width) if mask & required]
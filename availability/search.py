@@ -0,0 +1,329 @@
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from accounts.models import AccountProfile
+from accounts.permissions import IsAdminRole, IsApprovedCoach
+from availability.models import OpenPlayerDocument, OpenPlayerDocumentAssociation, PlayerAvailability
+from availability.positions import LEVEL_BITS, MATCH_ANY, POSITION_BITS, encode_mask, matching_masks
+from feeds.changes import record_changes
+from feeds.models import ChangeEntry
+from organizations.models import TeamCoach
+from profiles.models import PlayerProfile
+from regions.age_groups import age_group_for, age_group_map, normalize_age_group
+from regions.cache import acached_for_region, bump_version
+from regions.models import Region
+from regions.sharding import region_context
+
+
+def coach_association_ids(user, region) -> set[int]:
+    association_ids = set(TeamCoach.objects.filter(
+        user=user,
+        is_active=True,
+        team__region=region,
+    ).values_list("team__association_id", flat=True))
+    profile_association = getattr(getattr(user, "profile", None), "association", None)
+    if profile_association and profile_association.region_id == region.id:
+        association_ids.add(profile_association.id)
+    return association_ids
+
+
+def request_association_scope(request, region):
+    """Association ids a searcher may see, or ``None`` when unrestricted (admins)."""
+    if region is None:
+        return None
+    if IsApprovedCoach().has_permission(request, None) and not IsAdminRole().has_permission(request, None):
+        return coach_association_ids(request.user, region)
+    return None
+
+
+async def acoach_association_ids(user, region) -> set[int]:
+    coached = TeamCoach.objects.filter(user=user, is_active=True, team__region=region)
+    association_ids = {
+        association_id async for association_id in coached.values_list("team__association_id", flat=True)
+    }
+    profile_association_id = await (
+        AccountProfile.objects.filter(user=user, association__region=region)
+        .values_list("association_id", flat=True)
+        .afirst()
+    )
+    if profile_association_id is not None:
+        association_ids.add(profile_association_id)
+    return association_ids
+
+
+async def arequest_association_scope(request, region):
+    """``request_association_scope`` without touching lazily loaded profiles."""
+    if region is None:
+        return None
+    user = request.user
+    if user.is_staff or user.is_superuser:
+        return None
+    approved_coach = await AccountProfile.objects.filter(
+        user=user,
+        role=AccountProfile.Roles.COACH,
+        is_coach_approved=True,
+    ).aexists()
+    if approved_coach:
+        return await acoach_association_ids(user, region)
+    return None
+
+
+def is_searchable(availability) -> bool:
+    return availability.is_open and not availability.is_committed
+
+
+def sync_open_player_document(availability):
+    """Create, refresh or drop the search document for one availability row."""
+    if availability.pk is None:
+        return None
+    if not is_searchable(availability):
+        OpenPlayerDocument.objects.filter(availability_id=availability.pk).delete()
+        return None
+
+    profile = PlayerProfile.objects.filter(user_id=availability.player_id).first()
+    document, _ = OpenPlayerDocument.objects.update_or_create(
+        availability=availability,
+        defaults={
+            "player_id": availability.player_id,
+            "region_id": availability.region_id,
+            "username": availability.player.username,
+            "display_name": profile.display_name if profile else "",
+            "birth_year": profile.birth_year if profile else None,
+            "age_group": age_group_for(profile.birth_year if profile else None, availability.region),
+            "bats": profile.bats if profile else "",
+            "throws": profile.throws if profile else "",
+            "positions": availability.positions,
+            "levels": availability.levels,
+            "position_mask": availability.position_mask,
+            "level_mask": availability.level_mask,
+            "expires_at": availability.expires_at,
+        },
+    )
+    document.allowed_associations.set(availability.allowed_associations.values_list("id", flat=True))
+    # The document's own post_save bump ran before its links changed.
+    bump_search_cache_version(availability.region_id)
+    return document
+
+
+def sync_open_player_document_for_player(player_id):
+    availability = (
+        PlayerAvailability.objects.select_related("player", "region")
+        .filter(player_id=player_id)
+        .first()
+    )
+    if availability is None:
+        return None
+    return sync_open_player_document(availability)
+
+
+def build_open_player_document(availability, profile) -> OpenPlayerDocument:
+    """Unsaved document for ``bulk_create``; ``availability.player`` and ``.region`` must be loaded."""
+    return OpenPlayerDocument(
+        availability=availability,
+        player_id=availability.player_id,
+        region_id=availability.region_id,
+        username=availability.player.username,
+        display_name=profile.display_name if profile else "",
+        birth_year=profile.birth_year if profile else None,
+        age_group=age_group_for(profile.birth_year if profile else None, availability.region),
+        bats=profile.bats if profile else "",
+        throws=profile.throws if profile else "",
+        positions=availability.positions,
+        levels=availability.levels,
+        position_mask=availability.position_mask,
+        level_mask=availability.level_mask,
+        expires_at=availability.expires_at,
+    )
+
+
+def rebuild_open_player_documents(region=None) -> int:
+    """Drop and rebuild every document, optionally for a single region."""
+    if region is None:
+        return sum(rebuild_open_player_documents(region) for region in Region.objects.all())
+
+    with region_context(region):
+        OpenPlayerDocument.objects.filter(region=region).delete()
+        availabilities = (
+            PlayerAvailability.objects.filter(region=region, is_open=True, is_committed=False)
+            .select_related("player", "region")
+            .prefetch_related("allowed_associations")
+        )
+        profiles = {
+            profile.user_id: profile
+            for profile in PlayerProfile.objects.filter(
+                user_id__in=list(availabilities.values_list("player_id", flat=True))
+            )
+        }
+        rows = []
+        allowed = []
+        for availability in availabilities.iterator(chunk_size=2000):
+            rows.append(build_open_player_document(availability, profiles.get(availability.player_id)))
+            allowed.extend(
+                (availability.id, association.id) for association in availability.allowed_associations.all()
+            )
+        OpenPlayerDocument.objects.bulk_create(rows, batch_size=1000)
+        document_ids = dict(
+            OpenPlayerDocument.objects.filter(region=region).values_list("availability_id", "id")
+        )
+        OpenPlayerDocumentAssociation.objects.bulk_create(
+            [
+                OpenPlayerDocumentAssociation(
+                    document_id=document_ids[availability_id],
+                    association_id=association_id,
+                )
+                for availability_id, association_id in allowed
+            ],
+            batch_size=1000,
+        )
+        bump_search_cache_version(region.id)
+        record_changes(region.id, ChangeEntry.Streams.OPEN_PLAYERS, [row.player_id for row in rows])
+    return len(rows)
+
+
+def recompute_age_groups(region, today=None) -> int:
+    """Re-derive stored age groups for a region, one UPDATE per birth year."""
+    with region_context(region):
+        return _recompute_age_groups(region, today)
+
+
+def _recompute_age_groups(region, today) -> int:
+    documents = OpenPlayerDocument.objects.filter(region=region)
+    birth_years = documents.exclude(birth_year__isnull=True).values_list("birth_year", flat=True).distinct()
+    stale = documents.filter(birth_year__isnull=True).exclude(age_group="")
+    player_ids = list(stale.values_list("player_id", flat=True))
+    stale.update(age_group="")
+    for birth_year, label in age_group_map(region, set(birth_years), today).items():
+        stale = documents.filter(birth_year=birth_year).exclude(age_group=label)
+        player_ids.extend(stale.values_list("player_id", flat=True))
+        stale.update(age_group=label)
+    if player_ids:
+        bump_search_cache_version(region.id)
+        record_changes(region.id, ChangeEntry.Streams.OPEN_PLAYERS, player_ids)
+    return len(player_ids)
+
+
+def allowed_association_filter(association_ids) -> Q:
+    """Documents visible to any of ``association_ids``, via the indexed link table."""
+    links = OpenPlayerDocumentAssociation.objects.filter(association_id__in=list(association_ids))
+    return Q(pk__in=links.values("document_id"))
+
+
+def open_player_documents(region, association_ids=None):
+    """Open players in a region, limited to an association scope when given."""
+    if region is None:
+        return OpenPlayerDocument.objects.none()
+    now = timezone.now()
+    queryset = OpenPlayerDocument.objects.filter(region=region).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    )
+    if association_ids is not None:
+        queryset = queryset.filter(allowed_association_filter(association_ids))
+    return queryset
+
+
+def filter_by_mask(queryset, field: str, codes, bits, match: str = MATCH_ANY):
+    required = encode_mask(codes, bits)
+    if not required:
+        return queryset
+    return queryset.filter(**{f"{field}__in": matching_masks(required, bits, match)})
+
+
+def filter_positions(queryset, positions, match: str = MATCH_ANY):
+    return filter_by_mask(queryset, "position_mask", positions, POSITION_BITS, match)
+
+
+def filter_levels(queryset, levels, match: str = MATCH_ANY):
+    return filter_by_mask(queryset, "level_mask", levels, LEVEL_BITS, match)
+
+
+def apply_search_filters(queryset, filters):
+    """Apply validated ``OpenPlayerSearchFilterSerializer`` data to documents."""
+    queryset = filter_positions(
+        queryset,
+        filters.get("position"),
+        filters.get("position_match", MATCH_ANY),
+    )
+    queryset = filter_levels(
+        queryset,
+        filters.get("level"),
+        filters.get("level_match", MATCH_ANY),
+    )
+    if filters.get("birth_year"):
+        queryset = queryset.filter(birth_year__in=filters["birth_year"])
+    if filters.get("birth_year_min") is not None:
+        queryset = queryset.filter(birth_year__gte=filters["birth_year_min"])
+    if filters.get("birth_year_max") is not None:
+        queryset = queryset.filter(birth_year__lte=filters["birth_year_max"])
+    if filters.get("age_group"):
+        queryset = queryset.filter(age_group__in=[normalize_age_group(value) for value in filters["age_group"]])
+    if filters.get("bats"):
+        queryset = queryset.filter(bats__in=filters["bats"])
+    if filters.get("throws"):
+        queryset = queryset.filter(throws__in=filters["throws"])
+    if filters.get("association"):
+        queryset = queryset.filter(allowed_association_filter(filters["association"]))
+    return queryset
+
+
+GROUPED_FACET_FIELDS = ("birth_year", "age_group", "bats", "throws")
+
+
+async def asearch_facets(queryset, region, association_ids=None) -> dict:
+    """Counts per filter value for an already-filtered document queryset.
+
+    Bit-packed facets come from one conditional aggregate; associations and
+    plain columns use one grouped query each.
+    """
+    aggregates = {"total": Count("id")}
+    for index, (code, bit) in enumerate(POSITION_BITS.items()):
+        aggregates[f"position_{index}"] = Count("id", filter=Q(position_mask__in=matching_masks(bit, POSITION_BITS)))
+    for index, (code, bit) in enumerate(LEVEL_BITS.items()):
+        aggregates[f"level_{index}"] = Count("id", filter=Q(level_mask__in=matching_masks(bit, LEVEL_BITS)))
+    totals = await queryset.order_by().aaggregate(**aggregates)
+
+    facets = {
+        "total": totals["total"],
+        "position": {
+            code: totals[f"position_{index}"]
+            for index, code in enumerate(POSITION_BITS)
+            if totals[f"position_{index}"]
+        },
+        "level": {
+            code: totals[f"level_{index}"]
+            for index, code in enumerate(LEVEL_BITS)
+            if totals[f"level_{index}"]
+        },
+    }
+    links = OpenPlayerDocumentAssociation.objects.filter(document__in=queryset.order_by().values("pk"))
+    if association_ids is None:
+        links = links.filter(association__region=region)
+    else:
+        links = links.filter(association_id__in=list(association_ids))
+    rows = links.values("association_id").annotate(count=Count("document_id")).order_by("association_id")
+    facets["association"] = {str(row["association_id"]): row["count"] async for row in rows}
+    for field in GROUPED_FACET_FIELDS:
+        rows = queryset.order_by().exclude(**{f"{field}__isnull": True})
+        if field != "birth_year":
+            rows = rows.exclude(**{field: ""})
+        rows = rows.values(field).annotate(count=Count("id")).order_by(field)
+        facets[field] = {str(row[field]): row["count"] async for row in rows}
+    return facets
+
+
+def bump_search_cache_version(region_id) -> None:
+    """Invalidate every cached search result for a region."""
+    bump_version(region_id, OpenPlayerDocument)
+
+
+async def acached_search(region, association_ids, filters, kind: str, compute):
+    """Cache ``await compute()`` per region, coach scope and filter set."""
+    scope = None if association_ids is None else sorted(association_ids)
+    return await acached_for_region(
+        region,
+        f"open-players:{kind}",
+        compute,
+        depends_on=[OpenPlayerDocument],
+        parts=[scope, filters],
+        timeout=settings.OPEN_PLAYER_SEARCH_CACHE_TIMEOUT,
+    )
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 
-from availability.models import PlayerAvailability
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from availability.positions import LEVEL_CHOICES, MATCH_ALL, MATCH_ANY, POSITION_CHOICES
 from organizations.models import Association
+from profiles.models import PlayerProfile
 
 
 class PlayerAvailabilityMeSerializer(serializers.ModelSerializer):
@@ -40,12 +42,12 @@ class PlayerAvailabilityMeSerializer(serializers.ModelSerializer):
 
 
 class PlayerAvailabilitySearchSerializer(serializers.ModelSerializer):
-    player_id = serializers.IntegerField(source="player.id", read_only=True)
+    player_id = serializers.IntegerField(read_only=True)
     region_code = serializers.CharField(source="region.code", read_only=True)
     age_group = serializers.SerializerMethodField()
 
     class Meta:
-        model = PlayerAvailability
+        model = OpenPlayerDocument
         fields = (
             "player_id",
             "positions",
@@ -55,4 +57,43 @@ class PlayerAvailabilitySearchSerializer(serializers.ModelSerializer):
         )
 
     def get_age_group(self, obj):
-        return None
+        return obj.age_group or None
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """Accept both ``?position=SS&position=P`` and ``?position=SS,P``."""
+
+    def to_internal_value(self, data):
+        values = []
+        for item in data:
+            values.extend(part.strip() for part in str(item).split(",") if part.strip())
+        return super().to_internal_value(values)
+
+
+class OpenPlayerSearchFilterSerializer(serializers.Serializer):
+    position = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=POSITION_CHOICES),
+        required=False,
+    )
+    position_match = serializers.ChoiceField(choices=[MATCH_ANY, MATCH_ALL], default=MATCH_ANY)
+    level = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=LEVEL_CHOICES),
+        required=False,
+    )
+    level_match = serializers.ChoiceField(choices=[MATCH_ANY, MATCH_ALL], default=MATCH_ANY)
+    birth_year = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1900, max_value=2100),
+        required=False,
+    )
+    birth_year_min = serializers.IntegerField(min_value=1900, max_value=2100, required=False)
+    birth_year_max = serializers.IntegerField(min_value=1900, max_value=2100, required=False)
+    age_group = CommaSeparatedListField(child=serializers.CharField(max_length=10), required=False)
+    bats = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=PlayerProfile.Bats.choices),
+        required=False,
+    )
+    throws = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=PlayerProfile.Throws.choices),
+        required=False,
+    )
+    association = CommaSeparatedListField(child=serializers.IntegerField(min_value=1), required=False)
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from availability.search import (
+    bump_search_cache_version,
+    recompute_age_groups,
+    sync_open_player_document,
+    sync_open_player_document_for_player,
+)
+from feeds.changes import record_change
+from feeds.models import ChangeEntry
+from profiles.models import PlayerProfile
+from regions.models import Region
+
+
+@receiver(post_save, sender=PlayerAvailability)
+def sync_document_on_availability_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_open_player_document(instance)
+
+
+@receiver(post_save, sender=PlayerProfile)
+def sync_document_on_profile_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_open_player_document_for_player(instance.user_id)
+
+
+@receiver(m2m_changed, sender=PlayerAvailability.allowed_associations.through)
+def sync_document_on_allowed_associations_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed from the Association side: pk_set holds availability ids.
+        if action == "pre_clear":
+            instance._cleared_availability_ids = list(
+                instance.allowed_availabilities.values_list("id", flat=True)
+            )
+            return
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        if action == "post_clear":
+            availability_ids = getattr(instance, "_cleared_availability_ids", [])
+        else:
+            availability_ids = pk_set or []
+        for availability in PlayerAvailability.objects.filter(id__in=availability_ids).select_related("player"):
+            sync_open_player_document(availability)
+        return
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        sync_open_player_document(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_document_username(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw:
+        return
+    if update_fields is not None and "username" not in update_fields:
+        return
+    documents = OpenPlayerDocument.objects.filter(player_id=instance.pk).exclude(username=instance.username)
+    region_ids = set(documents.values_list("region_id", flat=True))
+    if region_ids:
+        documents.update(username=instance.username, updated_at=timezone.now())
+        for region_id in region_ids:
+            bump_search_cache_version(region_id)
+            record_change(region_id, ChangeEntry.Streams.OPEN_PLAYERS, instance.pk)
+
+
+@receiver(post_save, sender=Region)
+def recompute_age_groups_on_rule_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(Region.SEASON_RULE_FIELDS):
+        return
+    if instance.season_rule_changed():
+        recompute_age_groups(instance)
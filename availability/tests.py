@@ -1,14 +1,22 @@
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.test import APIClient
 
 from accounts.models import AccountProfile
-from availability.models import PlayerAvailability
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from availability.positions import POSITION_BITS
+from availability.search import apply_search_filters, open_player_documents
 from contacts.models import AuditLog
 from organizations.models import Association, Team, TeamCoach
+from profiles.models import PlayerProfile
+from regions.age_groups import age_group_for
 from regions.models import Region
 
 
@@ -17,6 +25,7 @@ User = get_user_model()
 
 class AvailabilityApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.player = User.objects.create_user(username="player1", password="testpass")
         self.player.profile.role = AccountProfile.Roles.PLAYER
@@ -96,6 +105,108 @@ class AvailabilityApiTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
 
+    def test_search_filters_positions_and_levels(self):
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        shortstop = PlayerAvailability.objects.create(
+            player=self.player,
+            region=self.bc,
+            is_open=True,
+            positions=["SS", "2B"],
+            levels=["AAA"],
+        )
+        shortstop.allowed_associations.add(self.assoc_bc)
+        other_player = User.objects.create_user(username="player2", password="testpass")
+        pitcher = PlayerAvailability.objects.create(
+            player=other_player,
+            region=self.bc,
+            is_open=True,
+            positions=["P", "SS"],
+            levels=["AA"],
+        )
+        pitcher.allowed_associations.add(self.assoc_bc)
+
+        self.client.force_authenticate(user=self.coach)
+        response = self.client.get(
+            "/api/v1/availability/search/?position=SS&level=AAA",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual([row["player_id"] for row in response.data], [self.player.id])
+
+        response = self.client.get(
+            "/api/v1/availability/search/?position=SS,P&position_match=all",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual([row["player_id"] for row in response.data], [other_player.id])
+
+        response = self.client.get(
+            "/api/v1/availability/search/?position=SS,P",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(len(response.data), 2)
+
+    def test_search_facets_count_filtered_players(self):
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        first = PlayerAvailability.objects.create(
+            player=self.player,
+            region=self.bc,
+            is_open=True,
+            positions=["SS"],
+            levels=["AAA"],
+        )
+        first.allowed_associations.add(self.assoc_bc)
+        PlayerProfile.objects.create(user=self.player, birth_year=2012, bats="R", throws="R")
+        other_player = User.objects.create_user(username="player2", password="testpass")
+        second = PlayerAvailability.objects.create(
+            player=other_player,
+            region=self.bc,
+            is_open=True,
+            positions=["SS", "P"],
+            levels=["AA"],
+        )
+        second.allowed_associations.add(self.assoc_bc)
+        PlayerProfile.objects.create(user=other_player, birth_year=2011, bats="L", throws="L")
+
+        self.client.force_authenticate(user=self.coach)
+        response = self.client.get("/api/v1/availability/search/facets/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(response.data["position"], {"P": 1, "SS": 2})
+        self.assertEqual(response.data["level"], {"AAA": 1, "AA": 1})
+        self.assertEqual(response.data["birth_year"], {"2011": 1, "2012": 1})
+        self.assertEqual(response.data["bats"], {"L": 1, "R": 1})
+        self.assertEqual(response.data["association"], {str(self.assoc_bc.id): 2})
+
+        response = self.client.get(
+            "/api/v1/availability/search/facets/?bats=L",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["level"], {"AA": 1})
+
+    def test_cached_search_invalidated_when_availability_changes(self):
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        availability.allowed_associations.add(self.assoc_bc)
+
+        self.client.force_authenticate(user=self.coach)
+        response = self.client.get("/api/v1/availability/search/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(len(response.data), 1)
+
+        availability.is_open = False
+        availability.save(update_fields=["is_open"])
+        response = self.client.get("/api/v1/availability/search/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(len(response.data), 0)
+
+    def test_search_rejects_unknown_position(self):
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        self.client.force_authenticate(user=self.coach)
+        response = self.client.get("/api/v1/availability/search/?position=XX", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 400)
+
     def test_expired_availability_excluded(self):
         self.coach.profile.is_coach_approved = True
         self.coach.profile.save()
@@ -200,3 +311,105 @@ class AvailabilityApiTests(TestCase):
             HTTP_HOST="bc.localhost:8000",
         )
         self.assertEqual(response.status_code, 404)
+
+
+class OpenPlayerDocumentTests(TestCase):
+    def setUp(self):
+        self.player = User.objects.create_user(username="player1", password="testpass")
+        self.player.profile.role = AccountProfile.Roles.PLAYER
+        self.player.profile.save()
+        self.bc = Region.objects.get(code="bc")
+        self.assoc_bc = Association.objects.create(region=self.bc, name="BC Assoc")
+        self.other_assoc = Association.objects.create(region=self.bc, name="Other Assoc")
+
+    def test_document_tracks_open_status(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        self.assertTrue(OpenPlayerDocument.objects.filter(availability=availability).exists())
+
+        availability.is_committed = True
+        availability.save(update_fields=["is_committed"])
+        self.assertFalse(OpenPlayerDocument.objects.filter(availability=availability).exists())
+
+    def test_document_tracks_profile_and_allowed_associations(self):
+        availability = PlayerAvailability.objects.create(
+            player=self.player,
+            region=self.bc,
+            is_open=True,
+            positions=["SS"],
+        )
+        availability.allowed_associations.add(self.assoc_bc, self.other_assoc)
+        PlayerProfile.objects.create(user=self.player, display_name="Pat Player", birth_year=2012)
+
+        document = OpenPlayerDocument.objects.get(availability=availability)
+        self.assertEqual(document.position_mask, POSITION_BITS["SS"])
+        self.assertEqual(document.display_name, "Pat Player")
+        self.assertEqual(document.birth_year, 2012)
+        self.assertEqual(document.positions, ["SS"])
+        self.assertEqual(
+            set(document.allowed_associations.values_list("id", flat=True)),
+            {self.assoc_bc.id, self.other_assoc.id},
+        )
+
+        availability.allowed_associations.remove(self.assoc_bc)
+        self.assertEqual(open_player_documents(self.bc, {self.assoc_bc.id}).count(), 0)
+        self.assertEqual(open_player_documents(self.bc, {self.other_assoc.id}).count(), 1)
+
+    def test_scope_filter_uses_association_links(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        availability.allowed_associations.add(self.assoc_bc)
+        queryset = open_player_documents(self.bc, {self.assoc_bc.id, self.other_assoc.id})
+        sql = str(queryset.query)
+        self.assertIn("availability_openplayerdocumentassociation", sql)
+        self.assertNotIn("LIKE", sql)
+        self.assertEqual(queryset.count(), 1)
+
+    def test_association_side_changes_are_synced(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        self.assoc_bc.allowed_availabilities.add(availability)
+        self.assertEqual(open_player_documents(self.bc, {self.assoc_bc.id}).count(), 1)
+
+        self.assoc_bc.allowed_availabilities.clear()
+        self.assertEqual(open_player_documents(self.bc, {self.assoc_bc.id}).count(), 0)
+
+    def test_rebuild_command_recreates_documents(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        availability.allowed_associations.add(self.assoc_bc)
+        OpenPlayerDocument.objects.all().delete()
+
+        call_command("rebuild_open_player_documents", stdout=StringIO())
+        document = OpenPlayerDocument.objects.get(availability=availability)
+        self.assertEqual(document.username, "player1")
+        self.assertEqual(list(document.allowed_associations.values_list("id", flat=True)), [self.assoc_bc.id])
+
+    def test_age_group_is_stored_and_recomputed(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        PlayerProfile.objects.create(user=self.player, birth_year=2013)
+        document = OpenPlayerDocument.objects.get(availability=availability)
+        self.assertEqual(document.age_group, age_group_for(2013, self.bc))
+
+        OpenPlayerDocument.objects.filter(pk=document.pk).update(age_group="")
+        call_command("recompute_age_groups", "--as-of", "2026-03-01", stdout=StringIO())
+        document.refresh_from_db()
+        self.assertEqual(document.age_group, "13U")
+        self.assertEqual(open_player_documents(self.bc).filter(age_group="13U").count(), 1)
+
+    def test_region_save_recomputes_only_when_season_rule_changes(self):
+        region = Region.objects.get(pk=self.bc.pk)
+        with mock.patch("availability.signals.recompute_age_groups") as recompute:
+            region.name = "British Columbia"
+            region.save(update_fields=["name"])
+            region.save()
+            recompute.assert_not_called()
+
+            region.age_groups = "10U,12U,14U,18U"
+            region.save()
+            region.save(update_fields=["age_groups"])
+        recompute.assert_called_once_with(region)
+
+    def test_age_group_filter_ignores_case(self):
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        PlayerProfile.objects.create(user=self.player, birth_year=2013)
+        label = OpenPlayerDocument.objects.get(availability=availability).age_group
+
+        documents = apply_search_filters(open_player_documents(self.bc), {"age_group": [f" {label.lower()}"]})
+        self.assertEqual(list(documents.values_list("player_id", flat=True)), [self.player.id])
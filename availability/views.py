@@ -1,18 +1,26 @@
-from django.db.models import Q
 from django.utils import timezone
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from accounts.permissions import IsAdminRole, IsApprovedCoach
+from api.async_views import async_api_view
+from api.throttling import SearchThrottle, UserTokenBucketThrottle
 from contacts.models import AuditLog
 from availability.models import PlayerAvailability
 from availability.permissions import AvailabilitySearchPermission, IsPlayerRole
+from availability.search import (
+    acached_search,
+    apply_search_filters,
+    arequest_association_scope,
+    asearch_facets,
+    open_player_documents,
+)
 from availability.serializers import (
+    OpenPlayerSearchFilterSerializer,
     PlayerAvailabilityMeSerializer,
     PlayerAvailabilitySearchSerializer,
 )
-from organizations.models import Association, TeamCoach
+from organizations.models import Association
 from organizations.serializers import AssociationSerializer
 from regions.utils import get_request_region
 
@@ -21,15 +29,6 @@ AUDIT_COMMITTED_SET = "COMMITTED_SET"
 AUDIT_COMMITTED_CLEARED = "COMMITTED_CLEARED"
 
 
-def _base_open_queryset(region):
-    now = timezone.now()
-    return PlayerAvailability.objects.filter(
-        region=region,
-        is_open=True,
-        is_committed=False,
-    ).filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
-
-
 @api_view(["GET", "PATCH"])
 @permission_classes([IsAuthenticated, IsPlayerRole])
 def availability_me(request):
@@ -76,25 +75,47 @@ def availability_me(request):
     return Response(serializer.data)
 
 
-@api_view(["GET"])
+async def open_player_search_results(request, region):
+    """Filtered open-player rows for the current searcher, cached per scope."""
+    filters = OpenPlayerSearchFilterSerializer(data=request.query_params)
+    filters.is_valid(raise_exception=True)
+    if region is None:
+        return []
+    association_ids = await arequest_association_scope(request, region)
+
+    async def compute():
+        queryset = open_player_documents(region, association_ids).select_related("region")
+        queryset = apply_search_filters(queryset, filters.validated_data)
+        documents = [document async for document in queryset]
+        return PlayerAvailabilitySearchSerializer(documents, many=True).data
+
+    return await acached_search(region, association_ids, filters.validated_data, "results", compute)
+
+
+@async_api_view(["GET"])
 @permission_classes([IsAuthenticated, AvailabilitySearchPermission])
-def availability_search(request):
+@throttle_classes([UserTokenBucketThrottle, SearchThrottle])
+async def availability_search(request):
     region = getattr(request, "region", None)
-    queryset = _base_open_queryset(region)
-
-    if IsApprovedCoach().has_permission(request, None) and not IsAdminRole().has_permission(request, None):
-        association_ids = set(TeamCoach.objects.filter(
-            user=request.user,
-            is_active=True,
-            team__region=region,
-        ).values_list("team__association_id", flat=True))
-        profile_association = getattr(getattr(request.user, "profile", None), "association", None)
-        if profile_association and profile_association.region_id == region.id:
-            association_ids.add(profile_association.id)
-        queryset = queryset.filter(allowed_associations__in=association_ids).distinct()
-
-    serializer = PlayerAvailabilitySearchSerializer(queryset, many=True)
-    return Response(serializer.data)
+    return Response(await open_player_search_results(request, region))
+
+
+@async_api_view(["GET"])
+@permission_classes([IsAuthenticated, AvailabilitySearchPermission])
+@throttle_classes([UserTokenBucketThrottle, SearchThrottle])
+async def availability_search_facets(request):
+    region = getattr(request, "region", None)
+    filters = OpenPlayerSearchFilterSerializer(data=request.query_params)
+    filters.is_valid(raise_exception=True)
+    if region is None:
+        return Response({"total": 0})
+    association_ids = await arequest_association_scope(request, region)
+
+    async def compute():
+        queryset = apply_search_filters(open_player_documents(region, association_ids), filters.validated_data)
+        return await asearch_facets(queryset, region, association_ids)
+
+    return Response(await acached_search(region, association_ids, filters.validated_data, "facets", compute))
 
 
 @api_view(["GET", "POST"])
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_remove_contactrequest_unique_pending_request_per_player_association_and_more'),
+        ('organizations', '0007_association_domain_index'),
+        ('regions', '0003_region_season_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['player', 'region', '-created_at', '-id'], name='contact_player_created'),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['requested_by', 'region', '-created_at', '-id'], name='contact_sender_created'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contact_request_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactrequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -40,9 +40,14 @@ class ContactRequest(models.Model):
     message = models.CharField(max_length=500, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["player", "region", "-created_at", "-id"], name="contact_player_created"),
+            models.Index(fields=["requested_by", "region", "-created_at", "-id"], name="contact_sender_created"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["player", "requesting_team"],
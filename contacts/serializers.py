@@ -152,5 +152,5 @@ class ContactRequestRespondSerializer(serializers.Serializer):
         contact_request = self.context.get("contact_request")
         contact_request.status = self.validated_data["status"]
         contact_request.responded_at = timezone.now()
-        contact_request.save(update_fields=["status", "responded_at"])
+        contact_request.save(update_fields=["status", "responded_at", "updated_at"])
         return contact_request
@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
@@ -18,6 +19,7 @@ User = get_user_model()
 
 class ContactRequestApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.player = User.objects.create_user(
             username="player1",
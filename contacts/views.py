@@ -1,7 +1,5 @@
-from django.db import models
-from django.utils import timezone
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
@@ -9,16 +7,16 @@ from rest_framework.mixins import CreateModelMixin, ListModelMixin
 
 from accounts.models import AccountProfile
 from accounts.permissions import IsAdminRole, IsApprovedCoach
-from availability.models import PlayerAvailability
+from api.async_views import async_api_view
+from api.throttling import SearchThrottle, UserTokenBucketThrottle
 from availability.permissions import AvailabilitySearchPermission
-from availability.serializers import PlayerAvailabilitySearchSerializer
+from availability.views import open_player_search_results
 from contacts.models import AuditLog, ContactRequest
 from contacts.serializers import (
     ContactRequestCreateSerializer,
     ContactRequestRespondSerializer,
     ContactRequestSerializer,
 )
-from organizations.models import TeamCoach
 from regions.utils import get_request_region
 
 
@@ -109,32 +107,9 @@ def contact_request_respond(request, pk):
     return Response(output.data, status=status.HTTP_200_OK)
 
 
-@api_view(["GET"])
+@async_api_view(["GET"])
 @permission_classes([IsAuthenticated, AvailabilitySearchPermission])
-def open_players(request):
-    region = get_request_region(request)
-    if region is None:
-        return Response([], status=status.HTTP_200_OK)
-
-    now = timezone.now()
-    queryset = PlayerAvailability.objects.filter(
-        region=region,
-        is_open=True,
-        is_committed=False,
-    ).filter(
-        models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=now)
-    )
-
-    if IsApprovedCoach().has_permission(request, None) and not IsAdminRole().has_permission(request, None):
-        association_ids = set(TeamCoach.objects.filter(
-            user=request.user,
-            is_active=True,
-            team__region=region,
-        ).values_list("team__association_id", flat=True))
-        profile_association = getattr(getattr(request.user, "profile", None), "association", None)
-        if profile_association and profile_association.region_id == region.id:
-            association_ids.add(profile_association.id)
-        queryset = queryset.filter(allowed_associations__in=association_ids).distinct()
-
-    serializer = PlayerAvailabilitySearchSerializer(queryset, many=True)
-    return Response(serializer.data)
+@throttle_classes([UserTokenBucketThrottle, SearchThrottle])
+async def open_players(request):
+    region = getattr(request, "region", None)
+    return Response(await open_player_search_results(request, region), status=status.HTTP_200_OK)
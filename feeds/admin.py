@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from feeds.models import ChangeEntry
+
+
+@admin.register(ChangeEntry)
+class ChangeEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "region", "stream", "object_id", "operation", "created_at")
+    list_filter = ("region", "stream", "operation")
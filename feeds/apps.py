@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class FeedsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "feeds"
+
+    def ready(self) -> None:
+        from feeds import signals  # noqa: F401
@@ -0,0 +1,20 @@
+from feeds.models import ChangeEntry
+
+
+def record_change(region_id, stream, object_id, operation=ChangeEntry.Operations.UPSERT, audience_id=None):
+    return ChangeEntry.objects.create(
+        region_id=region_id,
+        stream=stream,
+        object_id=object_id,
+        operation=operation,
+        audience_id=audience_id,
+    )
+
+
+def record_changes(region_id, stream, object_ids, operation=ChangeEntry.Operations.UPSERT) -> int:
+    entries = [
+        ChangeEntry(region_id=region_id, stream=stream, object_id=object_id, operation=operation)
+        for object_id in object_ids
+    ]
+    ChangeEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError
+from django.utils import timezone
+
+from feeds.models import ChangeEntry
+from feeds.sync import expired_open_players, latest_entry_id, settled_entries
+from regions.sharding import region_context
+
+logger = logging.getLogger(__name__)
+
+# Comment frames keep proxies from closing idle streams.
+KEEPALIVE_SECONDS = 15
+
+
+def format_event(event: str, data, event_id: str | None = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscriber:
+    def __init__(self, poller, audience_id=None):
+        self.poller = poller
+        self.audience_id = audience_id
+        self.woken = asyncio.Event()
+
+    def wants(self, audiences) -> bool:
+        return self.audience_id is None or None in audiences or self.audience_id in audiences
+
+
+class ChangePoller:
+    """Watches one region's change stream for every connection in this process.
+
+    Each poll is a single indexed query, however many streams are open.
+    Connections whose audience received new settled entries are woken and read
+    their own page; idle connections cost nothing.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, region, stream):
+        self.region = region
+        self.stream = stream
+        self.subscribers: set[Subscriber] = set()
+        self.last_id = 0
+        self.checked_at = None
+        self.task = None
+
+    async def start(self):
+        self.last_id, self.checked_at = await sync_to_async(self._watermark)()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+
+    def _watermark(self):
+        now = timezone.now()
+        with region_context(self.region):
+            return latest_entry_id(self.region, self.stream, now=now), now
+
+    def poll(self) -> set:
+        """Audience ids with new settled entries; ``None`` in the set wakes everyone."""
+        now = timezone.now()
+        audiences = set()
+        with region_context(self.region):
+            while True:
+                entries = settled_entries(self.region, self.stream, self.last_id, self.batch_size, now=now)
+                batch = entries[: self.batch_size]
+                if batch:
+                    self.last_id = batch[-1][0]
+                    audiences.update(audience_id for _, _, audience_id in batch)
+                if len(entries) <= self.batch_size:
+                    break
+            if self.stream == ChangeEntry.Streams.OPEN_PLAYERS and expired_open_players(
+                self.region, self.checked_at, now
+            ).exists():
+                audiences.add(None)
+        self.checked_at = now
+        return audiences
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.EVENT_STREAM_POLL_SECONDS)
+            try:
+                audiences = await sync_to_async(self.poll)()
+            except DatabaseError:
+                logger.exception("Change feed poll failed for %s/%s", self.region.code, self.stream)
+                continue
+            if not audiences:
+                continue
+            for subscriber in list(self.subscribers):
+                if subscriber.wants(audiences):
+                    subscriber.woken.set()
+
+
+_pollers: dict[tuple, ChangePoller] = {}
+
+
+async def subscribe(region, stream, audience_id=None) -> Subscriber:
+    """Register a connection with the poller for its region and stream, starting it if needed."""
+    key = (asyncio.get_running_loop(), region.id, stream)
+    poller = _pollers.get(key)
+    subscriber = Subscriber(poller or ChangePoller(region, stream), audience_id)
+    subscriber.poller.subscribers.add(subscriber)
+    if poller is None:
+        _pollers[key] = subscriber.poller
+        try:
+            await subscriber.poller.start()
+        except Exception:
+            del _pollers[key]
+            raise
+    return subscriber
+
+
+async def unsubscribe(subscriber) -> None:
+    poller = subscriber.poller
+    poller.subscribers.discard(subscriber)
+    if poller.subscribers:
+        return
+    key = (asyncio.get_running_loop(), poller.region.id, poller.stream)
+    if _pollers.get(key) is poller:
+        del _pollers[key]
+    await poller.stop()
+
+
+async def stream_events(poll, to_events, cursor, region, stream, audience_id=None):
+    """Yield Server-Sent Event frames for a change feed.
+
+    ``poll(cursor)`` returns a ``FeedPage``; ``to_events(page)`` turns it into
+    ``(event, data)`` pairs. The connection reads a page when it opens and
+    again whenever the process-wide ``ChangePoller`` reports new entries for
+    it. It closes after EVENT_STREAM_MAX_SECONDS so the browser reconnects
+    with ``Last-Event-ID``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENT_STREAM_MAX_SECONDS
+    poll = sync_to_async(poll)
+    yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+    subscriber = await subscribe(region, stream, audience_id)
+    try:
+        while True:
+            subscriber.woken.clear()
+            page = await poll(cursor)
+            cursor = page.cursor
+            for event, data in to_events(page):
+                yield format_event(event, data, cursor)
+            if page.has_more:
+                continue
+            while not subscriber.woken.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(subscriber.woken.wait(), min(remaining, KEEPALIVE_SECONDS))
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+    finally:
+        await unsubscribe(subscriber)
+
+
+def open_player_events(page):
+    events = [("player.visible", row) for row in page.upserts]
+    events.extend(("player.hidden", {"player_id": player_id}) for player_id in page.removals)
+    return events
+
+
+def contact_request_events(page):
+    return [
+        ("request.created" if row["status"] == "pending" else "request.answered", row)
+        for row in page.upserts
+    ]
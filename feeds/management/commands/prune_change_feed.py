@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from feeds.models import ChangeEntry
+from feeds.sync import retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Delete change-feed entries older than CHANGE_FEED_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.CHANGE_FEED_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        # Cursors expire against the same cutoff (see feeds.sync._is_expired).
+        cutoff = retention_cutoff(days=options["days"])
+        deleted, _ = ChangeEntry.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} change entries older than {options['days']} days")
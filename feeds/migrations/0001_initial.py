@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('regions', '0003_region_season_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stream', models.CharField(choices=[('open_players', 'Open players'), ('tryouts', 'Tryouts')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('remove', 'Remove')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_entries', to='regions.region')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['region', 'stream', 'id'], name='changeentry_region_stream')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0001_initial'),
+        ('regions', '0003_region_season_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changeentry',
+            name='audience_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='changeentry',
+            name='stream',
+            field=models.CharField(choices=[('open_players', 'Open players'), ('tryouts', 'Tryouts'), ('contact_requests', 'Contact requests')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='changeentry',
+            index=models.Index(fields=['stream', 'audience_id', 'id'], name='changeentry_audience'),
+        ),
+    ]
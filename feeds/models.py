@@ -0,0 +1,34 @@
+from django.db import models
+
+from regions.models import Region
+
+
+class ChangeEntry(models.Model):
+    """Append-only log of changes that delta-sync clients poll for."""
+
+    class Streams(models.TextChoices):
+        OPEN_PLAYERS = "open_players", "Open players"
+        TRYOUTS = "tryouts", "Tryouts"
+        CONTACT_REQUESTS = "contact_requests", "Contact requests"
+
+    class Operations(models.TextChoices):
+        UPSERT = "upsert", "Upsert"
+        REMOVE = "remove", "Remove"
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="change_entries")
+    stream = models.CharField(max_length=20, choices=Streams.choices)
+    object_id = models.PositiveBigIntegerField()
+    operation = models.CharField(max_length=10, choices=Operations.choices)
+    # Set for per-user streams (e.g. the player a contact request is addressed to).
+    audience_id = models.PositiveBigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["region", "stream", "id"], name="changeentry_region_stream"),
+            models.Index(fields=["stream", "audience_id", "id"], name="changeentry_audience"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.stream}:{self.object_id} {self.operation}"
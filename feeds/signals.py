@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from availability.models import OpenPlayerDocument
+from contacts.models import ContactRequest
+from feeds.changes import record_change
+from feeds.models import ChangeEntry
+from tryouts.models import TryoutEvent
+
+
+@receiver(post_save, sender=OpenPlayerDocument)
+def log_open_player_upsert(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_change(instance.region_id, ChangeEntry.Streams.OPEN_PLAYERS, instance.player_id)
+
+
+@receiver(post_delete, sender=OpenPlayerDocument)
+def log_open_player_removal(sender, instance, **kwargs):
+    record_change(
+        instance.region_id,
+        ChangeEntry.Streams.OPEN_PLAYERS,
+        instance.player_id,
+        ChangeEntry.Operations.REMOVE,
+    )
+
+
+@receiver(post_save, sender=TryoutEvent)
+def log_tryout_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    operation = ChangeEntry.Operations.UPSERT if instance.is_active else ChangeEntry.Operations.REMOVE
+    record_change(instance.region_id, ChangeEntry.Streams.TRYOUTS, instance.id, operation)
+
+
+@receiver(post_delete, sender=TryoutEvent)
+def log_tryout_removal(sender, instance, **kwargs):
+    record_change(
+        instance.region_id,
+        ChangeEntry.Streams.TRYOUTS,
+        instance.id,
+        ChangeEntry.Operations.REMOVE,
+    )
+
+
+@receiver(post_save, sender=ContactRequest)
+def log_contact_request_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_change(
+        instance.region_id,
+        ChangeEntry.Streams.CONTACT_REQUESTS,
+        instance.id,
+        audience_id=instance.player_id,
+    )
@@ -0,0 +1,233 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import takewhile
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from availability.models import OpenPlayerDocument
+from availability.search import open_player_documents
+from availability.serializers import PlayerAvailabilitySearchSerializer
+from contacts.models import ContactRequest
+from contacts.serializers import ContactRequestSerializer
+from feeds.models import ChangeEntry
+from tryouts.models import TryoutEvent
+from tryouts.serializers import TryoutEventSerializer
+
+CURSOR_SALT = "feeds.cursor"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+@dataclass
+class Cursor:
+    entry_id: int
+    issued_at: float
+
+
+@dataclass
+class FeedPage:
+    cursor: str
+    upserts: list = field(default_factory=list)
+    removals: list = field(default_factory=list)
+    has_more: bool = False
+    reset: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "cursor": self.cursor,
+            "reset": self.reset,
+            "has_more": self.has_more,
+            "upserts": self.upserts,
+            "removals": self.removals,
+        }
+
+
+def encode_cursor(region, stream, entry_id, issued_at) -> str:
+    return signing.dumps([region.id, stream, entry_id, issued_at], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(value, region, stream) -> Cursor:
+    try:
+        region_id, cursor_stream, entry_id, issued_at = signing.loads(value, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor.")
+    if region_id != region.id or cursor_stream != stream:
+        raise InvalidCursor("Cursor belongs to a different feed.")
+    return Cursor(entry_id=int(entry_id), issued_at=float(issued_at))
+
+
+def _entries(region, stream, audience_id=None):
+    entries = ChangeEntry.objects.filter(region=region, stream=stream)
+    if audience_id is not None:
+        entries = entries.filter(audience_id=audience_id)
+    return entries
+
+
+def settled_horizon(now=None):
+    """Entries created after this may belong to transactions that have not committed yet.
+
+    Ids are handed out at insert time, so a slow transaction can commit an id
+    below one a reader has already passed. Cursors therefore only advance over
+    entries older than ``CHANGE_FEED_SETTLE_SECONDS``.
+    """
+    return (now or timezone.now()) - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+
+
+def retention_cutoff(now=None, days=None):
+    """Entries created before this may be pruned."""
+    days = settings.CHANGE_FEED_RETENTION_DAYS if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def latest_entry_id(region, stream, audience_id=None, now=None) -> int:
+    """The newest entry id with nothing unsettled at or below it."""
+    horizon = settled_horizon(now)
+    entries = _entries(region, stream, audience_id).order_by("-id").values_list("id", "created_at")
+    for entry_id, created_at in entries.iterator(chunk_size=100):
+        if created_at <= horizon:
+            return entry_id
+    return 0
+
+
+def current_cursor(region, stream, audience_id=None) -> str:
+    """A cursor positioned at the newest settled entry, for clients that skip the snapshot."""
+    now = timezone.now()
+    return encode_cursor(region, stream, latest_entry_id(region, stream, audience_id, now), now.timestamp())
+
+
+def settled_entries(region, stream, after_id, limit, audience_id=None, now=None) -> list[tuple]:
+    """``(id, object_id, audience_id)`` of up to ``limit + 1`` entries after ``after_id``.
+
+    Reading stops at the first unsettled entry; it is picked up by a later poll.
+    """
+    horizon = settled_horizon(now)
+    rows = (
+        _entries(region, stream, audience_id)
+        .filter(id__gt=after_id)
+        .order_by("id")
+        .values_list("id", "object_id", "audience_id", "created_at")[: limit + 1]
+    )
+    return [row[:3] for row in takewhile(lambda row: row[3] <= horizon, rows)]
+
+
+def _changed_ids(region, stream, cursor, limit, audience_id=None, now=None):
+    """Distinct object ids changed after the cursor, plus the last entry id read."""
+    entries = settled_entries(region, stream, cursor.entry_id, limit, audience_id, now)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    last_id = entries[-1][0] if entries else cursor.entry_id
+    return list(dict.fromkeys(object_id for _, object_id, _ in entries)), last_id, has_more
+
+
+def _is_expired(cursor) -> bool:
+    # Entries after the cursor were unsettled when it was issued, so none is
+    # older than one settle window before ``issued_at``. Expire the cursor
+    # before prune_change_feed, which uses the same cutoff, can reach them.
+    oldest_unread = cursor.issued_at - settings.CHANGE_FEED_SETTLE_SECONDS
+    return oldest_unread < retention_cutoff().timestamp()
+
+
+def _read(
+    region,
+    stream,
+    cursor_value,
+    limit,
+    snapshot,
+    upserts_for,
+    key="id",
+    expired_since=None,
+    audience_id=None,
+):
+    now = timezone.now()
+    cursor = decode_cursor(cursor_value, region, stream) if cursor_value else None
+    if cursor is None or _is_expired(cursor):
+        latest = latest_entry_id(region, stream, audience_id, now)
+        return FeedPage(
+            cursor=encode_cursor(region, stream, latest, now.timestamp()),
+            upserts=snapshot(),
+            reset=cursor is not None,
+        )
+
+    object_ids, last_id, has_more = _changed_ids(region, stream, cursor, limit, audience_id, now)
+    upserts = upserts_for(object_ids) if object_ids else []
+    seen = {row[key] for row in upserts}
+    removals = [object_id for object_id in object_ids if object_id not in seen]
+    if expired_since is not None:
+        removals.extend(
+            object_id for object_id in expired_since(cursor.issued_at, now) if object_id not in seen
+        )
+    # A partial page leaves older entries unread; keep the older issue time for expiry.
+    issued_at = cursor.issued_at if has_more else now.timestamp()
+    return FeedPage(
+        cursor=encode_cursor(region, stream, last_id, issued_at),
+        upserts=upserts,
+        removals=sorted(set(removals)),
+        has_more=has_more,
+    )
+
+
+def _open_player_rows(queryset):
+    return PlayerAvailabilitySearchSerializer(queryset.select_related("region"), many=True).data
+
+
+def expired_open_players(region, since, until):
+    """Player ids whose availability expired in ``(since, until]``.
+
+    Expiry is time-based and never writes a change entry, so it is derived here.
+    """
+    return OpenPlayerDocument.objects.filter(
+        region=region,
+        expires_at__gt=since,
+        expires_at__lte=until,
+    ).values_list("player_id", flat=True)
+
+
+def open_players_feed(region, association_ids, cursor_value=None, limit=500) -> FeedPage:
+    """Delta of open players visible to a coach scope (``None`` = all)."""
+    documents = open_player_documents(region, association_ids)
+
+    def expired_since(issued_at, now):
+        return expired_open_players(region, datetime.fromtimestamp(issued_at, tz=dt_timezone.utc), now)
+
+    return _read(
+        region,
+        ChangeEntry.Streams.OPEN_PLAYERS,
+        cursor_value,
+        limit,
+        snapshot=lambda: _open_player_rows(documents),
+        upserts_for=lambda ids: _open_player_rows(documents.filter(player_id__in=ids)),
+        key="player_id",
+        expired_since=expired_since,
+    )
+
+
+def tryouts_feed(region, cursor_value=None, limit=500) -> FeedPage:
+    tryouts = TryoutEvent.objects.filter(region=region, is_active=True).order_by("start_date")
+    return _read(
+        region,
+        ChangeEntry.Streams.TRYOUTS,
+        cursor_value,
+        limit,
+        snapshot=lambda: TryoutEventSerializer(tryouts, many=True).data,
+        upserts_for=lambda ids: TryoutEventSerializer(tryouts.filter(id__in=ids), many=True).data,
+    )
+
+
+def contact_requests_feed(region, player_id, cursor_value=None, limit=500) -> FeedPage:
+    """Contact requests addressed to one player."""
+    # Prefetched so the player's email is read from its home database, not a shard stub.
+    requests = ContactRequest.objects.filter(region=region, player_id=player_id).prefetch_related("player")
+    return _read(
+        region,
+        ChangeEntry.Streams.CONTACT_REQUESTS,
+        cursor_value,
+        limit,
+        snapshot=lambda: ContactRequestSerializer(requests, many=True).data,
+        upserts_for=lambda ids: ContactRequestSerializer(requests.filter(id__in=ids), many=True).data,
+        audience_id=player_id,
+    )
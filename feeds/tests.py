@@ -0,0 +1,290 @@
+import warnings
+from datetime import date, timedelta
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import AccountProfile
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from contacts.models import ContactRequest
+from feeds.models import ChangeEntry
+from feeds.changes import record_change
+from feeds.events import _pollers, subscribe, unsubscribe
+from feeds.sync import current_cursor, decode_cursor, encode_cursor
+from organizations.models import Association, Team, TeamCoach
+from regions.models import Region
+from tryouts.models import TryoutEvent
+
+
+User = get_user_model()
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bc = Region.objects.get(code="bc")
+        self.assoc = Association.objects.create(region=self.bc, name="BC Assoc")
+        self.other_assoc = Association.objects.create(region=self.bc, name="Other Assoc")
+        team = Team.objects.create(region=self.bc, association=self.assoc, name="BC Team", age_group="13U")
+
+        self.coach = User.objects.create_user(username="coach1", password="testpass")
+        self.coach.profile.role = AccountProfile.Roles.COACH
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        TeamCoach.objects.create(user=self.coach, team=team, is_active=True)
+
+    def _open_player(self, username, association=None):
+        player = User.objects.create_user(username=username, password="testpass")
+        player.profile.role = AccountProfile.Roles.PLAYER
+        player.profile.save()
+        availability = PlayerAvailability.objects.create(player=player, region=self.bc, is_open=True)
+        availability.allowed_associations.add(association or self.assoc)
+        return availability
+
+    def _get(self, url, cursor=None, **params):
+        if cursor:
+            params["cursor"] = cursor
+        return self.client.get(url, params, HTTP_HOST="bc.localhost:8000")
+
+    def test_open_players_snapshot_then_delta(self):
+        first = self._open_player("player1")
+        self.client.force_authenticate(user=self.coach)
+
+        snapshot = self._get("/api/v1/feeds/open-players/")
+        self.assertEqual(snapshot.status_code, 200)
+        self.assertFalse(snapshot.data["reset"])
+        self.assertEqual([row["player_id"] for row in snapshot.data["upserts"]], [first.player_id])
+
+        unchanged = self._get("/api/v1/feeds/open-players/", snapshot.data["cursor"])
+        self.assertEqual(unchanged.data["upserts"], [])
+        self.assertEqual(unchanged.data["removals"], [])
+
+        second = self._open_player("player2")
+        first.is_committed = True
+        first.save()
+        delta = self._get("/api/v1/feeds/open-players/", unchanged.data["cursor"])
+        self.assertEqual([row["player_id"] for row in delta.data["upserts"]], [second.player_id])
+        self.assertEqual(delta.data["removals"], [first.player_id])
+
+    def test_revoked_association_is_a_removal_for_that_coach(self):
+        availability = self._open_player("player1")
+        self.client.force_authenticate(user=self.coach)
+        cursor = self._get("/api/v1/feeds/open-players/").data["cursor"]
+
+        availability.allowed_associations.set([self.other_assoc])
+        delta = self._get("/api/v1/feeds/open-players/", cursor)
+        self.assertEqual(delta.data["upserts"], [])
+        self.assertEqual(delta.data["removals"], [availability.player_id])
+
+    def test_expired_availability_is_a_removal(self):
+        availability = self._open_player("player1")
+        self.client.force_authenticate(user=self.coach)
+        cursor = self._get("/api/v1/feeds/open-players/").data["cursor"]
+
+        OpenPlayerDocument.objects.filter(availability=availability).update(expires_at=timezone.now())
+        delta = self._get("/api/v1/feeds/open-players/", cursor)
+        self.assertEqual(delta.data["removals"], [availability.player_id])
+
+    def test_delta_pages_with_has_more(self):
+        self.client.force_authenticate(user=self.coach)
+        cursor = self._get("/api/v1/feeds/open-players/").data["cursor"]
+        players = [self._open_player(f"player{index}").player_id for index in range(3)]
+
+        seen = []
+        for _ in range(5):
+            page = self._get("/api/v1/feeds/open-players/", cursor, limit=2)
+            seen.extend(row["player_id"] for row in page.data["upserts"])
+            cursor = page.data["cursor"]
+            if not page.data["has_more"]:
+                break
+        self.assertEqual(sorted(set(seen)), sorted(players))
+
+    def test_open_players_feed_requires_approved_coach(self):
+        player = User.objects.create_user(username="player1", password="testpass")
+        self.client.force_authenticate(user=player)
+        response = self._get("/api/v1/feeds/open-players/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_and_foreign_cursors_rejected(self):
+        self.client.force_authenticate(user=self.coach)
+        response = self._get("/api/v1/feeds/open-players/", "not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+
+        tryout_cursor = encode_cursor(self.bc, "tryouts", 0, timezone.now().timestamp())
+        response = self._get("/api/v1/feeds/open-players/", tryout_cursor)
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHANGE_FEED_RETENTION_DAYS=1)
+    def test_stale_cursor_resets_to_snapshot(self):
+        availability = self._open_player("player1")
+        self.client.force_authenticate(user=self.coach)
+        stale = encode_cursor(self.bc, "open_players", 0, (timezone.now() - timedelta(days=2)).timestamp())
+
+        response = self._get("/api/v1/feeds/open-players/", stale)
+        self.assertTrue(response.data["reset"])
+        self.assertEqual([row["player_id"] for row in response.data["upserts"]], [availability.player_id])
+
+    def test_unsettled_entries_wait_for_a_later_poll(self):
+        self.client.force_authenticate(user=self.coach)
+        snapshot = self._get("/api/v1/feeds/open-players/")
+        availability = self._open_player("player1")
+        with override_settings(CHANGE_FEED_SETTLE_SECONDS=60):
+            delta = self._get("/api/v1/feeds/open-players/", snapshot.data["cursor"])
+            self.assertEqual(delta.data["upserts"], [])
+            self.assertEqual(
+                decode_cursor(delta.data["cursor"], self.bc, "open_players").entry_id,
+                decode_cursor(snapshot.data["cursor"], self.bc, "open_players").entry_id,
+            )
+        delta = self._get("/api/v1/feeds/open-players/", delta.data["cursor"])
+        self.assertEqual([row["player_id"] for row in delta.data["upserts"]], [availability.player_id])
+
+    def test_cursors_expire_before_their_entries_are_pruned(self):
+        self._open_player("player1")
+        issued = timezone.now() - timedelta(days=30) + timedelta(seconds=2)
+        ChangeEntry.objects.update(created_at=issued - timedelta(seconds=1))
+        with override_settings(CHANGE_FEED_RETENTION_DAYS=30, CHANGE_FEED_SETTLE_SECONDS=5):
+            self.client.force_authenticate(user=self.coach)
+            cursor = encode_cursor(self.bc, "open_players", 0, issued.timestamp())
+            response = self._get("/api/v1/feeds/open-players/", cursor)
+            self.assertTrue(response.data["reset"])
+            call_command("prune_change_feed", stdout=StringIO())
+            self.assertTrue(ChangeEntry.objects.exists())
+
+    def test_tryouts_feed_tracks_deactivation_and_delete(self):
+        tryout = TryoutEvent.objects.create(
+            region=self.bc,
+            association=self.assoc,
+            name="Spring Tryout",
+            start_date=date(2025, 1, 10),
+            end_date=date(2025, 1, 11),
+            location="Field",
+            registration_url="https://example.com",
+        )
+        snapshot = self._get("/api/v1/feeds/tryouts/")
+        self.assertEqual([row["id"] for row in snapshot.data["upserts"]], [tryout.id])
+
+        tryout.location = "Main Field"
+        tryout.save()
+        delta = self._get("/api/v1/feeds/tryouts/", snapshot.data["cursor"])
+        self.assertEqual(delta.data["upserts"][0]["location"], "Main Field")
+
+        tryout.is_active = False
+        tryout.save()
+        delta = self._get("/api/v1/feeds/tryouts/", delta.data["cursor"])
+        self.assertEqual(delta.data["removals"], [tryout.id])
+
+        tryout_id = tryout.id
+        tryout.delete()
+        delta = self._get("/api/v1/feeds/tryouts/", delta.data["cursor"])
+        self.assertEqual(delta.data["removals"], [tryout_id])
+
+
+@override_settings(EVENT_STREAM_MAX_SECONDS=0, EVENT_STREAM_POLL_SECONDS=0, CHANGE_FEED_SETTLE_SECONDS=0)
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.bc = Region.objects.get(code="bc")
+        self.assoc = Association.objects.create(region=self.bc, name="BC Assoc")
+        self.team = Team.objects.create(region=self.bc, association=self.assoc, name="BC Team", age_group="13U")
+
+        self.coach = User.objects.create_user(username="coach1", password="testpass")
+        self.coach.profile.role = AccountProfile.Roles.COACH
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        TeamCoach.objects.create(user=self.coach, team=self.team, is_active=True)
+
+        self.player = User.objects.create_user(username="player1", password="testpass")
+        self.player.profile.role = AccountProfile.Roles.PLAYER
+        self.player.profile.save()
+
+    def _stream(self, url, cursor):
+        response = self.client.get(url, HTTP_HOST="bc.localhost:8000", HTTP_LAST_EVENT_ID=cursor)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        with warnings.catch_warnings():
+            # The test client is WSGI-style and drains the async stream synchronously.
+            warnings.simplefilter("ignore")
+            return b"".join(response).decode()
+
+    def test_coach_receives_visibility_events(self):
+        self.client.force_login(self.coach)
+        cursor = current_cursor(self.bc, ChangeEntry.Streams.OPEN_PLAYERS)
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.bc, is_open=True)
+        availability.allowed_associations.add(self.assoc)
+
+        body = self._stream("/coach/open-players/events/", cursor)
+        self.assertIn("event: player.visible", body)
+        self.assertIn(f'"player_id": {self.player.id}', body)
+
+        cursor = current_cursor(self.bc, ChangeEntry.Streams.OPEN_PLAYERS)
+        availability.is_open = False
+        availability.save()
+        body = self._stream("/coach/open-players/events/", cursor)
+        self.assertIn("event: player.hidden", body)
+
+    def test_player_receives_request_events(self):
+        self.client.force_login(self.player)
+        cursor = current_cursor(self.bc, ChangeEntry.Streams.CONTACT_REQUESTS, self.player.id)
+        contact_request = ContactRequest.objects.create(
+            player=self.player,
+            requesting_team=self.team,
+            requesting_association=self.assoc,
+            requested_by=self.coach,
+            region=self.bc,
+        )
+        body = self._stream("/player/requests/events/", cursor)
+        self.assertIn("event: request.created", body)
+
+        cursor = current_cursor(self.bc, ChangeEntry.Streams.CONTACT_REQUESTS, self.player.id)
+        contact_request.status = ContactRequest.Status.APPROVED
+        contact_request.save()
+        body = self._stream("/player/requests/events/", cursor)
+        self.assertIn("event: request.answered", body)
+        self.assertNotIn("request.created", body)
+
+    def test_streams_require_matching_role(self):
+        self.client.force_login(self.player)
+        response = self.client.get("/coach/open-players/events/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 403)
+
+        self.client.logout()
+        response = self.client.get("/player/requests/events/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangePollerTests(TestCase):
+    async def test_one_poll_wakes_only_matching_subscribers(self):
+        bc = await Region.objects.aget(code="bc")
+        stream = ChangeEntry.Streams.CONTACT_REQUESTS
+        first = await subscribe(bc, stream, audience_id=1)
+        second = await subscribe(bc, stream, audience_id=2)
+        everyone = await subscribe(bc, stream)
+        poller = first.poller
+        self.assertIs(second.poller, poller)
+        self.assertIs(everyone.poller, poller)
+
+        def poll():
+            record_change(bc.id, stream, 10, audience_id=1)
+            with CaptureQueriesContext(connection) as queries:
+                audiences = poller.poll()
+            return audiences, len(queries)
+
+        audiences, query_count = await sync_to_async(poll)()
+        self.assertEqual(audiences, {1})
+        self.assertEqual(query_count, 1)
+        self.assertTrue(first.wants(audiences))
+        self.assertFalse(second.wants(audiences))
+        self.assertTrue(everyone.wants(audiences))
+        self.assertEqual(await sync_to_async(poller.poll)(), set())
+
+        for subscriber in (first, second, everyone):
+            await unsubscribe(subscriber)
+        self.assertEqual(_pollers, {})
@@ -0,0 +1,52 @@
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from api.throttling import SearchThrottle, UserTokenBucketThrottle
+from availability.permissions import AvailabilitySearchPermission
+from availability.search import request_association_scope
+from feeds.sync import InvalidCursor, open_players_feed, tryouts_feed
+from regions.utils import get_request_region
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+
+
+def _limit(request):
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+    return max(1, min(limit, MAX_LIMIT))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, AvailabilitySearchPermission])
+@throttle_classes([UserTokenBucketThrottle, SearchThrottle])
+def open_players_changes(request):
+    region = get_request_region(request)
+    if region is None:
+        return Response({"detail": "Region is required."}, status=400)
+    try:
+        page = open_players_feed(
+            region,
+            request_association_scope(request, region),
+            request.query_params.get("cursor"),
+            _limit(request),
+        )
+    except InvalidCursor as exc:
+        return Response({"detail": str(exc)}, status=400)
+    return Response(page.as_dict())
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def tryouts_changes(request):
+    region = get_request_region(request)
+    if region is None:
+        return Response({"detail": "Region is required."}, status=400)
+    try:
+        page = tryouts_feed(region, request.query_params.get("cursor"), _limit(request))
+    except InvalidCursor as exc:
+        return Response({"detail": str(exc)}, status=400)
+    return Response(page.as_dict())
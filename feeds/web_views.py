@@ -0,0 +1,80 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
+
+from accounts.models import AccountProfile
+from availability.search import coach_association_ids
+from feeds.events import contact_request_events, open_player_events, stream_events
+from feeds.models import ChangeEntry
+from feeds.sync import InvalidCursor, contact_requests_feed, current_cursor, decode_cursor, open_players_feed
+from regions.sharding import region_context
+
+
+def _profile(user):
+    return AccountProfile.objects.filter(user=user).first()
+
+
+async def _event_response(request, region, stream, poll, to_events, audience_id=None):
+    cursor = request.headers.get("Last-Event-ID")
+    if cursor:
+        try:
+            await sync_to_async(decode_cursor)(cursor, region, stream)
+        except InvalidCursor:
+            cursor = None
+    if not cursor:
+        cursor = await sync_to_async(current_cursor)(region, stream, audience_id)
+
+    def poll_in_region(value):
+        # The body streams after RegionMiddleware has returned, so re-enter the region.
+        with region_context(region):
+            return poll(value)
+
+    response = StreamingHttpResponse(
+        stream_events(poll_in_region, to_events, cursor, region, stream, audience_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def coach_open_player_events(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    profile = await sync_to_async(_profile)(user)
+    if not profile or profile.role != AccountProfile.Roles.COACH or not profile.is_coach_approved:
+        return HttpResponseForbidden("Approved coaches only.")
+    region = getattr(request, "region", None)
+    if region is None:
+        raise Http404
+
+    association_ids = await sync_to_async(coach_association_ids)(user, region)
+    return await _event_response(
+        request,
+        region,
+        ChangeEntry.Streams.OPEN_PLAYERS,
+        lambda cursor: open_players_feed(region, association_ids, cursor),
+        open_player_events,
+    )
+
+
+async def player_request_events(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    profile = await sync_to_async(_profile)(user)
+    if not profile or profile.role != AccountProfile.Roles.PLAYER:
+        return HttpResponseForbidden("Players only.")
+    region = getattr(request, "region", None)
+    if region is None:
+        raise Http404
+
+    return await _event_response(
+        request,
+        region,
+        ChangeEntry.Streams.CONTACT_REQUESTS,
+        lambda cursor: contact_requests_feed(region, user.id, cursor),
+        contact_request_events,
+        audience_id=user.id,
+    )
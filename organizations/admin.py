@@ -1,6 +1,31 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 
-from organizations.models import Association, Team, TeamCoach
+from accounts.forms import RosterUploadForm
+from accounts.invitations import send_invitations
+from accounts.roster import ROSTER_COLUMNS, RosterError, import_roster, read_roster
+from organizations.models import Association, AssociationDomain, Team, TeamCoach
+
+
+class AssociationDomainInline(admin.TabularInline):
+    """Read-only view of the lookup rows derived from ``official_domain``."""
+
+    model = AssociationDomain
+    fields = ("domain",)
+    readonly_fields = ("domain",)
+    extra = 0
+    max_num = 0
+    can_delete = False
+
+
+@admin.action(description="Import a roster for the selected association")
+def import_association_roster(modeladmin, request, queryset):
+    if queryset.count() != 1:
+        modeladmin.message_user(request, "Select exactly one association.", messages.WARNING)
+        return None
+    return redirect("admin:organizations_association_import_roster", queryset.get().pk)
 
 
 @admin.register(Association)
@@ -8,6 +33,58 @@ class AssociationAdmin(admin.ModelAdmin):
     list_display = ("name", "region", "official_domain", "website_url", "is_active")
     list_filter = ("region", "is_active")
     search_fields = ("name", "short_name", "official_domain")
+    inlines = [AssociationDomainInline]
+    actions = [import_association_roster]
+
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/import-roster/",
+                self.admin_site.admin_view(self.import_roster_view),
+                name="organizations_association_import_roster",
+            ),
+            *super().get_urls(),
+        ]
+
+    def import_roster_view(self, request, object_id):
+        association = get_object_or_404(Association.objects.select_related("region"), pk=object_id)
+        if not self.has_change_permission(request, association):
+            return redirect("admin:index")
+        form = RosterUploadForm(request.POST or None, request.FILES or None)
+        result = None
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                result = import_roster(
+                    association.region,
+                    read_roster(upload, upload.name),
+                    association=association,
+                    dry_run=form.cleaned_data["dry_run"],
+                )
+            except RosterError as exc:
+                form.add_error("file", str(exc))
+            else:
+                verb = "Would import" if result.dry_run else "Imported"
+                self.message_user(
+                    request,
+                    f"{verb} {result.players} players and {result.coaches} coaches from {result.rows} rows "
+                    f"in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s).",
+                    messages.WARNING if result.errors else messages.SUCCESS,
+                )
+                if form.cleaned_data["send_invitations"] and not result.dry_run:
+                    sent = send_invitations(result.users, request.build_absolute_uri("/"))
+                    self.message_user(request, f"Sent {sent} invitations.")
+        context = {
+            **self.admin_site.each_context(request),
+            "title": f"Import roster: {association}",
+            "opts": self.model._meta,
+            "original": association,
+            "form": form,
+            "result": result,
+            "columns": ROSTER_COLUMNS,
+            "change_url": reverse("admin:organizations_association_change", args=[association.pk]),
+        }
+        return TemplateResponse(request, "admin/organizations/association/import_roster.html", context)
 
 
 @admin.register(Team)
@@ -0,0 +1,19 @@
+from organizations.models import Association
+from regions.cache import cached_for_region
+
+
+def association_directory(region) -> list[Association]:
+    """Active associations in a region, by name."""
+    return cached_for_region(
+        region,
+        "associations",
+        lambda: list(Association.objects.filter(region=region, is_active=True).order_by("name")),
+        depends_on=[Association],
+    )
+
+
+def directory_association(region, association_id):
+    for association in association_directory(region):
+        if association.id == association_id:
+            return association
+    return None
@@ -0,0 +1,37 @@
+from organizations.models import Association, AssociationDomain
+from organizations.text import domain_candidates, email_domain
+
+
+def match_domains(region, domains) -> dict[str, list[Association]]:
+    """Active associations for each email domain, most specific match first.
+
+    All candidates for all domains are resolved in one indexed query.
+    """
+    candidates = {domain: domain_candidates(domain) for domain in domains if domain}
+    lookups = {candidate for values in candidates.values() for candidate in values}
+    by_domain: dict[str, list[Association]] = {}
+    if lookups:
+        rows = AssociationDomain.objects.filter(
+            region=region,
+            domain__in=lookups,
+            association__is_active=True,
+        ).select_related("association").order_by("association__name")
+        for row in rows:
+            by_domain.setdefault(row.domain, []).append(row.association)
+
+    matches = {}
+    for domain, values in candidates.items():
+        for candidate in values:
+            if candidate in by_domain:
+                matches[domain] = by_domain[candidate]
+                break
+        else:
+            matches[domain] = []
+    return matches
+
+
+def associations_for_email(region, email: str) -> list[Association]:
+    domain = email_domain(email)
+    if not domain:
+        return []
+    return match_domains(region, [domain])[domain]
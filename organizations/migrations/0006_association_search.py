@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+from organizations.text import normalize_search_text
+
+
+def backfill_search_names(apps, schema_editor):
+    Association = apps.get_model("organizations", "Association")
+    rows = list(Association.objects.only("id", "name", "short_name"))
+    for row in rows:
+        row.search_name = normalize_search_text(row.name)
+        row.search_short_name = normalize_search_text(row.short_name)
+    Association.objects.bulk_update(rows, ["search_name", "search_short_name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_alter_association_logo_url'),
+        ('regions', '0003_region_season_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='association',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='association',
+            name='search_short_name',
+            field=models.CharField(blank=True, editable=False, max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='association',
+            index=models.Index(fields=['region', 'search_name'], name='association_search_name'),
+        ),
+        migrations.AddIndex(
+            model_name='association',
+            index=models.Index(fields=['region', 'search_short_name'], name='association_search_short'),
+        ),
+        migrations.RunPython(backfill_search_names, migrations.RunPython.noop),
+    ]
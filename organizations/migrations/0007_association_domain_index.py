@@ -0,0 +1,48 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from organizations.text import parse_domains
+
+
+def build_domain_index(apps, schema_editor):
+    Association = apps.get_model("organizations", "Association")
+    AssociationDomain = apps.get_model("organizations", "AssociationDomain")
+    rows = [
+        AssociationDomain(association_id=association.id, region_id=association.region_id, domain=domain)
+        for association in Association.objects.exclude(official_domain="").only("id", "region_id", "official_domain")
+        for domain in parse_domains(association.official_domain)
+    ]
+    AssociationDomain.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_association_search'),
+        ('regions', '0003_region_season_rules'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='association',
+            name='official_domain',
+            field=models.CharField(blank=True, help_text='Email domain(s) of the association, comma-separated. Subdomains also match.', max_length=150),
+        ),
+        migrations.CreateModel(
+            name='AssociationDomain',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=150)),
+                ('association', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='domains', to='organizations.association')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='association_domains', to='regions.region')),
+            ],
+            options={
+                'ordering': ['domain'],
+                'indexes': [models.Index(fields=['region', 'domain'], name='association_domain_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('association', 'domain'), name='association_domain_unique')],
+            },
+        ),
+        migrations.RunPython(build_domain_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-19 13:10
+
+from django.db import migrations
+from django.db.models.functions import Trim, Upper
+
+
+def normalize_age_groups(apps, schema_editor):
+    Team = apps.get_model("organizations", "Team")
+    normalized = Upper(Trim("age_group"))
+    Team.objects.using(schema_editor.connection.alias).exclude(age_group=normalized).update(age_group=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0007_association_domain_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_age_groups, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.core.exceptions import ValidationError
 from django.db import models
 
+from organizations.text import normalize_search_text, parse_domains
+from regions.age_groups import normalize_age_group
+from regions.consistency import RegionConsistentModel
 from regions.models import Region
 
 
@@ -9,7 +11,11 @@ class Association(models.Model):
     region = models.ForeignKey(Region, on_delete=models.PROTECT, related_name="associations")
     name = models.CharField(max_length=150)
     short_name = models.CharField(max_length=50, blank=True)
-    official_domain = models.CharField(max_length=150, blank=True)
+    official_domain = models.CharField(
+        max_length=150,
+        blank=True,
+        help_text="Email domain(s) of the association, comma-separated. Subdomains also match.",
+    )
     website_url = models.URLField(blank=True)
     description = models.TextField(blank=True)
     contact_email = models.EmailField(blank=True)
@@ -20,20 +26,66 @@ class Association(models.Model):
         help_text="Square logo URL, recommended 200–800px.",
     )
     is_active = models.BooleanField(default=True)
+    # Normalized copies of name/short_name for indexed prefix search.
+    search_name = models.CharField(max_length=150, blank=True, editable=False)
+    search_short_name = models.CharField(max_length=50, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["region", "search_name"], name="association_search_name"),
+            models.Index(fields=["region", "search_short_name"], name="association_search_short"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
-    def clean(self):
-        return super().clean()
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_search_text(self.name)
+        self.search_short_name = normalize_search_text(self.short_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "search_name", "search_short_name"}
+        super().save(*args, **kwargs)
+        if update_fields is None or {"official_domain", "region"} & set(update_fields):
+            self.sync_domains()
+
+    def sync_domains(self) -> None:
+        """Mirror ``official_domain`` into the AssociationDomain lookup table."""
+        domains = parse_domains(self.official_domain)
+        self.domains.exclude(domain__in=domains).delete()
+        self.domains.exclude(region_id=self.region_id).update(region_id=self.region_id)
+        existing = set(self.domains.values_list("domain", flat=True))
+        AssociationDomain.objects.bulk_create([
+            AssociationDomain(association=self, region_id=self.region_id, domain=domain)
+            for domain in domains
+            if domain not in existing
+        ])
+
+
+class AssociationDomain(models.Model):
+    """One normalized email domain of an association, derived from ``official_domain``."""
+
+    association = models.ForeignKey(Association, on_delete=models.CASCADE, related_name="domains")
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="association_domains")
+    domain = models.CharField(max_length=150)
 
+    class Meta:
+        ordering = ["domain"]
+        constraints = [
+            models.UniqueConstraint(fields=["association", "domain"], name="association_domain_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["region", "domain"], name="association_domain_lookup"),
+        ]
 
-class Team(models.Model):
+    def __str__(self) -> str:
+        return self.domain
+
+
+class Team(RegionConsistentModel):
     region = models.ForeignKey(Region, on_delete=models.PROTECT, related_name="teams")
     association = models.ForeignKey(Association, on_delete=models.PROTECT, related_name="teams")
     name = models.CharField(max_length=150)
@@ -43,15 +95,13 @@ class Team(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    region_checks = {"association": ("region", "Team region must match association region.")}
+
     class Meta:
         ordering = ["name"]
 
-    def clean(self):
-        if self.association_id and self.region_id and self.association.region_id != self.region_id:
-            raise ValidationError({"region": "Team region must match association region."})
-
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.age_group = normalize_age_group(self.age_group)
         return super().save(*args, **kwargs)
 
     def __str__(self) -> str:
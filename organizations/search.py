@@ -0,0 +1,36 @@
+from django.db.models import Q
+
+from organizations.models import Association
+from organizations.text import normalize_search_text
+
+TYPEAHEAD_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 25
+
+
+def _prefix_upper_bound(prefix: str):
+    # Smallest key greater than every key starting with ``prefix``; keys only
+    # hold [0-9a-z], which sort the same under every collation.
+    chars = list(prefix)
+    while chars:
+        last = chars.pop()
+        if last != "z":
+            return "".join(chars) + ("a" if last == "9" else chr(ord(last) + 1))
+    return None
+
+
+def prefix_filter(field: str, prefix: str) -> Q:
+    """Index range scan equivalent of ``field__startswith=prefix``."""
+    condition = Q(**{f"{field}__gte": prefix})
+    upper = _prefix_upper_bound(prefix)
+    if upper is not None:
+        condition &= Q(**{f"{field}__lt": upper})
+    return condition
+
+
+def search_associations(region, query: str, limit: int = TYPEAHEAD_LIMIT):
+    """Active associations in ``region`` whose name or short name starts with ``query``."""
+    queryset = Association.objects.filter(region=region, is_active=True)
+    prefix = normalize_search_text(query)
+    if prefix:
+        queryset = queryset.filter(prefix_filter("search_name", prefix) | prefix_filter("search_short_name", prefix))
+    return queryset.order_by("name")[:limit]
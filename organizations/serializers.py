@@ -25,6 +25,13 @@ class AssociationSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class AssociationTypeaheadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Association
+        fields = ("id", "name", "short_name")
+        read_only_fields = fields
+
+
 class TeamSerializer(serializers.ModelSerializer):
     class Meta:
         model = Team
@@ -3,6 +3,8 @@ from django.core.exceptions import ValidationError
 from django.test import TestCase
 from rest_framework.test import APIClient
 
+from accounts.forms import CoachSignupForm
+from organizations.domains import associations_for_email
 from organizations.models import Association, Team
 from regions.models import Region
 
@@ -68,6 +70,10 @@ class OrganizationModelTests(TestCase):
         team = Team(region=on, association=assoc_bc, name="Bad Team", age_group="13U")
         with self.assertRaises(ValidationError):
             team.full_clean()
+        with self.assertRaises(ValidationError):
+            team.save()
+        with self.assertRaises(ValidationError):
+            Team.objects.bulk_create([team])
 
     def test_association_logo_url_accepts_value(self):
         bc = Region.objects.get(code="bc")
@@ -102,3 +108,73 @@ class OrganizationWebTests(TestCase):
             HTTP_HOST="bc.localhost:8000",
         )
         self.assertEqual(response.status_code, 404)
+
+
+class AssociationTypeaheadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bc = Region.objects.get(code="bc")
+        self.on = Region.objects.create(code="on", name="Ontario")
+        self.coquitlam = Association.objects.create(region=self.bc, name="Coquitlam Minor", short_name="CMBA")
+        Association.objects.create(region=self.bc, name="Île-Bizard Baseball")
+        Association.objects.create(region=self.bc, name="Cloverdale", is_active=False)
+        Association.objects.create(region=self.on, name="Collingwood")
+
+    def _search(self, query, **extra):
+        response = self.client.get(
+            "/api/v1/associations/typeahead/",
+            {"q": query, **extra},
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.data]
+
+    def test_prefix_matches_name_and_short_name_in_region(self):
+        self.assertEqual(self._search("co"), ["Coquitlam Minor"])
+        self.assertEqual(self._search("CMB"), ["Coquitlam Minor"])
+        self.assertEqual(self._search("ile biz"), ["Île-Bizard Baseball"])
+        self.assertEqual(self._search("z"), [])
+        self.assertEqual(self._search("", limit=1), ["Coquitlam Minor"])
+
+    def test_search_fields_follow_renames(self):
+        self.coquitlam.name = "Zebra Sox"
+        self.coquitlam.save(update_fields=["name"])
+        self.coquitlam.refresh_from_db()
+        self.assertEqual(self.coquitlam.search_name, "zebrasox")
+        self.assertEqual(self._search("zeb"), ["Zebra Sox"])
+
+    def test_signup_form_renders_only_selected_association(self):
+        response = self.client.get("/signup/player/", HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, "data-typeahead-url")
+        self.assertNotContains(response, "Coquitlam Minor")
+
+        form = CoachSignupForm(region=self.bc, initial={"association": self.coquitlam.pk})
+        self.assertIn("Coquitlam Minor", str(form["association"]))
+        self.assertNotIn("Île-Bizard", str(form["association"]))
+
+
+class AssociationDomainTests(TestCase):
+    def setUp(self):
+        self.bc = Region.objects.get(code="bc")
+        self.association = Association.objects.create(
+            region=self.bc,
+            name="Vancouver Minor",
+            official_domain="@VancouverMinor.com, https://vmba.ca/about",
+        )
+
+    def test_domains_are_normalized_and_follow_edits(self):
+        self.assertEqual(
+            list(self.association.domains.values_list("domain", flat=True)),
+            ["vancouverminor.com", "vmba.ca"],
+        )
+        self.association.official_domain = "vmba.ca"
+        self.association.save(update_fields=["official_domain"])
+        self.assertEqual(list(self.association.domains.values_list("domain", flat=True)), ["vmba.ca"])
+
+    def test_email_lookup_matches_subdomains_in_one_query(self):
+        Association.objects.create(region=self.bc, name="Inactive", official_domain="vmba.ca", is_active=False)
+        with self.assertNumQueries(1):
+            matches = associations_for_email(self.bc, "Coach@Teams.VMBA.ca")
+        self.assertEqual(matches, [self.association])
+        self.assertEqual(associations_for_email(self.bc, "coach@ca"), [])
+        self.assertEqual(associations_for_email(self.bc, "coach@notvmba.ca"), [])
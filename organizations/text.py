@@ -0,0 +1,41 @@
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_DOMAIN_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def normalize_search_text(value: str) -> str:
+    """Lowercase ASCII letters and digits only: "Île-Bizard AAA" -> "ilebizardaaa"."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return _NON_ALNUM.sub("", value.lower())
+
+
+def normalize_domain(value: str) -> str:
+    """"@Mail.Example.ca." -> "mail.example.ca"; "https://example.ca/about" -> "example.ca"."""
+    domain = (value or "").strip().lower()
+    domain = domain.split("://", 1)[-1].split("/", 1)[0]
+    return domain.lstrip("@").removeprefix("*.").strip(".")
+
+
+def parse_domains(value: str) -> list[str]:
+    """Distinct normalized domains from an ``official_domain`` value ("a.ca, b.org")."""
+    domains = []
+    for part in _DOMAIN_SEPARATORS.split(value or ""):
+        domain = normalize_domain(part)
+        if domain and domain not in domains:
+            domains.append(domain)
+    return domains
+
+
+def email_domain(email: str) -> str:
+    if "@" not in (email or ""):
+        return ""
+    return normalize_domain(email.rsplit("@", 1)[1])
+
+
+def domain_candidates(domain: str) -> list[str]:
+    """The domain and each parent above the TLD: mail.a.ca -> [mail.a.ca, a.ca]."""
+    labels = domain.split(".")
+    return [".".join(labels[index:]) for index in range(len(labels) - 1)]
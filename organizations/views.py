@@ -1,9 +1,20 @@
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from organizations.models import Association, Team
-from organizations.serializers import AssociationSerializer, TeamSerializer
-from regions.utils import RegionScopedQuerysetMixin
+from organizations.search import TYPEAHEAD_LIMIT, TYPEAHEAD_MAX_LIMIT, search_associations
+from organizations.serializers import AssociationSerializer, AssociationTypeaheadSerializer, TeamSerializer
+from regions.utils import RegionScopedQuerysetMixin, get_request_region
+
+
+def _typeahead_limit(request):
+    try:
+        limit = int(request.query_params.get("limit", TYPEAHEAD_LIMIT))
+    except (TypeError, ValueError):
+        return TYPEAHEAD_LIMIT
+    return max(1, min(limit, TYPEAHEAD_MAX_LIMIT))
 
 
 class AssociationViewSet(RegionScopedQuerysetMixin, ReadOnlyModelViewSet):
@@ -11,6 +22,15 @@ class AssociationViewSet(RegionScopedQuerysetMixin, ReadOnlyModelViewSet):
     serializer_class = AssociationSerializer
     permission_classes = [IsAuthenticated]
 
+    @action(detail=False, methods=["get"], permission_classes=[AllowAny])
+    def typeahead(self, request):
+        """Prefix search over name and short name, for signup and profile pickers."""
+        region = get_request_region(request)
+        if region is None:
+            return Response([])
+        associations = search_associations(region, request.query_params.get("q", ""), _typeahead_limit(request))
+        return Response(AssociationTypeaheadSerializer(associations, many=True).data)
+
 
 class TeamViewSet(RegionScopedQuerysetMixin, ReadOnlyModelViewSet):
     queryset = Team.objects.all()
@@ -1,22 +1,18 @@
 from django.http import Http404
-from django.shortcuts import get_object_or_404, render
+from django.shortcuts import render
 
 from accounts.web_helpers import get_region_or_404
-from organizations.models import Association
-from tryouts.models import TryoutEvent
+from organizations.directory import association_directory, directory_association
+from transferportal.staticfiles import responsive_image
+from tryouts.directory import association_tryouts
 
 
 def association_detail(request, association_id: int):
     region = get_region_or_404(request)
-    association = get_object_or_404(
-        Association.objects.filter(region=region, is_active=True),
-        pk=association_id,
-    )
-    tryouts = TryoutEvent.objects.filter(
-        region=region,
-        association=association,
-        is_active=True,
-    ).order_by("start_date", "name")
+    association = directory_association(region, association_id)
+    if association is None:
+        raise Http404
+    tryouts = association_tryouts(region, association.id)
     context = {
         "association": association,
         "tryouts": tryouts,
@@ -28,9 +24,9 @@ def association_detail(request, association_id: int):
 
 def region_home(request):
     region = get_region_or_404(request)
-    associations = Association.objects.filter(region=region, is_active=True).order_by("name")
     context = {
-        "associations": associations,
+        "associations": association_directory(region),
         "region": region,
+        "hero": responsive_image("img/bc-hero.png"),
     }
     return render(request, "home.html", context)
@@ -0,0 +1,42 @@
+from django import forms
+from django.urls import reverse_lazy
+
+
+class AssociationTypeaheadMixin:
+    """Render only the selected associations; the rest load from the typeahead endpoint.
+
+    Form validation is unaffected: ModelChoiceField checks submitted ids with
+    one filtered query instead of iterating the choices.
+    """
+
+    typeahead_url = reverse_lazy("association-typeahead")
+
+    def get_context(self, name, value, attrs):
+        attrs = {**(attrs or {}), "data-typeahead-url": str(self.typeahead_url)}
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        choices = []
+        if not self.allow_multiple_selected and getattr(iterator, "field", None) is not None:
+            if iterator.field.empty_label is not None:
+                choices.append(("", iterator.field.empty_label))
+        selected = [item for item in value if item not in ("", None)]
+        if selected and hasattr(iterator, "queryset"):
+            choices.extend(
+                (association.pk, iterator.field.label_from_instance(association))
+                for association in iterator.queryset.filter(pk__in=selected)
+            )
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
+
+
+class AssociationTypeaheadSelect(AssociationTypeaheadMixin, forms.Select):
+    pass
+
+
+class AssociationTypeaheadSelectMultiple(AssociationTypeaheadMixin, forms.SelectMultiple):
+    pass
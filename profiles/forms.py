@@ -1,22 +1,11 @@
 from django import forms
 
+from availability.positions import POSITION_CHOICES
 from organizations.models import Association
+from organizations.widgets import AssociationTypeaheadSelect, AssociationTypeaheadSelectMultiple
 from profiles.models import PlayerProfile
 
 
-POSITION_CHOICES = [
-    ("P", "Pitcher"),
-    ("C", "Catcher"),
-    ("1B", "First Base"),
-    ("2B", "Second Base"),
-    ("3B", "Third Base"),
-    ("SS", "Shortstop"),
-    ("OF", "Outfield"),
-    ("IF", "Infield"),
-    ("UTL", "Utility"),
-]
-
-
 class PlayerProfileForm(forms.ModelForm):
     positions = forms.MultipleChoiceField(
         choices=POSITION_CHOICES,
@@ -26,11 +15,12 @@ class PlayerProfileForm(forms.ModelForm):
     current_association = forms.ModelChoiceField(
         queryset=Association.objects.none(),
         required=False,
+        widget=AssociationTypeaheadSelect,
     )
     visible_associations = forms.ModelMultipleChoiceField(
         queryset=Association.objects.none(),
         required=False,
-        widget=forms.SelectMultiple,
+        widget=AssociationTypeaheadSelectMultiple,
     )
 
     class Meta:
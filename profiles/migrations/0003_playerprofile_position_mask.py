@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:30
+
+from django.db import migrations, models
+
+from availability.positions import POSITION_BITS, encode_mask
+
+
+def backfill_position_masks(apps, schema_editor):
+    PlayerProfile = apps.get_model("profiles", "PlayerProfile")
+    profiles = list(PlayerProfile.objects.exclude(positions=None).only("id", "positions"))
+    for profile in profiles:
+        profile.position_mask = encode_mask(profile.positions, POSITION_BITS)
+    PlayerProfile.objects.bulk_update(profiles, ["position_mask"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_playerprofile_extended_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playerprofile',
+            name='position_mask',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_position_masks, migrations.RunPython.noop),
+    ]
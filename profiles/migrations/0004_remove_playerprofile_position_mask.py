@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_playerprofile_position_mask'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='playerprofile',
+            name='position_mask',
+        ),
+    ]
@@ -0,0 +1,52 @@
+from datetime import date
+from typing import Optional
+
+from django.utils import timezone
+
+
+def normalize_age_group(label) -> str:
+    """Canonical spelling of an age-group label ("13u " -> "13U"), for storage and lookups alike."""
+    return (label or "").strip().upper()
+
+
+def parse_age_groups(value: str) -> list[tuple[int, str]]:
+    """Turn "9U,11U,13U" into [(9, "9U"), (11, "11U"), (13, "13U")]."""
+    groups = []
+    for label in (value or "").split(","):
+        label = normalize_age_group(label)
+        if not label:
+            continue
+        try:
+            limit = int(label.rstrip("U"))
+        except ValueError:
+            continue
+        groups.append((limit, label))
+    return sorted(groups)
+
+
+def season_year(region, today: Optional[date] = None) -> int:
+    """Season whose age groups apply on ``today``.
+
+    From the rollover date onwards registrations are for next year's season.
+    A January 1 rollover means the season simply follows the calendar year.
+    """
+    today = today or timezone.localdate()
+    rollover = (region.season_rollover_month, region.season_rollover_day)
+    if rollover != (1, 1) and (today.month, today.day) >= rollover:
+        return today.year + 1
+    return today.year
+
+
+def age_group_for(birth_year: Optional[int], region, today: Optional[date] = None) -> str:
+    """Youngest configured group the player still fits, or "" if none."""
+    if not birth_year:
+        return ""
+    age = season_year(region, today) - birth_year
+    for limit, label in parse_age_groups(region.age_groups):
+        if age <= limit:
+            return label
+    return ""
+
+
+def age_group_map(region, birth_years, today: Optional[date] = None) -> dict[int, str]:
+    return {birth_year: age_group_for(birth_year, region, today) for birth_year in birth_years}
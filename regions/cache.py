@@ -0,0 +1,271 @@
+"""Region-scoped caching with per-region, per-model version namespaces.
+
+Every key starts with the region code and the current version of each model
+the entry depends on. Saving or deleting a model listed in
+``REGION_CACHE_MODELS`` bumps that model's version for the row's region, so
+all dependent entries for the region miss from then on without being
+deleted one by one; stale entries age out through their timeout.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+
+from regions.models import Region
+from regions.sharding import region_code_for_id
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "region"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bumps: int = 0
+    cross_region: int = 0
+
+
+_stats_lock = threading.Lock()
+_stats: defaultdict[str, CacheStats] = defaultdict(CacheStats)
+
+
+def _record(namespace: str, **counts) -> None:
+    with _stats_lock:
+        stats = _stats[namespace]
+        for name, value in counts.items():
+            setattr(stats, name, getattr(stats, name) + value)
+
+
+def cache_stats() -> dict:
+    """Per-namespace counters for this process."""
+    with _stats_lock:
+        return {namespace: asdict(stats) for namespace, stats in sorted(_stats.items())}
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def region_cache():
+    return caches[settings.REGION_CACHE_ALIAS]
+
+
+def region_code(region) -> str | None:
+    """Accept a Region, a region code or a region id."""
+    if region is None or isinstance(region, str):
+        return region
+    if hasattr(region, "code"):
+        return region.code
+    return region_code_for_id(region)
+
+
+def _label(model) -> str:
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def _version_key(code: str, label: str) -> str:
+    return f"{KEY_PREFIX}:{code}:version:{label}"
+
+
+def cache_versions(region, models) -> list[int]:
+    code = region_code(region)
+    keys = [_version_key(code, _label(model)) for model in models]
+    cache = region_cache()
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Seed with a timestamp so an evicted version never resurrects old entries.
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def acache_versions(region, models) -> list[int]:
+    code = region_code(region)
+    keys = [_version_key(code, _label(model)) for model in models]
+    cache = region_cache()
+    versions = await cache.aget_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _incr_version(code: str, label: str) -> None:
+    cache = region_cache()
+    key = _version_key(code, label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_version(region, model) -> None:
+    """Invalidate every entry for ``region`` that depends on ``model``.
+
+    Bumped again on commit so a reader that cached pre-commit rows in between
+    does not keep serving them.
+    """
+    code = region_code(region)
+    if code is None:
+        return
+    label = _label(model)
+    _incr_version(code, label)
+    transaction.on_commit(lambda: _incr_version(code, label))
+    _record(label, bumps=1)
+
+
+def _cache_key(code: str, namespace: str, versions, parts) -> str:
+    versions = ".".join(str(version) for version in versions)
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{code}:{namespace}:{versions}:{digest}"
+
+
+def region_cache_key(region, namespace: str, depends_on, parts=()) -> str:
+    code = region_code(region)
+    return _cache_key(code, namespace, cache_versions(code, depends_on), parts)
+
+
+async def aregion_cache_key(region, namespace: str, depends_on, parts=()) -> str:
+    code = region_code(region)
+    return _cache_key(code, namespace, await acache_versions(code, depends_on), parts)
+
+
+def _foreign_region_ids(value, region_id, depth=0) -> set:
+    if depth > 3:
+        return set()
+    if isinstance(value, Model):
+        other = getattr(value, "region_id", None)
+        return {other} if other is not None and other != region_id else set()
+    if isinstance(value, dict):
+        found = set()
+        other = value.get("region_id", value.get("region"))
+        if isinstance(other, int) and other != region_id:
+            found.add(other)
+        for item in value.values():
+            if isinstance(item, (dict, list, tuple, Model)):
+                found |= _foreign_region_ids(item, region_id, depth + 1)
+        return found
+    if isinstance(value, (list, tuple)):
+        found = set()
+        for item in value:
+            found |= _foreign_region_ids(item, region_id, depth + 1)
+        return found
+    return set()
+
+
+def cached_for_region(region, namespace: str, compute, *, depends_on, parts=(), timeout=None):
+    """Return ``compute()`` cached under ``region``'s versioned namespace.
+
+    Objects carrying another region's id are still returned but never stored,
+    and are logged: that is a scoping bug in ``compute``.
+    """
+    cache = region_cache()
+    key = region_cache_key(region, namespace, depends_on, parts)
+    result = cache.get(key)
+    if result is not None:
+        _record(namespace, hits=1)
+        return result
+
+    _record(namespace, misses=1)
+    result = compute()
+    if _cacheable(region, namespace, result):
+        cache.set(key, result, settings.REGION_CACHE_TIMEOUT if timeout is None else timeout)
+    return result
+
+
+async def acached_for_region(region, namespace: str, compute, *, depends_on, parts=(), timeout=None):
+    """``cached_for_region`` for async callers; ``compute`` is a coroutine function."""
+    cache = region_cache()
+    key = await aregion_cache_key(region, namespace, depends_on, parts)
+    result = await cache.aget(key)
+    if result is not None:
+        _record(namespace, hits=1)
+        return result
+
+    _record(namespace, misses=1)
+    result = await compute()
+    if _cacheable(region, namespace, result):
+        await cache.aset(key, result, settings.REGION_CACHE_TIMEOUT if timeout is None else timeout)
+    return result
+
+
+def _cacheable(region, namespace: str, result) -> bool:
+    foreign = _foreign_region_ids(result, region.id)
+    if foreign:
+        _record(namespace, cross_region=1)
+        logger.warning(
+            "Not caching %s for region %s: result contains rows from regions %s",
+            namespace,
+            region.code,
+            sorted(foreign),
+        )
+        return False
+    return True
+
+
+def bump_for_instance(instance) -> None:
+    region_id = getattr(instance, "region_id", None)
+    if region_id is not None:
+        bump_version(region_id, type(instance))
+
+
+LOOKUP_VERSION_KEY = f"{KEY_PREFIX}:lookup-version"
+
+
+def _lookup_key(code: str) -> str:
+    version = region_cache().get_or_set(LOOKUP_VERSION_KEY, time.time_ns, timeout=None)
+    return f"{KEY_PREFIX}:{code}:lookup:{version}"
+
+
+async def _alookup_key(code: str) -> str:
+    version = await region_cache().aget_or_set(LOOKUP_VERSION_KEY, time.time_ns, timeout=None)
+    return f"{KEY_PREFIX}:{code}:lookup:{version}"
+
+
+def forget_region_lookups() -> None:
+    region_cache().set(LOOKUP_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_active_region(code) -> Region | None:
+    """Active region for a subdomain; unknown codes are cached too."""
+    if not code:
+        return None
+    code = code.lower()
+    cache = region_cache()
+    key = _lookup_key(code)
+    region = cache.get(key)
+    if region is None:
+        region = Region.objects.filter(code=code, is_active=True).first() or False
+        cache.set(key, region, settings.REGION_LOOKUP_CACHE_TIMEOUT)
+    return region or None
+
+
+async def aget_active_region(code) -> Region | None:
+    if not code:
+        return None
+    code = code.lower()
+    cache = region_cache()
+    key = await _alookup_key(code)
+    region = await cache.aget(key)
+    if region is None:
+        region = await Region.objects.filter(code=code, is_active=True).afirst() or False
+        await cache.aset(key, region, settings.REGION_LOOKUP_CACHE_TIMEOUT)
+    return region or None
@@ -0,0 +1,128 @@
+"""Region consistency between a row and the region-scoped rows it points at.
+
+Checks use the foreign-key ids already on the instances: related objects that
+are already loaded are used as they are, and the rest are fetched for a whole
+batch in one query, so ``save()`` no longer lazily loads each relation and
+``bulk_create``/``bulk_update`` are covered too.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import models, router
+from django.db.models import CharField, Value
+
+
+def _field_names(fields) -> set[str]:
+    return {name[:-3] if name.endswith("_id") else name for name in fields}
+
+
+def related_region_ids(objs, names, using=None) -> dict:
+    """``{(field name, pk): region_id}`` for the ``names`` relations of ``objs``."""
+    opts = objs[0]._meta
+    found = {}
+    missing = defaultdict(set)
+    for obj in objs:
+        for name in names:
+            field = opts.get_field(name)
+            pk = getattr(obj, field.attname)
+            if pk is None:
+                continue
+            if field.is_cached(obj):
+                found[(name, pk)] = field.get_cached_value(obj).region_id
+            else:
+                missing[name].add(pk)
+
+    querysets = []
+    for name, pks in missing.items():
+        related = opts.get_field(name).related_model
+        querysets.append(
+            related._base_manager.using(using or router.db_for_read(related, instance=objs[0]))
+            .filter(pk__in=pks)
+            .annotate(relation=Value(name, output_field=CharField()))
+            .order_by()
+            .values_list("relation", "pk", "region_id")
+        )
+    if querysets:
+        for name, pk, region_id in querysets[0].union(*querysets[1:], all=True):
+            found[(name, pk)] = region_id
+    return found
+
+
+def check_region_consistency(objs, fields=None, using=None) -> None:
+    """Raise ``ValidationError`` if a related row of ``objs`` is in another region.
+
+    With ``fields`` (as passed to ``update_fields``/``bulk_update``) only the
+    relations being written are checked, and nothing when neither they nor
+    ``region`` are.
+    """
+    objs = list(objs)
+    if not objs:
+        return
+    checks = type(objs[0]).region_checks
+    names = list(checks)
+    if fields is not None:
+        fields = _field_names(fields)
+        if "region" not in fields:
+            names = [name for name in names if name in fields]
+    if not names:
+        return
+
+    region_ids = related_region_ids(objs, names, using)
+    for obj in objs:
+        if obj.region_id is None:
+            continue
+        for name in names:
+            pk = getattr(obj, obj._meta.get_field(name).attname)
+            if pk is not None and region_ids.get((name, pk), obj.region_id) != obj.region_id:
+                key, message = checks[name]
+                raise ValidationError({key: message})
+
+
+class RegionConsistentQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        check_region_consistency(objs, using=self.db)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        check_region_consistency(objs, fields, using=self.db)
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class RegionConsistentModel(models.Model):
+    """Base for region-scoped models whose relations must share their region.
+
+    ``region_checks`` maps a foreign key to the ``(error key, message)`` raised
+    when the row it points at belongs to another region. ``save()`` also
+    validates the fields it writes, as ``full_clean()`` did before.
+    """
+
+    region_checks: dict[str, tuple[str, str]] = {}
+
+    objects = RegionConsistentQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def clean(self):
+        check_region_consistency([self])
+
+    def _validate_written_fields(self, update_fields=None) -> None:
+        """``clean_fields`` and ``validate_unique`` for the fields a save writes.
+
+        Foreign keys are skipped: the database enforces that they exist, and
+        the region check reads the rows they point at.
+        """
+        exclude = {field.name for field in self._meta.concrete_fields if field.is_relation}
+        if update_fields is not None:
+            written = _field_names(update_fields)
+            exclude |= {field.name for field in self._meta.concrete_fields if field.name not in written}
+        self.clean_fields(exclude=exclude)
+        self.validate_unique(exclude=exclude)
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        self._validate_written_fields(kwargs.get("update_fields"))
+        check_region_consistency([self], kwargs.get("update_fields"), using)
+        return super().save(*args, **kwargs)
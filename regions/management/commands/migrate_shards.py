@@ -0,0 +1,48 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from regions.models import Region
+from regions.sharding import (
+    check_key_blocks,
+    ensure_row,
+    has_table,
+    pinned_database,
+    refresh_reference_rows,
+    reserve_key_range,
+    shard_aliases,
+)
+
+
+class Command(BaseCommand):
+    help = "Apply migrations to every region shard database and copy region rows into it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", help="Only migrate this shard alias.")
+
+    def handle(self, *args, **options):
+        aliases = shard_aliases()
+        if not aliases:
+            raise CommandError("REGION_SHARDS is empty; region sharding is disabled.")
+        if options["database"]:
+            if options["database"] not in aliases:
+                raise CommandError(f"{options['database']} is not a shard alias: {', '.join(aliases)}")
+            aliases = [options["database"]]
+        if not has_table("default", Region):
+            raise CommandError("Run migrate for the default database first.")
+        try:
+            check_key_blocks()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc)) from exc
+
+        for alias in aliases:
+            self.stdout.write(f"Migrating {alias}")
+            # Data migrations query through the router; keep them on this shard.
+            with pinned_database(alias):
+                call_command("migrate", database=alias, interactive=False, verbosity=options["verbosity"])
+            reserve_key_range(alias)
+            for region_id in Region.objects.using("default").values_list("id", flat=True):
+                ensure_row(Region, region_id, alias)
+        # A shard's own data migrations seed regions too; make every copy match default.
+        for region in Region.objects.using("default"):
+            refresh_reference_rows(region, "default")
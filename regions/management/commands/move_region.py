@@ -0,0 +1,113 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from regions.models import Region
+from regions.sharding import (
+    ensure_reference_rows,
+    key_range,
+    region_context,
+    region_lookup,
+    reserve_key_range,
+    shard_for_code,
+    sharded_models,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy one region's sharded rows to another database. Put the region in "
+        "maintenance first, then point REGION_SHARDS at the target and, once "
+        "traffic is on the new shard, rerun with --purge-source."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("region", help="Region code to move.")
+        parser.add_argument("--to", dest="target", required=True, help="Target database alias.")
+        parser.add_argument(
+            "--from",
+            dest="source",
+            help="Source database alias (defaults to the region's current shard).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--purge-source",
+            action="store_true",
+            help="Delete the region's rows from the source instead of copying.",
+        )
+
+    def handle(self, *args, **options):
+        region = Region.objects.using("default").filter(code=options["region"].lower()).first()
+        if region is None:
+            raise CommandError(f"Unknown region: {options['region']}")
+        source = options["source"] or shard_for_code(region.code)
+        target = options["target"]
+        for alias in (source, target):
+            if alias not in connections:
+                raise CommandError(f"Unknown database alias: {alias}")
+        if source == target:
+            raise CommandError("Source and target are the same database.")
+        try:
+            key_range(target)
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc)) from exc
+
+        models = sharded_models()
+        with region_context(region):
+            if options["purge_source"]:
+                self._purge(region, source, models)
+            else:
+                self._copy(region, source, target, models, options["batch_size"])
+
+    def _rows(self, model, region, alias):
+        return model._base_manager.using(alias).filter(**{region_lookup(model): region}).order_by("pk")
+
+    def _copy(self, region, source, target, models, batch_size):
+        with transaction.atomic(using=target):
+            for model in models:
+                started = time.perf_counter()
+                if self._rows(model, region, target).exists():
+                    raise CommandError(f"{model._meta.label} already has {region.code} rows in {target}.")
+                batch = []
+                for row in self._rows(model, region, source).iterator(chunk_size=batch_size):
+                    ensure_reference_rows(row, target)
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        model._base_manager.using(target).bulk_create(batch)
+                        batch = []
+                if batch:
+                    model._base_manager.using(target).bulk_create(batch)
+
+                copied = self._rows(model, region, target).count()
+                expected = self._rows(model, region, source).count()
+                if copied != expected:
+                    raise CommandError(f"{model._meta.label}: copied {copied} of {expected} rows.")
+                self.stdout.write(
+                    f"{model._meta.label}: {copied} rows in {time.perf_counter() - started:.2f}s"
+                )
+            # Copied keys come from the source's block; keep new rows in the target's.
+            reserve_key_range(target)
+        self.stdout.write(
+            f"Copied {region.code} from {source} to {target}. Set REGION_SHARDS[{region.code!r}] = "
+            f"{target!r}, restart workers, then run with --purge-source --from {source}."
+        )
+
+    def _purge(self, region, source, models):
+        if shard_for_code(region.code) == source:
+            raise CommandError(f"{region.code} is still routed to {source}; update REGION_SHARDS first.")
+        connection = connections[source]
+        quote = connection.ops.quote_name
+        with transaction.atomic(using=source), connection.cursor() as cursor:
+            for model in reversed(models):
+                pks = list(self._rows(model, region, source).values_list("pk", flat=True))
+                # Plain SQL rather than QuerySet.delete(): no signals or cascades,
+                # so nothing is re-recorded or propagated from the old shard.
+                statement = "DELETE FROM {} WHERE {} IN ({{}})".format(
+                    quote(model._meta.db_table), quote(model._meta.pk.column)
+                )
+                for start in range(0, len(pks), 500):
+                    chunk = pks[start:start + 500]
+                    cursor.execute(statement.format(", ".join(["%s"] * len(chunk))), chunk)
+                self.stdout.write(f"{model._meta.label}: deleted {len(pks)} rows from {source}")
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from regions.models import Region
+from transferportal.warmup import WARMUP_STEPS, warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Preload region lookups, association directories, tryout facets and public "
+        "pages for every active region. Only shared caches (file, redis) benefit "
+        "other processes; set WARM_CACHES_ON_STARTUP to warm each worker's own cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--region", action="append", help="Region code (repeatable). Default: all active.")
+        parser.add_argument("--step", action="append", choices=sorted(WARMUP_STEPS), help="Step (repeatable).")
+        parser.add_argument("--workers", type=int, help="Steps run in parallel (default WARM_CACHES_WORKERS).")
+
+    def handle(self, *args, **options):
+        regions = Region.objects.filter(is_active=True)
+        if options["region"]:
+            codes = [code.lower() for code in options["region"]]
+            regions = regions.filter(code__in=codes)
+            missing = set(codes) - set(regions.values_list("code", flat=True))
+            if missing:
+                raise CommandError(f"Unknown or inactive region: {', '.join(sorted(missing))}")
+
+        results = warm_caches(list(regions), options["step"], options["workers"])
+        for result in results:
+            line = f"{result.region:<6} {result.step:<12} {result.seconds * 1000:8.1f} ms"
+            if result.error:
+                self.stderr.write(f"{line}  FAILED {result.error}")
+            else:
+                self.stdout.write(line)
+
+        failed = sum(1 for result in results if result.error)
+        total = sum(result.seconds for result in results)
+        self.stdout.write(f"{len(results)} steps, {total:.2f}s of work, {failed} failed")
+        if failed:
+            raise CommandError(f"{failed} warm-up steps failed.")
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:37
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regions', '0002_seed_bc_region'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='region',
+            name='age_groups',
+            field=models.CharField(default='9U,11U,13U,15U,18U', help_text='Comma-separated age groups, e.g. 9U,11U,13U,15U,18U.', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='region',
+            name='season_rollover_day',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(31)]),
+        ),
+        migrations.AddField(
+            model_name='region',
+            name='season_rollover_month',
+            field=models.PositiveSmallIntegerField(default=9, help_text="Month the next season's age groups take effect.", validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)]),
+        ),
+    ]
@@ -1,18 +1,50 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 
 class Region(models.Model):
+    SEASON_RULE_FIELDS = ("season_rollover_month", "season_rollover_day", "age_groups")
+
     code = models.SlugField(unique=True)
     name = models.CharField(max_length=100)
     is_active = models.BooleanField(default=True)
+    season_rollover_month = models.PositiveSmallIntegerField(
+        default=9,
+        validators=[MinValueValidator(1), MaxValueValidator(12)],
+        help_text="Month the next season's age groups take effect.",
+    )
+    season_rollover_day = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(31)],
+    )
+    age_groups = models.CharField(
+        max_length=100,
+        default="9U,11U,13U,15U,18U",
+        help_text="Comma-separated age groups, e.g. 9U,11U,13U,15U,18U.",
+    )
 
     class Meta:
         ordering = ["code"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.SEASON_RULE_FIELDS) <= set(field_names):
+            instance._saved_season_rule = instance.season_rule()
+        return instance
+
+    def season_rule(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.SEASON_RULE_FIELDS)
+
+    def season_rule_changed(self) -> bool:
+        """Whether the age-group rule differs from the one last loaded or saved; unknown counts as changed."""
+        return getattr(self, "_saved_season_rule", None) != self.season_rule()
+
     def save(self, *args, **kwargs):
         if self.code:
             self.code = self.code.lower()
         super().save(*args, **kwargs)
+        self._saved_season_rule = self.season_rule()
 
     def __str__(self) -> str:
         return f"{self.name} ({self.code})"
@@ -0,0 +1,391 @@
+"""Optional routing of region-scoped rows to per-region databases.
+
+Enabled by mapping region codes to database aliases in ``REGION_SHARDS``.
+Models listed in ``SHARDED_MODELS`` (and their auto-created M2M tables) are
+read from and written to the shard of the active region; everything else
+stays on ``default``. The active region comes from ``RegionMiddleware`` or
+``region_context()`` in commands and background jobs.
+
+Every database carries the full schema. Rows a shard row points at but does
+not own (its region, users) are copied into that database as reference
+stubs on save, and vice versa for global rows pointing at sharded ones, so
+foreign-key constraints hold on every backend. A stub only carries the
+columns listed for its model in ``SHARD_REFERENCE_FIELDS`` (every column for
+unlisted models); saving or deleting the source row updates or deletes its
+stubs. Reads of those models still go to their home database.
+
+Each shard hands out primary keys from its own block (``SHARD_KEY_BLOCKS``),
+so a sharded row copied into ``default`` or another shard never takes the key
+of a different region's row.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, router
+from django.db.models import ProtectedError
+
+logger = logging.getLogger(__name__)
+
+_active_region_code: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "active_region_code",
+    default=None,
+)
+_pinned_alias: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "pinned_alias",
+    default=None,
+)
+_region_codes: dict[int, str] = {}
+# (alias, table) pairs known to exist; a new shard has no tables until migrate_shards.
+_known_tables: set[tuple[str, str]] = set()
+
+
+class ReferenceConflict(IntegrityError):
+    """A stub's primary key is already taken by another region's row."""
+
+
+def sharding_enabled() -> bool:
+    return bool(settings.REGION_SHARDS)
+
+
+def shard_aliases() -> list[str]:
+    return sorted(set(settings.REGION_SHARDS.values()))
+
+
+def shard_for_code(code: Optional[str]) -> str:
+    if not code:
+        return DEFAULT_DB_ALIAS
+    return settings.REGION_SHARDS.get(code, DEFAULT_DB_ALIAS)
+
+
+def region_code_for_id(region_id) -> Optional[str]:
+    if region_id is None:
+        return None
+    if region_id not in _region_codes:
+        Region = apps.get_model("regions", "Region")
+        code = Region.objects.using(DEFAULT_DB_ALIAS).filter(pk=region_id).values_list("code", flat=True).first()
+        if code is None:
+            return None
+        _region_codes[region_id] = code
+    return _region_codes[region_id]
+
+
+def forget_region_codes() -> None:
+    _region_codes.clear()
+
+
+def has_table(alias: str, model) -> bool:
+    table = model._meta.db_table
+    if (alias, table) not in _known_tables:
+        if table not in connections[alias].introspection.table_names():
+            return False
+        _known_tables.add((alias, table))
+    return True
+
+
+def forget_known_tables() -> None:
+    _known_tables.clear()
+
+
+def is_historical(model) -> bool:
+    """Whether ``model`` is a migration's historical model (saved from a data migration)."""
+    return model._meta.apps is not apps
+
+
+def activate_region(region):
+    """Make ``region`` the routing target; returns a token for ``deactivate_region``."""
+    return _active_region_code.set(getattr(region, "code", region))
+
+
+def deactivate_region(token) -> None:
+    _active_region_code.reset(token)
+
+
+@contextmanager
+def region_context(region):
+    token = activate_region(region)
+    try:
+        yield
+    finally:
+        deactivate_region(token)
+
+
+@contextmanager
+def pinned_database(alias: str):
+    """Route every model to ``alias``; used while migrating a single shard."""
+    token = _pinned_alias.set(alias)
+    try:
+        yield
+    finally:
+        _pinned_alias.reset(token)
+
+
+def active_shard() -> str:
+    return shard_for_code(_active_region_code.get())
+
+
+def _sharded_labels() -> set[str]:
+    return {label.lower() for label in settings.SHARDED_MODELS}
+
+
+def is_sharded(model) -> bool:
+    opts = model._meta
+    if opts.auto_created:
+        # Auto-created M2M tables live with the model that declares the field.
+        return is_sharded(opts.auto_created)
+    return opts.label_lower in _sharded_labels()
+
+
+def region_lookup(model) -> str:
+    """ORM path from ``model`` to its region, used to select rows to move."""
+    opts = model._meta
+    if opts.auto_created:
+        owner = opts.auto_created
+        field = next(f for f in opts.fields if f.is_relation and f.related_model is owner)
+        return f"{field.name}__{region_lookup(owner)}"
+    try:
+        opts.get_field("region")
+        return "region"
+    except FieldDoesNotExist:
+        pass
+    path = settings.SHARDED_MODEL_REGION_PATHS.get(opts.label)
+    if path is None:
+        raise ValueError(f"No region path for sharded model {opts.label}")
+    return path
+
+
+def home_database(model, instance=None) -> str:
+    if not sharding_enabled() or not is_sharded(model):
+        return DEFAULT_DB_ALIAS
+    # Related-object hints carry the source instance; only trust sharded ones.
+    if instance is not None and is_sharded(type(instance)):
+        # Assigning a related object stamps _state.db on unsaved instances,
+        # so only a loaded instance's database is authoritative.
+        if instance._state.db and not instance._state.adding:
+            return instance._state.db
+        region_id = getattr(instance, "region_id", None)
+        if region_id is not None:
+            return shard_for_code(region_code_for_id(region_id))
+    return active_shard()
+
+
+def sharded_models() -> list:
+    """Sharded models parents-first, each followed by its auto-created M2M tables."""
+    ordered = []
+    for label in settings.SHARDED_MODELS:
+        model = apps.get_model(label)
+        ordered.append(model)
+        ordered.extend(
+            field.remote_field.through
+            for field in model._meta.local_many_to_many
+            if field.remote_field.through._meta.auto_created
+        )
+    return ordered
+
+
+def key_range(alias: str) -> tuple[int, int]:
+    """Primary keys ``alias`` allocates for sharded tables: ``(first, last)`` inclusive."""
+    if alias == DEFAULT_DB_ALIAS:
+        block = 0
+    else:
+        block = settings.SHARD_KEY_BLOCKS.get(alias)
+        if not isinstance(block, int) or block < 1:
+            raise ImproperlyConfigured(f"SHARD_KEY_BLOCKS needs a positive block number for {alias}")
+    size = settings.SHARD_KEY_BLOCK_SIZE
+    return block * size + 1, (block + 1) * size
+
+
+def check_key_blocks() -> None:
+    blocks = {}
+    for alias in shard_aliases():
+        if alias == DEFAULT_DB_ALIAS:
+            continue
+        first, _ = key_range(alias)
+        if first in blocks:
+            raise ImproperlyConfigured(f"{alias} and {blocks[first]} share a SHARD_KEY_BLOCKS entry")
+        blocks[first] = alias
+
+
+def reserve_key_range(alias: str) -> None:
+    """Point the key sequences of sharded tables in ``alias`` into its own block.
+
+    Rows copied in from another database keep their keys, which can drag a
+    sequence into the source's block; rerunning this moves it back.
+    """
+    first, last = key_range(alias)
+    connection = connections[alias]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model in sharded_models():
+            table, column = model._meta.db_table, model._meta.pk.column
+            cursor.execute(
+                f"SELECT MAX({quote(column)}) FROM {quote(table)} WHERE {quote(column)} BETWEEN %s AND %s",
+                [first, last],
+            )
+            used = cursor.fetchone()[0] or first - 1
+            if connection.vendor == "sqlite":
+                cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [table])
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)", [table, used])
+            elif connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, %s), %s, %s)",
+                    [table, column, max(used, first), used >= first],
+                )
+            else:
+                raise ImproperlyConfigured(f"Shard key blocks are not supported on {connection.vendor}")
+
+
+@lru_cache(maxsize=None)
+def _reference_labels(sharded_labels: frozenset) -> frozenset:
+    labels = set()
+    for model in apps.get_models(include_auto_created=True):
+        for field in model._meta.concrete_fields:
+            if field.is_relation and is_sharded(model) != is_sharded(field.related_model):
+                labels.add(field.related_model._meta.label_lower)
+    return frozenset(labels)
+
+
+def is_reference_model(model) -> bool:
+    """Whether rows of ``model`` are copied into other databases as stubs."""
+    return model._meta.label_lower in _reference_labels(frozenset(_sharded_labels()))
+
+
+def _stub_fields(model) -> list:
+    allowed = settings.SHARD_REFERENCE_FIELDS.get(model._meta.label)
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if not field.primary_key and (allowed is None or field.name in allowed)
+    ]
+
+
+def reference_stub(row):
+    """Unsaved copy of ``row`` limited to its ``SHARD_REFERENCE_FIELDS``; other columns keep defaults."""
+    model = type(row)
+    return model(pk=row.pk, **{field.attname: getattr(row, field.attname) for field in _stub_fields(model)})
+
+
+def _stub_querysets(instance, using: str):
+    """Querysets matching the stubs of ``instance`` outside its home database ``using``."""
+    model = type(instance)
+    if not is_sharded(model):
+        if using != DEFAULT_DB_ALIAS:
+            # A stub changing (e.g. cascading from its source) has nothing to propagate.
+            return []
+        return [
+            model._base_manager.using(alias).filter(pk=instance.pk)
+            for alias in shard_aliases()
+            if alias != using and has_table(alias, model)
+        ]
+    region_id = getattr(instance, "region_id", None)
+    if using == DEFAULT_DB_ALIAS or using != shard_for_code(region_code_for_id(region_id)):
+        return []
+    # Shards allocate keys independently, so only a stub of the same region is ours.
+    return [model._base_manager.using(DEFAULT_DB_ALIAS).filter(pk=instance.pk, region_id=region_id)]
+
+
+def refresh_reference_rows(instance, using: str) -> None:
+    """Rewrite the stub columns of a saved reference row wherever it was copied."""
+    values = {field.attname: getattr(instance, field.attname) for field in _stub_fields(type(instance))}
+    for stubs in _stub_querysets(instance, using):
+        stubs.update(**values)
+
+
+def delete_reference_rows(instance, using: str) -> None:
+    """Delete the stubs of a deleted reference row, cascading inside each database."""
+    for stubs in _stub_querysets(instance, using):
+        try:
+            stubs.delete()
+        except (ProtectedError, IntegrityError):
+            logger.warning(
+                "Kept %s %s in %s: rows there still depend on it", instance._meta.label, instance.pk, stubs.db
+            )
+
+
+def ensure_reference_rows(instance, using: str) -> None:
+    """Copy rows ``instance`` points at into ``using`` when they live elsewhere."""
+    for field in instance._meta.concrete_fields:
+        if not field.is_relation:
+            continue
+        value = getattr(instance, field.attname)
+        if value is None:
+            continue
+        ensure_row(field.related_model, value, using)
+
+
+def ensure_row(model, pk, using: str) -> None:
+    ensure_rows(model, {pk}, using)
+
+
+def ensure_bulk_reference_rows(instances, using: str) -> None:
+    """``ensure_reference_rows`` for objects about to be passed to ``bulk_create``."""
+    instances = list(instances)
+    if not instances:
+        return
+    for field in instances[0]._meta.concrete_fields:
+        if field.is_relation:
+            ensure_rows(field.related_model, {getattr(obj, field.attname) for obj in instances}, using)
+
+
+def bulk_create_with_references(model, objs, batch_size=None):
+    """``bulk_create`` that first copies reference rows like ``pre_save`` would."""
+    if objs and sharding_enabled():
+        ensure_bulk_reference_rows(objs, router.db_for_write(model))
+    return model.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def ensure_rows(model, pks, using: str) -> None:
+    pks = set(pks) - {None}
+    home = home_database(model)
+    if home == using or not pks:
+        return
+    missing = pks - set(model._base_manager.using(using).filter(pk__in=pks).values_list("pk", flat=True))
+    if missing:
+        rows = [reference_stub(row) for row in model._base_manager.using(home).filter(pk__in=missing)]
+        ensure_bulk_reference_rows(rows, using)
+        # Conflicts here are concurrent copies of the same row; the region check catches the rest.
+        model._base_manager.using(using).bulk_create(rows, ignore_conflicts=True)
+    if is_sharded(model):
+        _check_stub_regions(model, pks, home, using)
+
+
+def _check_stub_regions(model, pks, home: str, using: str) -> None:
+    path = region_lookup(model)
+    expected = dict(model._base_manager.using(home).filter(pk__in=pks).values_list("pk", path))
+    stored = model._base_manager.using(using).filter(pk__in=pks).values_list("pk", path)
+    clashes = sorted(pk for pk, region_id in stored if pk in expected and expected[pk] != region_id)
+    if clashes:
+        raise ReferenceConflict(
+            f"{model._meta.label} {clashes} in {using} belong to another region than in {home}; "
+            "give every shard its own SHARD_KEY_BLOCKS entry"
+        )
+
+
+class RegionShardRouter:
+    """Route sharded models to the active region's database."""
+
+    def db_for_read(self, model, **hints):
+        if not sharding_enabled():
+            return None
+        pinned = _pinned_alias.get()
+        if pinned is not None:
+            return pinned
+        return home_database(model, hints.get("instance"))
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if sharding_enabled():
+            # Cross-database references are backed by reference stubs.
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
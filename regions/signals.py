@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from regions.cache import bump_for_instance, forget_region_lookups
+from regions.models import Region
+from regions.sharding import (
+    delete_reference_rows,
+    ensure_reference_rows,
+    ensure_row,
+    forget_known_tables,
+    forget_region_codes,
+    is_historical,
+    is_reference_model,
+    refresh_reference_rows,
+    sharding_enabled,
+)
+
+
+@receiver(pre_save)
+def copy_reference_rows(sender, instance, raw=False, using=None, **kwargs):
+    # Data migrations save historical models; shards are brought up to date by migrate_shards.
+    if raw or not sharding_enabled() or is_historical(sender):
+        return
+    ensure_reference_rows(instance, using)
+
+
+@receiver(post_save)
+def refresh_reference_stubs(sender, instance, raw=False, using=None, **kwargs):
+    if raw or not sharding_enabled() or is_historical(sender) or not is_reference_model(sender):
+        return
+    refresh_reference_rows(instance, using)
+
+
+@receiver(post_delete)
+def delete_reference_stubs(sender, instance, using=None, **kwargs):
+    if not sharding_enabled() or is_historical(sender) or not is_reference_model(sender):
+        return
+    delete_reference_rows(instance, using)
+
+
+@receiver(m2m_changed)
+def copy_m2m_reference_rows(sender, instance, action, model, pk_set, using=None, **kwargs):
+    if action != "pre_add" or not sharding_enabled() or is_historical(sender):
+        return
+    ensure_row(type(instance), instance.pk, using)
+    for pk in pk_set or ():
+        ensure_row(model, pk, using)
+
+
+@receiver(post_migrate)
+def reset_known_tables(sender, **kwargs):
+    forget_known_tables()
+
+
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def reset_region_codes(sender, **kwargs):
+    forget_region_codes()
+    forget_region_lookups()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_region_cache_version(sender, instance, raw=False, **kwargs):
+    if raw or sender._meta.label not in settings.REGION_CACHE_MODELS:
+        return
+    bump_for_instance(instance)
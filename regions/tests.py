@@ -1,9 +1,38 @@
+from datetime import date
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
 from django.http import HttpResponse
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
 
+from availability.models import OpenPlayerDocument, PlayerAvailability
+from organizations.models import Association, Team, TeamCoach
+from profiles.models import PlayerProfile
+from regions.age_groups import age_group_for, season_year
+from regions.cache import cache_stats, cached_for_region, region_cache_key, reset_cache_stats
 from regions.models import Region
+from regions.sharding import (
+    ReferenceConflict,
+    RegionShardRouter,
+    active_shard,
+    forget_known_tables,
+    region_context,
+    region_lookup,
+)
+from transferportal.test_runner import SHARD_TEST_ALIAS
+from transferportal.warmup import warm_caches, warm_on_startup
+from tryouts.models import TryoutEvent
 from transferportal.middleware.region import RegionMiddleware
 
+SHARDED = {"REGION_SHARDS": {"on": SHARD_TEST_ALIAS}, "SHARD_KEY_BLOCKS": {SHARD_TEST_ALIAS: 1}}
+
 
 class RegionMiddlewareTests(TestCase):
     def setUp(self):
@@ -31,3 +60,298 @@ class RegionMiddlewareTests(TestCase):
         request = self.factory.get("/", HTTP_HOST="on.localhost:8000")
         self.middleware(request)
         self.assertEqual(self.captured_request.region_code, "on")
+
+
+@override_settings(**SHARDED)
+class RegionShardRouterTests(TestCase):
+    databases = {"default", SHARD_TEST_ALIAS}
+
+    def setUp(self):
+        self.router = RegionShardRouter()
+        self.bc = Region.objects.get(code="bc")
+        self.on = Region.objects.create(code="on", name="Ontario")
+
+    def test_sharded_instance_routes_to_its_region_shard(self):
+        event = TryoutEvent(region=self.on)
+        self.assertEqual(self.router.db_for_write(TryoutEvent, instance=event), SHARD_TEST_ALIAS)
+        event = TryoutEvent(region=self.bc)
+        self.assertEqual(self.router.db_for_write(TryoutEvent, instance=event), "default")
+
+    def test_reads_follow_active_region(self):
+        self.assertEqual(self.router.db_for_read(Team), "default")
+        with region_context(self.on):
+            self.assertEqual(active_shard(), SHARD_TEST_ALIAS)
+            self.assertEqual(self.router.db_for_read(Team), SHARD_TEST_ALIAS)
+            self.assertEqual(self.router.db_for_read(get_user_model()), "default")
+        self.assertEqual(self.router.db_for_read(Team), "default")
+
+    def test_global_instance_hint_is_ignored(self):
+        user = get_user_model()(username="hint")
+        with region_context(self.on):
+            self.assertEqual(self.router.db_for_read(Team, instance=user), SHARD_TEST_ALIAS)
+
+    def test_m2m_tables_follow_declaring_model(self):
+        allowed = PlayerAvailability.allowed_associations.through
+        visible = PlayerProfile.visible_associations.through
+        with region_context(self.on):
+            self.assertEqual(self.router.db_for_write(allowed), SHARD_TEST_ALIAS)
+            self.assertEqual(self.router.db_for_write(visible), "default")
+
+    def test_region_lookup_paths(self):
+        self.assertEqual(region_lookup(Association), "region")
+        self.assertEqual(region_lookup(TeamCoach), "team__region")
+        self.assertEqual(
+            region_lookup(PlayerAvailability.allowed_associations.through),
+            "playeravailability__region",
+        )
+
+    def test_middleware_activates_request_region(self):
+        seen = {}
+
+        def get_response(request):
+            seen["shard"] = active_shard()
+            return HttpResponse("ok")
+
+        RegionMiddleware(get_response)(RequestFactory().get("/", HTTP_HOST="on.localhost:8000"))
+        self.assertEqual(seen["shard"], SHARD_TEST_ALIAS)
+        self.assertEqual(active_shard(), "default")
+
+    @override_settings(REGION_SHARDS={})
+    def test_router_is_inert_without_shards(self):
+        with region_context(self.on):
+            self.assertIsNone(self.router.db_for_read(Team))
+            self.assertIsNone(self.router.allow_relation(self.on, self.bc))
+        with self.assertRaises(CommandError):
+            call_command("migrate_shards")
+
+
+class ShardCommandTests(TestCase):
+    databases = {"default", SHARD_TEST_ALIAS}
+
+    def setUp(self):
+        self.on = Region.objects.create(code="on", name="Ontario")
+        self.player = get_user_model().objects.create_user(
+            username="mover", email="mover@example.com", password="testpass"
+        )
+        self.association = Association.objects.create(region=self.on, name="Ottawa")
+        availability = PlayerAvailability.objects.create(player=self.player, region=self.on, is_open=True)
+        availability.allowed_associations.add(self.association)
+
+    def _move(self, *args):
+        call_command("move_region", "on", *args, stdout=StringIO())
+
+    def test_move_region_to_a_new_shard(self):
+        with override_settings(**SHARDED):
+            call_command("migrate_shards", verbosity=0, stdout=StringIO())
+            self.assertTrue(Region.objects.using(SHARD_TEST_ALIAS).filter(code="bc").exists())
+
+            self._move("--from", "default", "--to", SHARD_TEST_ALIAS)
+            shard_availability = PlayerAvailability.objects.using(SHARD_TEST_ALIAS).get(player=self.player)
+            self.assertEqual(list(shard_availability.allowed_associations.all()), [self.association])
+            self.assertTrue(OpenPlayerDocument.objects.using(SHARD_TEST_ALIAS).filter(player=self.player).exists())
+
+            self._move("--purge-source", "--from", "default", "--to", SHARD_TEST_ALIAS)
+            self.assertFalse(PlayerAvailability.objects.using("default").filter(region=self.on).exists())
+            self.assertFalse(Association.objects.using("default").filter(region=self.on).exists())
+            with region_context(self.on):
+                self.assertTrue(PlayerAvailability.objects.filter(player=self.player).exists())
+
+    def test_user_stubs_hold_only_listed_columns_and_follow_the_source(self):
+        with override_settings(**SHARDED):
+            self._move("--from", "default", "--to", SHARD_TEST_ALIAS)
+            stub = get_user_model().objects.using(SHARD_TEST_ALIAS).get(pk=self.player.pk)
+            self.assertEqual((stub.username, stub.email, stub.password), ("mover", "", ""))
+
+            self.player.username = "renamed"
+            self.player.save()
+            stub.refresh_from_db()
+            self.assertEqual(stub.username, "renamed")
+
+            self.player.delete()
+            self.assertFalse(get_user_model().objects.using(SHARD_TEST_ALIAS).filter(pk=stub.pk).exists())
+            self.assertFalse(PlayerAvailability.objects.using(SHARD_TEST_ALIAS).exists())
+
+
+    def test_shard_allocates_keys_from_its_block(self):
+        with override_settings(**SHARDED):
+            call_command("migrate_shards", verbosity=0, stdout=StringIO())
+            self._move("--from", "default", "--to", SHARD_TEST_ALIAS)
+            with region_context(self.on):
+                association = Association.objects.create(region=self.on, name="Kingston")
+        self.assertTrue(10**12 < association.pk <= 2 * 10**12)
+
+    def test_stub_key_taken_by_another_region_raises(self):
+        bc_association = Association.objects.create(region=Region.objects.get(code="bc"), name="Surrey")
+        coach = get_user_model().objects.create_user(username="on-coach", password="testpass")
+        with override_settings(**SHARDED):
+            call_command("migrate_shards", verbosity=0, stdout=StringIO())
+            # What an unblocked shard would hand out: BC's key for an Ontario row.
+            Association.objects.using(SHARD_TEST_ALIAS).create(pk=bc_association.pk, region=self.on, name="Ottawa")
+            with region_context(self.on), self.assertRaises(ReferenceConflict):
+                coach.profile.association_id = bc_association.pk
+                coach.profile.save()
+
+    def test_commands_require_a_key_block(self):
+        with override_settings(REGION_SHARDS={"on": SHARD_TEST_ALIAS}, SHARD_KEY_BLOCKS={}):
+            with self.assertRaisesMessage(CommandError, "SHARD_KEY_BLOCKS"):
+                call_command("migrate_shards", verbosity=0, stdout=StringIO())
+            with self.assertRaisesMessage(CommandError, "SHARD_KEY_BLOCKS"):
+                self._move("--from", "default", "--to", SHARD_TEST_ALIAS)
+
+
+@override_settings(**SHARDED)
+class EmptyShardTests(TransactionTestCase):
+    databases = {"default", SHARD_TEST_ALIAS}
+    serialized_rollback = True
+
+    def setUp(self):
+        connection = connections[SHARD_TEST_ALIAS]
+        with connection.constraint_checks_disabled(), connection.cursor() as cursor:
+            for table in connection.introspection.table_names(cursor):
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(table)}")
+        forget_known_tables()
+
+    def test_writes_and_data_migrations_skip_a_shard_without_tables(self):
+        seed = import_module("regions.migrations.0002_seed_bc_region")
+        state = MigrationLoader(connections["default"]).project_state(("regions", "0002_seed_bc_region"))
+        seed.create_bc_region(state.apps, None)
+        bc = Region.objects.get(code="bc")
+        bc.name = "BC"
+        bc.save()
+        get_user_model().objects.create_user(username="early", password="testpass")
+
+        call_command("migrate_shards", verbosity=0, stdout=StringIO())
+        self.assertEqual(Region.objects.using(SHARD_TEST_ALIAS).get(code="bc").name, "BC")
+        bc.name = "British Columbia"
+        bc.save()
+        self.assertEqual(Region.objects.using(SHARD_TEST_ALIAS).get(code="bc").name, "British Columbia")
+
+
+class RegionCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.bc = Region.objects.get(code="bc")
+        self.on = Region.objects.create(code="on", name="Ontario")
+        self.calls = 0
+
+    def _teams(self, region):
+        def compute():
+            self.calls += 1
+            return list(Team.objects.filter(region=region).values_list("name", flat=True))
+
+        return cached_for_region(region, "teams", compute, depends_on=[Team])
+
+    def test_keys_are_prefixed_with_region_code(self):
+        self.assertTrue(region_cache_key(self.on, "teams", [Team]).startswith("region:on:teams:"))
+
+    def test_save_invalidates_only_its_region(self):
+        bc_association = Association.objects.create(region=self.bc, name="BC Assoc")
+        on_association = Association.objects.create(region=self.on, name="ON Assoc")
+        Team.objects.create(region=self.on, association=on_association, name="ON Team", age_group="13U")
+        self.assertEqual(self._teams(self.bc), [])
+        self.assertEqual(self._teams(self.on), ["ON Team"])
+        self.assertEqual(self.calls, 2)
+
+        Team.objects.create(region=self.bc, association=bc_association, name="BC Team", age_group="13U")
+        self.assertEqual(self._teams(self.bc), ["BC Team"])
+        self.assertEqual(self._teams(self.on), ["ON Team"])
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(cache_stats()["teams"]["hits"], 1)
+        self.assertEqual(cache_stats()["teams"]["misses"], 3)
+
+    def test_cross_region_results_are_not_cached(self):
+        association = Association.objects.create(region=self.on, name="ON Assoc")
+
+        def compute():
+            self.calls += 1
+            return [association]
+
+        with self.assertLogs("regions.cache", level="WARNING"):
+            cached_for_region(self.bc, "leak", compute, depends_on=[Association])
+        with self.assertLogs("regions.cache", level="WARNING"):
+            cached_for_region(self.bc, "leak", compute, depends_on=[Association])
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(cache_stats()["leak"]["cross_region"], 2)
+
+
+class CacheWarmupTests(TestCase):
+    def setUp(self):
+        self.bc = Region.objects.get(code="bc")
+        association = Association.objects.create(region=self.bc, name="Coquitlam")
+        team = Team.objects.create(region=self.bc, association=association, name="13U AAA", age_group="13U")
+        TryoutEvent.objects.create(
+            region=self.bc,
+            association=association,
+            team=team,
+            name="13U AAA Tryouts",
+            start_date=date(2030, 3, 1),
+            end_date=date(2030, 3, 2),
+            location="Town Centre",
+            registration_url="https://example.com",
+        )
+        self.association = association
+
+    def test_warmed_public_pages_skip_the_database(self):
+        results = warm_caches([self.bc], workers=1)
+        self.assertEqual([result.error for result in results], ["", "", "", ""])
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/", HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, "Coquitlam")
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/associations/{self.association.id}/", HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, "13U AAA Tryouts")
+
+    def test_region_lookup_invalidated_on_save(self):
+        self.client.get("/", HTTP_HOST="bc.localhost:8000")
+        self.bc.is_active = False
+        self.bc.save()
+        response = self.client.get("/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 404)
+
+    def test_command_rejects_unknown_region(self):
+        with self.assertRaises(CommandError):
+            call_command("warm_caches", region=["zz"])
+
+    @override_settings(WARM_CACHES_HOST="portal.example.com", ALLOWED_HOSTS=[".portal.example.com"])
+    def test_pages_render_for_the_configured_host(self):
+        [result] = warm_caches([self.bc], steps=["pages"], workers=1)
+        self.assertEqual(result.error, "")
+
+    @override_settings(WARM_CACHES_HOST="portal.example.com", ALLOWED_HOSTS=[".other.example.com"])
+    def test_pages_step_reports_a_disallowed_host(self):
+        [result] = warm_caches([self.bc], steps=["pages"], workers=1)
+        self.assertIn("ALLOWED_HOSTS", result.error)
+
+    @override_settings(WARM_CACHES_ON_STARTUP=True)
+    def test_startup_warmup_survives_a_database_outage(self):
+        with mock.patch("transferportal.warmup.Region.objects.filter", side_effect=DatabaseError("down")):
+            with self.assertLogs("transferportal.warmup", "ERROR"):
+                warm_on_startup()
+
+
+class AgeGroupTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="bc")
+
+    def test_season_rolls_over_on_configured_date(self):
+        self.assertEqual(season_year(self.region, date(2026, 8, 31)), 2026)
+        self.assertEqual(season_year(self.region, date(2026, 9, 1)), 2027)
+
+    def test_age_group_uses_youngest_matching_group(self):
+        today = date(2026, 3, 1)
+        self.assertEqual(age_group_for(2013, self.region, today), "13U")
+        self.assertEqual(age_group_for(2014, self.region, today), "13U")
+        self.assertEqual(age_group_for(2012, self.region, today), "15U")
+        self.assertEqual(age_group_for(2000, self.region, today), "")
+        self.assertEqual(age_group_for(None, self.region, today), "")
+
+    def test_season_defaults_to_local_date(self):
+        with mock.patch("regions.age_groups.timezone.localdate", return_value=date(2026, 9, 1)):
+            self.assertEqual(season_year(self.region), 2027)
+
+    def test_calendar_year_rule(self):
+        self.region.season_rollover_month = 1
+        self.region.season_rollover_day = 1
+        self.assertEqual(season_year(self.region, date(2026, 12, 31)), 2026)
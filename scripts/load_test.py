@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Concurrent-connection load test for the read-only API.
+
+Start the app under each server, then point this script at it:
+
+    # async (ASGI)
+    uvicorn transferportal.asgi:application --port 8000 --workers 1
+    # sync (WSGI), same worker budget
+    gunicorn transferportal.wsgi:application --bind :8001 --workers 1 --threads 8
+
+    python scripts/load_test.py http://bc.localhost:8000/api/v1/health/ --connections 200
+    python scripts/load_test.py http://bc.localhost:8001/api/v1/health/ --connections 200
+
+Pass ``--token`` (a JWT access token) for authenticated endpoints such as
+``/api/v1/me/`` or ``/api/v1/open-players/``. Uses only the standard library.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(host, port, request_bytes, timeout):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(request_bytes)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def worker(deadline, args, target, request_bytes, latencies, statuses):
+    host, port = target
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await fetch(host, port, request_bytes, args.timeout)
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            status = "error"
+        latencies.append(time.perf_counter() - started)
+        statuses[status] = statuses.get(status, 0) + 1
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    target = (args.connect or url.hostname, url.port or 80)
+    path = url.path + (f"?{url.query}" if url.query else "")
+    headers = [f"GET {path} HTTP/1.1", f"Host: {url.netloc}", "Connection: close"]
+    if args.token:
+        headers.append(f"Authorization: Bearer {args.token}")
+    request_bytes = ("\r\n".join(headers) + "\r\n\r\n").encode()
+
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*[
+        worker(deadline, args, target, request_bytes, latencies, statuses)
+        for _ in range(args.connections)
+    ])
+
+    latencies.sort()
+    completed = len(latencies)
+    print(f"{args.url} with {args.connections} concurrent connections for {args.duration}s")
+    print(f"  requests: {completed} ({completed / args.duration:.1f}/s)")
+    print(f"  statuses: {dict(sorted(statuses.items(), key=str))}")
+    if latencies:
+        p95 = latencies[int(completed * 0.95) - 1] if completed >= 20 else latencies[-1]
+        print(f"  latency: median {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--token", help="JWT access token for authenticated endpoints.")
+    parser.add_argument(
+        "--connect",
+        help="Address to connect to when the URL host (e.g. bc.localhost) does not resolve.",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transferportal.settings")
 
 application = get_asgi_application()
+
+from transferportal.warmup import warm_on_startup  # noqa: E402 (needs configured apps)
+
+warm_on_startup()
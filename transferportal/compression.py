@@ -0,0 +1,72 @@
+"""Content-Encoding negotiation and codecs shared by static files and responses.
+
+gzip is always available. Brotli is offered only when a brotli module can be
+imported: ``brotli`` (the reference bindings) or ``brotlicffi``.
+"""
+from __future__ import annotations
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # optional: gzip only
+        brotli = None
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def available_encodings() -> list[str]:
+    """Encodings this process can produce, preferred first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings listed in an ``Accept-Encoding`` header, minus those with ``q=0``."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if params and quality.replace(".", "", 1).isdigit() and float(quality) == 0:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate(header: str, offered) -> str | None:
+    """The first of ``offered`` the client accepts, or ``None``."""
+    accepted = accepted_encodings(header or "")
+    return next((encoding for encoding in offered if encoding in accepted), None)
+
+
+class StreamCompressor:
+    """Incremental compressor whose output is flushed after every chunk.
+
+    Flushing lets a streamed body (including server-sent events) reach the
+    client chunk by chunk instead of sitting in the compressor's buffer.
+    """
+
+    def __init__(self, encoding: str, *, gzip_level: int = 6, brotli_quality: int = 5):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._process = getattr(self._compressor, "process", None) or self._compressor.compress
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+    def compress_all(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
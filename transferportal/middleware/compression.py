@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from transferportal.compression import StreamCompressor, available_encodings, negotiate
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+@dataclass
+class CompressionStats:
+    compressed: int = 0
+    skipped: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def snapshot(self) -> dict:
+        return {**asdict(self), "bytes_saved": self.bytes_in - self.bytes_out}
+
+
+_stats_lock = threading.Lock()
+_stats: defaultdict[str, CompressionStats] = defaultdict(CompressionStats)
+
+
+def _record(endpoint: str, **counts) -> None:
+    with _stats_lock:
+        stats = _stats[endpoint]
+        for name, value in counts.items():
+            setattr(stats, name, getattr(stats, name) + value)
+
+
+def compression_stats() -> dict:
+    """Per-endpoint counters for this process, most bytes saved first."""
+    with _stats_lock:
+        snapshots = {endpoint: stats.snapshot() for endpoint, stats in _stats.items()}
+    return dict(sorted(snapshots.items(), key=lambda item: -item[1]["bytes_saved"]))
+
+
+def reset_compression_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def endpoint_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.view_name or match.route
+
+
+class CompressionMiddleware:
+    """gzip/brotli response bodies, streamed ones included.
+
+    Skipped: bodies under ``MIN_SIZE`` bytes, types that are not text (images
+    and archives are already compressed), responses that already carry a
+    ``Content-Encoding``, and (against BREACH) responses whose body contains a
+    CSRF token, i.e. any response setting the CSRF cookie. Streamed bodies
+    are flushed per chunk so event streams are not held back. Bytes in and out
+    are counted per URL name; admins read them at ``/api/v1/ops/compression/``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.RESPONSE_COMPRESSION
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_size = config["MIN_SIZE"]
+        self.options = {"gzip_level": config["GZIP_LEVEL"], "brotli_quality": config["BROTLI_QUALITY"]}
+        self.encodings = available_encodings()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def _skip(self, request, response) -> bool:
+        return (
+            response.has_header("Content-Encoding")
+            or response.status_code in (204, 206, 304)
+            or not is_compressible(response.get("Content-Type", ""))
+            # CsrfViewMiddleware (re)sets the cookie whenever get_token() ran,
+            # i.e. whenever the body may embed a CSRF token.
+            or settings.CSRF_COOKIE_NAME in response.cookies
+            or (not response.streaming and len(response.content) < self.min_size)
+        )
+
+    def process_response(self, request, response):
+        # Whatever is decided, the representation depends on Accept-Encoding.
+        if is_compressible(response.get("Content-Type", "")):
+            patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""), self.encodings)
+        if encoding is None:
+            return response
+        endpoint = endpoint_name(request)
+        if self._skip(request, response):
+            _record(endpoint, skipped=1)
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._acompress(response.streaming_content, encoding, endpoint)
+            else:
+                response.streaming_content = self._compress(response.streaming_content, encoding, endpoint)
+            if response.has_header("Content-Length"):
+                del response["Content-Length"]
+        else:
+            content = response.content
+            compressed = StreamCompressor(encoding, **self.options).compress_all(content)
+            if len(compressed) >= len(content):
+                _record(endpoint, skipped=1)
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+            _record(endpoint, compressed=1, bytes_in=len(content), bytes_out=len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # The strong tag names the uncompressed bytes.
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = encoding
+        return response
+
+    def _compress(self, chunks, encoding, endpoint):
+        compressor = StreamCompressor(encoding, **self.options)
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in chunks:
+                bytes_in += len(chunk)
+                data = compressor.compress(chunk)
+                bytes_out += len(data)
+                if data:
+                    yield data
+            data = compressor.finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            _record(endpoint, compressed=1, bytes_in=bytes_in, bytes_out=bytes_out)
+
+    async def _acompress(self, chunks, encoding, endpoint):
+        compressor = StreamCompressor(encoding, **self.options)
+        bytes_in = bytes_out = 0
+        try:
+            async for chunk in chunks:
+                bytes_in += len(chunk)
+                data = compressor.compress(chunk)
+                bytes_out += len(data)
+                if data:
+                    yield data
+            data = compressor.finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            _record(endpoint, compressed=1, bytes_in=bytes_in, bytes_out=bytes_out)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+_readiness_lock = threading.Lock()
+_readiness = {"checked_at": None, "ok": False, "error": ""}
+
+
+def check_database() -> tuple[bool, str]:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        # The probe is unauthenticated: keep hosts and driver messages in the log.
+        logger.exception("Readiness check failed")
+        return False, "database unavailable"
+    return True, ""
+
+
+def readiness() -> dict:
+    """DB connectivity, re-checked at most once per READINESS_CHECK_INTERVAL."""
+    with _readiness_lock:
+        now = time.monotonic()
+        checked_at = _readiness["checked_at"]
+        if checked_at is None or now - checked_at >= settings.READINESS_CHECK_INTERVAL:
+            ok, error = check_database()
+            _readiness.update(checked_at=now, ok=ok, error=error)
+        return dict(_readiness)
+
+
+def reset_readiness() -> None:
+    with _readiness_lock:
+        _readiness.update(checked_at=None, ok=False, error="")
+
+
+class FastPathMiddleware:
+    """Answer liveness, readiness and favicon requests before anything else.
+
+    Install first: these requests never touch sessions, CSRF, the region
+    lookup, DRF or ALLOWED_HOSTS validation (load balancers often probe by IP).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _liveness():
+        return JsonResponse({"status": "ok"})
+
+    @staticmethod
+    def _readiness_response(state):
+        if state["ok"]:
+            return JsonResponse({"status": "ready"})
+        return JsonResponse({"status": "unavailable", "error": state["error"]}, status=503)
+
+    @staticmethod
+    def _favicon():
+        response = HttpResponse(status=204)
+        response["Cache-Control"] = "public, max-age=86400"
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        path = request.path_info
+        if path == settings.LIVENESS_PATH:
+            return self._liveness()
+        if path == settings.READINESS_PATH:
+            return self._readiness_response(readiness())
+        if path == "/favicon.ico":
+            return self._favicon()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        path = request.path_info
+        if path == settings.LIVENESS_PATH:
+            return self._liveness()
+        if path == settings.READINESS_PATH:
+            return self._readiness_response(await sync_to_async(readiness)())
+        if path == "/favicon.ico":
+            return self._favicon()
+        return await self.get_response(request)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+ASYNC_POLL_SECONDS = 0.01
+
+
+@dataclass
+class LimiterStats:
+    active: int = 0
+    waiting: int = 0
+    peak_active: int = 0
+    admitted: int = 0
+    queued: int = 0
+    shed: int = 0
+    timed_out: int = 0
+
+
+class ConcurrencyLimiter:
+    """At most ``concurrency`` requests in flight, ``queue`` more waiting.
+
+    A request that finds the queue full is rejected immediately; a queued
+    request gives up after ``timeout`` seconds. Counters are per process.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.stats = LimiterStats()
+        self._condition = threading.Condition()
+
+    def _try_admit(self) -> bool:
+        if self.stats.active < self.concurrency:
+            self.stats.active += 1
+            self.stats.admitted += 1
+            self.stats.peak_active = max(self.stats.peak_active, self.stats.active)
+            return True
+        return False
+
+    def _enqueue(self) -> bool:
+        if self.stats.waiting >= self.queue:
+            self.stats.shed += 1
+            return False
+        self.stats.waiting += 1
+        self.stats.queued += 1
+        return True
+
+    def acquire(self) -> bool:
+        with self._condition:
+            if self._try_admit():
+                return True
+            if not self._enqueue():
+                return False
+            deadline = time.monotonic() + self.timeout
+            try:
+                while True:
+                    if self._try_admit():
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timed_out += 1
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self.stats.waiting -= 1
+
+    async def aacquire(self) -> bool:
+        # Never block the event loop on the condition; poll for a free slot.
+        with self._condition:
+            if self._try_admit():
+                return True
+            if not self._enqueue():
+                return False
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                await asyncio.sleep(ASYNC_POLL_SECONDS)
+                with self._condition:
+                    if self._try_admit():
+                        return True
+                if time.monotonic() >= deadline:
+                    with self._condition:
+                        self.stats.timed_out += 1
+                    return False
+        finally:
+            with self._condition:
+                self.stats.waiting -= 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.stats.active -= 1
+            self._condition.notify()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                "concurrency": self.concurrency,
+                "queue": self.queue,
+                "timeout": self.timeout,
+                **asdict(self.stats),
+            }
+
+
+_limiters: dict[str, ConcurrencyLimiter] = {}
+
+
+def get_limiters() -> dict[str, ConcurrencyLimiter]:
+    return _limiters
+
+
+def limiter_stats() -> dict:
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
+
+
+class OverloadProtectionMiddleware:
+    """Per-route-class concurrency limits with fast 503 load shedding.
+
+    Routes are matched by path prefix from ``OVERLOAD_PROTECTION["ROUTES"]``;
+    a route class of ``None`` (health checks, event streams) is never limited.
+    Install right after the fast-path, static-file and compression middleware:
+    probes and static files are served without taking a slot, and shed
+    requests skip sessions, authentication and the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.OVERLOAD_PROTECTION
+        self.enabled = config["ENABLED"]
+        self.retry_after = config["RETRY_AFTER"]
+        self.routes = config["ROUTES"]
+        self.default_class = config["DEFAULT_CLASS"]
+        _limiters.clear()
+        for name, limits in config["CLASSES"].items():
+            _limiters[name] = ConcurrencyLimiter(name, **limits)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def route_class(self, path: str):
+        for prefix, name in self.routes:
+            if path.startswith(prefix):
+                return name
+        return self.default_class
+
+    def _limiter_for(self, request):
+        if not self.enabled:
+            return None
+        name = self.route_class(request.path_info)
+        return _limiters.get(name) if name else None
+
+    def _shed(self, limiter) -> JsonResponse:
+        response = JsonResponse(
+            {"detail": "Server is busy, please retry shortly.", "route_class": limiter.name},
+            status=503,
+        )
+        response["Retry-After"] = str(self.retry_after)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        limiter = self._limiter_for(request)
+        if limiter is None:
+            return self.get_response(request)
+        if not limiter.acquire():
+            return self._shed(limiter)
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release()
+
+    async def __acall__(self, request):
+        limiter = self._limiter_for(request)
+        if limiter is None:
+            return await self.get_response(request)
+        if not await limiter.aacquire():
+            return self._shed(limiter)
+        try:
+            return await self.get_response(request)
+        finally:
+            limiter.release()
@@ -2,30 +2,54 @@ from __future__ import annotations
 
 from typing import Optional
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from regions.cache import aget_active_region, get_active_region
 from regions.models import Region
+from regions.sharding import activate_region, deactivate_region
 
 
 class RegionMiddleware:
     """Attach region context to the request based on the subdomain."""
 
     default_region_code = "bc"
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        host = request.get_host().split(":")[0]
-        subdomain = self._get_subdomain(host)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        subdomain = self._get_subdomain(request.get_host().split(":")[0])
         region = self._get_active_region(subdomain)
-
         if region is None:
             region = self._get_active_region(self.default_region_code)
-            request.region_code = self.default_region_code
-        else:
-            request.region_code = region.code
+        self._attach(request, region)
+        token = activate_region(region)
+        try:
+            return self.get_response(request)
+        finally:
+            deactivate_region(token)
+
+    async def __acall__(self, request):
+        subdomain = self._get_subdomain(request.get_host().split(":")[0])
+        region = await self._aget_active_region(subdomain)
+        if region is None:
+            region = await self._aget_active_region(self.default_region_code)
+        self._attach(request, region)
+        token = activate_region(region)
+        try:
+            return await self.get_response(request)
+        finally:
+            deactivate_region(token)
 
+    def _attach(self, request, region: Optional[Region]) -> None:
+        request.region_code = region.code if region is not None else self.default_region_code
         request.region = region
-        return self.get_response(request)
 
     @staticmethod
     def _get_subdomain(host: str) -> Optional[str]:
@@ -36,6 +60,8 @@ class RegionMiddleware:
 
     @staticmethod
     def _get_active_region(code: Optional[str]) -> Optional[Region]:
-        if not code:
-            return None
-        return Region.objects.filter(code=code.lower(), is_active=True).first()
+        return get_active_region(code)
+
+    @staticmethod
+    async def _aget_active_region(code: Optional[str]) -> Optional[Region]:
+        return await aget_active_region(code)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotAllowed
+from django.utils.http import http_date, parse_http_date_safe
+
+from transferportal.compression import negotiate
+from transferportal.staticfiles import ENCODING_SUFFIXES
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    path: str
+    content_type: str
+    size: int
+    mtime: int
+    immutable: bool
+    # {Content-Encoding: (path, size)} for the precompressed copies on disk.
+    encodings: dict = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.size:x}-{self.mtime:x}"'
+
+
+def _hashed_names(root) -> set[str]:
+    try:
+        with open(os.path.join(root, "staticfiles.json"), encoding="utf-8") as manifest:
+            return set(json.load(manifest).get("paths", {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def scan_static_root(root) -> dict[str, StaticFile]:
+    """Index ``root`` by URL path relative to it; precompressed copies ride along."""
+    hashed = _hashed_names(root)
+    suffixes = tuple(ENCODING_SUFFIXES.values())
+    files = {}
+    for directory, _, names in os.walk(root):
+        for filename in names:
+            if filename.endswith(suffixes) or filename == "staticfiles.json":
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            stat = os.stat(path)
+            encodings = {}
+            for encoding, suffix in ENCODING_SUFFIXES.items():
+                if os.path.exists(path + suffix):
+                    encodings[encoding] = (path + suffix, os.path.getsize(path + suffix))
+            files[name] = StaticFile(
+                path=path,
+                content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                size=stat.st_size,
+                mtime=int(stat.st_mtime),
+                immutable=name in hashed,
+                encodings=encodings,
+            )
+    return files
+
+
+class StaticFilesMiddleware:
+    """Serve ``collectstatic`` output from ``STATIC_ROOT`` with long-lived caching.
+
+    Install right after ``FastPathMiddleware``: asset requests skip sessions,
+    the region lookup and overload limits. Hashed names from the manifest are
+    ``immutable`` for a year, so repeat visits never revalidate them; other
+    files get ``STATIC_MAX_AGE`` plus ``ETag``/``Last-Modified``. The brotli or
+    gzip copy is sent when the client accepts it. ``STATIC_ROOT`` is indexed
+    once at startup, so restart workers after ``collectstatic``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        root = settings.STATIC_ROOT
+        if not settings.STATIC_SERVE or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.files = scan_static_root(root)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _find(self, request):
+        path = request.path_info
+        if not path.startswith(self.prefix):
+            return None
+        return self.files.get(path[len(self.prefix):])
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        static_file = self._find(request)
+        if static_file is None:
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    async def __acall__(self, request):
+        static_file = self._find(request)
+        if static_file is None:
+            return await self.get_response(request)
+        return self.serve(request, static_file)
+
+    def serve(self, request, static_file: StaticFile):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        headers = {
+            "Cache-Control": (
+                IMMUTABLE_CACHE_CONTROL
+                if static_file.immutable
+                else f"public, max-age={settings.STATIC_MAX_AGE}"
+            ),
+            "ETag": static_file.etag,
+            "Last-Modified": http_date(static_file.mtime),
+            "X-Content-Type-Options": "nosniff",
+        }
+        if static_file.encodings:
+            headers["Vary"] = "Accept-Encoding"
+        if self._not_modified(request, static_file):
+            return HttpResponse(status=304, headers=headers)
+
+        path, size = static_file.path, static_file.size
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""), static_file.encodings)
+        if encoding is not None:
+            path, size = static_file.encodings[encoding]
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(size)
+        if request.method == "HEAD":
+            return HttpResponse(content_type=static_file.content_type, headers=headers)
+        response = FileResponse(open(path, "rb"), content_type=static_file.content_type)
+        if "Content-Disposition" in response:
+            del response["Content-Disposition"]
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    @staticmethod
+    def _not_modified(request, static_file) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return static_file.etag in tags or "*" in tags
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        return since is not None and static_file.mtime <= since
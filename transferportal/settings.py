@@ -1,6 +1,10 @@
 """Django settings for transferportal project."""
 from pathlib import Path
+import json
 import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -33,6 +37,7 @@ INSTALLED_APPS = [
     "accounts.apps.AccountsConfig",
     "availability",
     "contacts",
+    "feeds",
     "profiles",
     "organizations",
     "regions",
@@ -40,6 +45,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "transferportal.middleware.fastpath.FastPathMiddleware",
+    "transferportal.middleware.static.StaticFilesMiddleware",
+    "transferportal.middleware.compression.CompressionMiddleware",
+    "transferportal.middleware.overload.OverloadProtectionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,13 +65,23 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Compiled templates are kept per process; runserver's autoreloader
+            # resets them when a template changes.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
@@ -80,6 +99,50 @@ DATABASES = {
     }
 }
 
+# Optional region sharding, e.g. REGION_SHARDS='{"on": "shard_on"}'. Rows of
+# SHARDED_MODELS for a mapped region live in that database; unmapped regions
+# and global tables (users, profiles, regions) stay on "default". Aliases not
+# defined above get an SQLite file next to the default database.
+REGION_SHARDS = json.loads(os.getenv("REGION_SHARDS", "{}"))
+for _alias in set(REGION_SHARDS.values()) - set(DATABASES):
+    DATABASES[_alias] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / f"{_alias}.sqlite3",
+    }
+# Each shard allocates primary keys of sharded tables from its own block, so
+# rows copied between databases never reuse another region's keys: block n
+# covers n * SHARD_KEY_BLOCK_SIZE + 1 .. (n + 1) * SHARD_KEY_BLOCK_SIZE, and
+# "default" is block 0. Give every shard alias a distinct block, e.g.
+# SHARD_KEY_BLOCKS='{"shard_on": 1}'; migrate_shards applies them.
+SHARD_KEY_BLOCKS = json.loads(os.getenv("SHARD_KEY_BLOCKS", "{}"))
+SHARD_KEY_BLOCK_SIZE = 10**12
+DATABASE_ROUTERS = ["regions.sharding.RegionShardRouter"]
+SHARDED_MODELS = [
+    "organizations.Association",
+    "organizations.AssociationDomain",
+    "organizations.Team",
+    "organizations.TeamCoach",
+    "tryouts.TryoutSeries",
+    "tryouts.TryoutEvent",
+    "contacts.ContactRequest",
+    "contacts.AuditLog",
+    "availability.PlayerAvailability",
+    "availability.OpenPlayerDocument",
+    "availability.OpenPlayerDocumentAssociation",
+    "feeds.ChangeEntry",
+]
+# How sharded models without a `region` field reach their region.
+SHARDED_MODEL_REGION_PATHS = {
+    "organizations.TeamCoach": "team__region",
+    "availability.OpenPlayerDocumentAssociation": "document__region",
+}
+# Columns copied into reference stubs, per model; unlisted models copy every
+# column. Stubs are refreshed when the source row is saved, so keep this to
+# what shard queries read through joins (usernames, never passwords or emails).
+SHARD_REFERENCE_FIELDS = {
+    "auth.User": ["username", "first_name", "last_name", "is_active", "date_joined"],
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/
@@ -117,6 +180,26 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = os.getenv("STATIC_ROOT", str(BASE_DIR / "staticfiles"))
+
+# Outside DEBUG, `collectstatic` writes content-hashed names (templates must be
+# rendered after it has run), gzip/brotli copies and resized WebP images.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "transferportal.staticfiles.PortalStaticFilesStorage"
+        ),
+    },
+}
+# Widths (px) of the WebP copies generated for each image (needs Pillow).
+STATIC_RESPONSIVE_IMAGES = {"img/bc-hero.png": [480, 960, 1536]}
+# transferportal.middleware.static serves STATIC_ROOT when it exists. Hashed
+# files are cached for a year; anything else for STATIC_MAX_AGE seconds.
+STATIC_SERVE = os.getenv("STATIC_SERVE", "True").lower() == "true"
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "60"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -138,10 +221,179 @@ DEFAULT_FROM_EMAIL = os.getenv(
 )
 
 REST_FRAMEWORK = {
+    # orjson when installed, DRF's stdlib JSON otherwise. Output is identical except for
+    # floats (exponent spelling, non-finite values); see api/renderers.py.
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "api.throttling.AnonTokenBucketThrottle",
+        "api.throttling.UserTokenBucketThrottle",
+    ),
+    # Token buckets: "N/period" holds N tokens and refills N per period.
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.getenv("THROTTLE_ANON_RATE", "120/min"),
+        "user": os.getenv("THROTTLE_USER_RATE", "600/min"),
+        "search": os.getenv("THROTTLE_SEARCH_RATE", "60/min"),
+        "auth": os.getenv("THROTTLE_AUTH_RATE", "10/min"),
+        "signup": os.getenv("THROTTLE_SIGNUP_RATE", "10/hour"),
+        "resend_verification": os.getenv("THROTTLE_RESEND_RATE", "5/hour"),
+    },
 }
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}")
+CACHE_LOCATION = os.getenv(
+    "CACHE_LOCATION",
+    {
+        "locmem": "transferportal",
+        "file": os.path.join(tempfile.gettempdir(), "transferportal-cache"),
+        "redis": "redis://127.0.0.1:6379/1",
+    }[CACHE_BACKEND],
+)
+# {% cache %} fragments (rendered list rows) get their own store so their churn
+# never evicts or clears region cache entries, and vice versa.
+FRAGMENT_CACHE_LOCATION = os.getenv(
+    "FRAGMENT_CACHE_LOCATION",
+    {
+        "locmem": "transferportal-fragments",
+        "file": os.path.join(tempfile.gettempdir(), "transferportal-fragments"),
+        "redis": "redis://127.0.0.1:6379/2",
+    }[CACHE_BACKEND],
+)
+
+CACHES = {
+    # locmem is per process; use file or redis when running several workers.
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": CACHE_LOCATION,
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "transferportal"),
+    },
+    "template_fragments": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": FRAGMENT_CACHE_LOCATION,
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "transferportal") + "-fragments",
+        "OPTIONS": {"MAX_ENTRIES": 20_000} if CACHE_BACKEND != "redis" else {},
+    },
+    # Throttle buckets must be shared by every worker process on the node.
+    "throttle": {
+        "BACKEND": "api.throttling.BucketFileCache",
+        "LOCATION": os.getenv(
+            "THROTTLE_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "transferportal-throttle"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 100_000, "CULL_EVERY": 1000},
+    },
+}
+
+TEST_RUNNER = "transferportal.test_runner.TestRunner"
+
+# Region-scoped cache entries (regions.cache). Saving or deleting one of these
+# models invalidates every entry depending on it in the row's region.
+REGION_CACHE_ALIAS = "default"
+REGION_CACHE_TIMEOUT = int(os.getenv("REGION_CACHE_TIMEOUT", "300"))
+REGION_LOOKUP_CACHE_TIMEOUT = int(os.getenv("REGION_LOOKUP_CACHE_TIMEOUT", "300"))
+REGION_CACHE_MODELS = [
+    "organizations.Association",
+    "organizations.Team",
+    "tryouts.TryoutEvent",
+    "availability.PlayerAvailability",
+    "availability.OpenPlayerDocument",
+]
+
+# Warm-up (transferportal.warmup): parallel steps, the host used to render
+# public pages as "<region>.<host>" (defaults to the first ".domain" entry of
+# ALLOWED_HOSTS), and whether each worker warms at start.
+WARM_CACHES_WORKERS = int(os.getenv("WARM_CACHES_WORKERS", "4"))
+WARM_CACHES_HOST = os.getenv(
+    "WARM_CACHES_HOST",
+    next((host[1:] for host in ALLOWED_HOSTS if host.startswith(".")), "localhost"),
+)
+WARM_CACHES_ON_STARTUP = os.getenv("WARM_CACHES_ON_STARTUP", "False").lower() == "true"
+
+# Cached open-player search results and facets (seconds). Entries are also
+# invalidated whenever a searchable availability changes in the region.
+OPEN_PLAYER_SEARCH_CACHE_TIMEOUT = int(os.getenv("OPEN_PLAYER_SEARCH_CACHE_TIMEOUT", "60"))
+
+# Delta-sync cursors older than this fall back to a full snapshot, and change
+# entries past it may be pruned.
+CHANGE_FEED_RETENTION_DAYS = int(os.getenv("CHANGE_FEED_RETENTION_DAYS", "30"))
+# Change entries younger than this are not handed out yet: a transaction still
+# in flight may commit an entry with a lower id. Keep it above the longest
+# write transaction.
+CHANGE_FEED_SETTLE_SECONDS = float(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "5"))
+
+# Server-Sent Event streams (served by the async views under ASGI). One poller
+# per process, region and stream checks the change feed every
+# EVENT_STREAM_POLL_SECONDS and wakes the connections it concerns. Connections
+# close after EVENT_STREAM_MAX_SECONDS; browsers reconnect automatically and
+# resume from Last-Event-ID.
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("EVENT_STREAM_POLL_SECONDS", "2"))
+EVENT_STREAM_MAX_SECONDS = float(os.getenv("EVENT_STREAM_MAX_SECONDS", "300"))
+EVENT_STREAM_RETRY_MS = int(os.getenv("EVENT_STREAM_RETRY_MS", "3000"))
+
+# Response compression (transferportal.middleware.compression): gzip, or brotli
+# when a brotli module is installed. Bodies under MIN_SIZE bytes are sent as is.
+RESPONSE_COMPRESSION = {
+    "ENABLED": os.getenv("RESPONSE_COMPRESSION_ENABLED", "True").lower() == "true",
+    "MIN_SIZE": int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "860")),
+    "GZIP_LEVEL": int(os.getenv("RESPONSE_COMPRESSION_GZIP_LEVEL", "6")),
+    "BROTLI_QUALITY": int(os.getenv("RESPONSE_COMPRESSION_BROTLI_QUALITY", "5")),
+}
+
+# Load shedding: each route class admits `concurrency` requests per process
+# and queues up to `queue` more for `timeout` seconds; beyond that requests
+# get a 503 with Retry-After. Routes match by path prefix, first match wins;
+# a class of None is never limited (health checks, long-lived event streams).
+OVERLOAD_PROTECTION = {
+    "ENABLED": os.getenv("OVERLOAD_PROTECTION_ENABLED", "True").lower() == "true",
+    "RETRY_AFTER": int(os.getenv("OVERLOAD_RETRY_AFTER", "2")),
+    "DEFAULT_CLASS": "default",
+    "CLASSES": {
+        "search": {
+            "concurrency": int(os.getenv("OVERLOAD_SEARCH_CONCURRENCY", "4")),
+            "queue": int(os.getenv("OVERLOAD_SEARCH_QUEUE", "16")),
+            "timeout": float(os.getenv("OVERLOAD_SEARCH_TIMEOUT", "5")),
+        },
+        "default": {
+            "concurrency": int(os.getenv("OVERLOAD_DEFAULT_CONCURRENCY", "32")),
+            "queue": int(os.getenv("OVERLOAD_DEFAULT_QUEUE", "64")),
+            "timeout": float(os.getenv("OVERLOAD_DEFAULT_TIMEOUT", "10")),
+        },
+    },
+    "ROUTES": [
+        ("/api/v1/health/", None),
+        ("/coach/open-players/events/", None),
+        ("/player/requests/events/", None),
+        ("/static/", None),
+        ("/coach/open-players/", "search"),
+        ("/coach/requests/new/", "search"),
+        ("/api/v1/open-players/", "search"),
+        ("/api/v1/availability/search/", "search"),
+        ("/api/v1/feeds/", "search"),
+    ],
+}
+
+# Answered by FastPathMiddleware before any other middleware. Readiness runs
+# a `SELECT 1` at most once per READINESS_CHECK_INTERVAL seconds per process.
+LIVENESS_PATH = os.getenv("LIVENESS_PATH", "/healthz")
+READINESS_PATH = os.getenv("READINESS_PATH", "/readyz")
+READINESS_CHECK_INTERVAL = float(os.getenv("READINESS_CHECK_INTERVAL", "5"))
@@ -0,0 +1,115 @@
+"""Static files: hashed names, precompressed copies and responsive images.
+
+``collectstatic`` with ``PortalStaticFilesStorage`` writes every file under a
+content-hashed name listed in ``staticfiles.json``, WebP copies of
+``STATIC_RESPONSIVE_IMAGES`` at each configured width (when Pillow is
+installed), and ``.gz`` / ``.br`` (when brotli is available) copies of text
+assets. ``transferportal.middleware.static`` serves the result.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+
+from transferportal.compression import brotli
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".html", ".xml", ".ico"}
+MIN_COMPRESS_SIZE = 256
+# Suffix of the precompressed copy for each Content-Encoding, preferred first.
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+WEBP_QUALITY = 80
+
+
+def responsive_name(name: str, width: int) -> str:
+    return f"{os.path.splitext(name)[0]}-{width}w.webp"
+
+
+def compressed_variants(data: bytes) -> dict[str, bytes]:
+    """``{suffix: payload}`` for the encodings that actually shrink ``data``."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return {suffix: payload for suffix, payload in variants.items() if len(payload) < len(data) * 0.95}
+
+
+class PortalStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run=dry_run, **options)
+            return
+        # Resized copies are written first so they are hashed and listed in the
+        # manifest like any other file.
+        for name in self._write_responsive_images(paths):
+            yield name, name, True
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        for name in self._write_compressed({*paths, *self.hashed_files.values()}):
+            yield name, name, True
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
+
+    def _write_responsive_images(self, paths):
+        images = {name: widths for name, widths in settings.STATIC_RESPONSIVE_IMAGES.items() if name in paths}
+        if not images:
+            return []
+        try:
+            from PIL import Image
+        except ImportError:
+            return []
+        written = []
+        for name, widths in images.items():
+            storage, path = paths[name]
+            with storage.open(path) as source, Image.open(source) as image:
+                image.load()
+                for width in widths:
+                    if width > image.width:
+                        continue
+                    height = round(image.height * width / image.width)
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    resized.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+                    variant = responsive_name(name, width)
+                    self._replace(variant, buffer.getvalue())
+                    paths[variant] = (self, variant)
+                    written.append(variant)
+        return written
+
+    def _write_compressed(self, names):
+        written = []
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+                continue
+            with self.open(name) as source:
+                data = source.read()
+            if len(data) < MIN_COMPRESS_SIZE:
+                continue
+            for suffix, payload in compressed_variants(data).items():
+                self._replace(name + suffix, payload)
+                written.append(name + suffix)
+        return written
+
+
+@lru_cache(maxsize=None)
+def responsive_image(name: str) -> dict:
+    """``src`` and ``srcset`` for an image listed in ``STATIC_RESPONSIVE_IMAGES``.
+
+    ``srcset`` is empty until ``collectstatic`` has produced the resized
+    copies (not in development, nor when Pillow was missing).
+    """
+    widths = [
+        width
+        for width in settings.STATIC_RESPONSIVE_IMAGES.get(name, [])
+        if staticfiles_storage.exists(responsive_name(name, width))
+    ]
+    return {
+        "src": staticfiles_storage.url(name),
+        "srcset": ", ".join(f"{staticfiles_storage.url(responsive_name(name, width))} {width}w" for width in widths),
+    }
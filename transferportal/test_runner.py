@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+import unittest
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+THROTTLE_DIR_PREFIX = "transferportal-throttle-test-"
+# Extra in-memory database for tests that run the shard commands; it is only
+# created when a test case lists it in ``databases``.
+SHARD_TEST_ALIAS = "shard_test"
+
+
+def clearing_result_class(base):
+    class CacheClearingResult(base):
+        """Empty the default and template fragment caches before each test.
+
+        Cached entries outlive the per-test rollback, so without this a test
+        could be served rows another test created.
+        """
+
+        def startTest(self, test):
+            caches["default"].clear()
+            caches["template_fragments"].clear()
+            super().startTest(test)
+
+    return CacheClearingResult
+
+
+class TestRunner(DiscoverRunner):
+    """Keep throttle buckets in a private directory for the run (the configured
+    one is shared with any server on the host), add a spare shard database and
+    empty the default and fragment caches before every test."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        if SHARD_TEST_ALIAS not in connections.settings:
+            shard = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+            connections.settings.update(connections.configure_settings({**connections.settings, SHARD_TEST_ALIAS: shard}))
+        self._throttle_dir = tempfile.mkdtemp(prefix=THROTTLE_DIR_PREFIX)
+        throttle = {**settings.CACHES["throttle"], "LOCATION": self._throttle_dir}
+        self._throttle_settings = override_settings(CACHES={**settings.CACHES, "throttle": throttle})
+        self._throttle_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._throttle_settings.disable()
+        shutil.rmtree(self._throttle_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+    def get_resultclass(self):
+        return clearing_result_class(super().get_resultclass() or unittest.TextTestResult)
@@ -3,6 +3,7 @@ from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 from accounts import views as account_views
+from feeds import web_views as feed_views
 from organizations import web_views as organization_views
 from tryouts import web_views as tryout_views
 
@@ -27,6 +28,7 @@ urlpatterns = [
         name="player_availability_commit",
     ),
     path("player/requests/", account_views.player_requests, name="player_requests"),
+    path("player/requests/events/", feed_views.player_request_events, name="player_request_events"),
     path(
         "player/requests/<int:request_id>/respond/",
         account_views.player_request_respond,
@@ -35,6 +37,11 @@ urlpatterns = [
     path("coach/", account_views.coach_dashboard, name="coach_dashboard"),
     path("coach/teams/", account_views.coach_teams, name="coach_teams"),
     path("coach/open-players/", account_views.coach_open_players, name="coach_open_players"),
+    path(
+        "coach/open-players/events/",
+        feed_views.coach_open_player_events,
+        name="coach_open_player_events",
+    ),
     path(
         "coach/open-players/<int:player_id>/",
         account_views.coach_open_player_detail,
@@ -44,6 +51,11 @@ urlpatterns = [
     path("coach/requests/new/", account_views.coach_request_new, name="coach_request_new"),
     path("coach/tryouts/", tryout_views.coach_tryout_list, name="coach_tryout_list"),
     path("coach/tryouts/new/", tryout_views.coach_tryout_create, name="coach_tryout_create"),
+    path(
+        "coach/tryouts/series/new/",
+        tryout_views.coach_tryout_series_create,
+        name="coach_tryout_series_create",
+    ),
     path(
         "coach/tryouts/<int:tryout_id>/edit/",
         tryout_views.coach_tryout_edit,
@@ -63,6 +75,11 @@ urlpatterns = [
         account_views.resend_verification,
         name="resend_verification",
     ),
+    path(
+        "accounts/invitation/<str:uidb64>/<str:token>/",
+        account_views.accept_invitation,
+        name="accept_invitation",
+    ),
     path(
         "accounts/login/",
         auth_views.LoginView.as_view(template_name="registration/login.html"),
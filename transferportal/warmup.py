@@ -0,0 +1,124 @@
+"""Preload region caches so the first visitors after a deploy don't pay for them."""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.db import connections
+from django.http.request import validate_host
+from django.test import RequestFactory
+from django.urls import reverse
+
+from organizations.directory import association_directory
+from regions.cache import get_active_region
+from regions.models import Region
+from regions.sharding import region_context
+from tryouts.directory import association_tryouts, tryout_facets
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupResult:
+    region: str
+    step: str
+    seconds: float
+    error: str = ""
+
+
+def _warm_lookup(region):
+    get_active_region(region.code)
+
+
+def _warm_directories(region):
+    for association in association_directory(region):
+        association_tryouts(region, association.id)
+
+
+def _warm_facets(region):
+    tryout_facets(region)
+
+
+def _warm_pages(region):
+    """Render the public pages through the full middleware stack as an anonymous visitor."""
+    host = f"{region.code}.{settings.WARM_CACHES_HOST}"
+    if not validate_host(host, settings.ALLOWED_HOSTS):
+        raise RuntimeError(f"{host} is not in ALLOWED_HOSTS; set WARM_CACHES_HOST")
+    handler = BaseHandler()
+    handler.load_middleware()
+    factory = RequestFactory(HTTP_HOST=host)
+    paths = [reverse("home"), reverse("tryout_list")]
+    paths.extend(
+        reverse("association_detail", args=[association.id])
+        for association in association_directory(region)
+    )
+    failed = []
+    for path in paths:
+        response = handler.get_response(factory.get(path, secure=settings.SECURE_SSL_REDIRECT))
+        if response.status_code != 200:
+            failed.append(f"{path} -> {response.status_code}")
+    if failed:
+        raise RuntimeError(", ".join(failed))
+
+
+WARMUP_STEPS = {
+    "lookup": _warm_lookup,
+    "directories": _warm_directories,
+    "facets": _warm_facets,
+    "pages": _warm_pages,
+}
+
+
+def _run_step(region, step, close_connections) -> WarmupResult:
+    started = time.perf_counter()
+    error = ""
+    try:
+        with region_context(region):
+            WARMUP_STEPS[step](region)
+    except Exception as exc:  # A failed step must not abort the rest of the warm-up.
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        if close_connections:
+            connections.close_all()
+    return WarmupResult(region.code, step, time.perf_counter() - started, error)
+
+
+def warm_caches(regions=None, steps=None, workers=None) -> list[WarmupResult]:
+    """Run every step for every active region, ``workers`` at a time.
+
+    With a single worker the steps run in the calling thread.
+    """
+    if regions is None:
+        regions = list(Region.objects.filter(is_active=True))
+    steps = list(steps or WARMUP_STEPS)
+    workers = settings.WARM_CACHES_WORKERS if workers is None else workers
+    tasks = [(region, step) for region in regions for step in steps]
+    if workers <= 1:
+        return [_run_step(region, step, False) for region, step in tasks]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warm-caches") as executor:
+        return list(executor.map(lambda task: _run_step(*task, True), tasks))
+
+
+def warm_on_startup() -> None:
+    """Post-start hook for wsgi/asgi; does nothing unless WARM_CACHES_ON_STARTUP is set."""
+    if not settings.WARM_CACHES_ON_STARTUP:
+        return
+    started = time.perf_counter()
+    try:
+        results = warm_caches()
+    except Exception:  # Runs at wsgi/asgi import; a cold cache beats a worker that won't boot.
+        logger.exception("Cache warm-up skipped")
+        return
+    failed = [result for result in results if result.error]
+    for result in failed:
+        logger.warning("Cache warm-up %s/%s failed: %s", result.region, result.step, result.error)
+    logger.info(
+        "Warmed caches: %d steps in %.2fs, %d failed",
+        len(results),
+        time.perf_counter() - started,
+        len(failed),
+    )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from tryouts.models import TryoutEvent
+from tryouts.models import TryoutEvent, TryoutSeries
 
 
 @admin.register(TryoutEvent)
@@ -8,3 +8,16 @@ class TryoutEventAdmin(admin.ModelAdmin):
     list_display = ("name", "region", "association", "team", "start_date", "is_active")
     list_filter = ("region", "association", "is_active")
     search_fields = ("name", "location")
+    raw_id_fields = ("series",)
+
+
+@admin.register(TryoutSeries)
+class TryoutSeriesAdmin(admin.ModelAdmin):
+    list_display = ("name", "region", "association", "team", "first_date", "last_date")
+    list_filter = ("region", "association")
+    search_fields = ("name", "location")
+    readonly_fields = ("created_by",)
+
+    def has_add_permission(self, request):
+        # Series are scheduled through the coach pages or the API, which create the events.
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TryoutsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tryouts"
+
+    def ready(self) -> None:
+        from tryouts import signals  # noqa: F401
@@ -0,0 +1,39 @@
+from api.pagination import Keyset
+from organizations.models import Team
+from regions.cache import cached_for_region
+from tryouts.models import TryoutEvent
+
+# Shared by the tryout pages and the API, so their cursors are interchangeable.
+TRYOUT_KEYSET = Keyset("start_date", "name", "id")
+
+
+def tryout_facets(region) -> dict:
+    """Age groups and team levels offered by a region's active tryouts."""
+
+    def compute():
+        tryouts = TryoutEvent.objects.filter(region=region, is_active=True)
+        age_groups = tryouts.exclude(age_group="").order_by().values_list("age_group", flat=True).distinct()
+        levels = (
+            tryouts.filter(team__isnull=False)
+            .exclude(team__level="")
+            .order_by()
+            .values_list("team__level", flat=True)
+            .distinct()
+        )
+        return {"age_groups": sorted(age_groups), "levels": sorted(levels)}
+
+    return cached_for_region(region, "tryout-facets", compute, depends_on=[TryoutEvent, Team])
+
+
+def association_tryouts(region, association_id) -> list[TryoutEvent]:
+    return cached_for_region(
+        region,
+        "association-tryouts",
+        lambda: list(
+            TryoutEvent.objects.filter(region=region, association_id=association_id, is_active=True)
+            .select_related("team")
+            .order_by("start_date", "name")
+        ),
+        depends_on=[TryoutEvent, Team],
+        parts=[association_id],
+    )
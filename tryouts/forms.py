@@ -1,6 +1,6 @@
 from django import forms
 
-from tryouts.models import TryoutEvent
+from tryouts.models import TryoutEvent, TryoutSeries
 
 
 class TryoutEventForm(forms.ModelForm):
@@ -41,3 +41,43 @@ class TryoutEventForm(forms.ModelForm):
         if start_date and end_date and end_date < start_date:
             self.add_error("end_date", "End date cannot be earlier than start date.")
         return cleaned_data
+
+
+class TryoutSeriesForm(forms.ModelForm):
+    weekdays = forms.TypedMultipleChoiceField(
+        choices=TryoutSeries.Weekdays.choices,
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+    )
+
+    class Meta:
+        model = TryoutSeries
+        fields = [
+            "team",
+            "name",
+            "weekdays",
+            "first_date",
+            "last_date",
+            "location",
+            "registration_url",
+            "notes",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        team_queryset = kwargs.pop("team_queryset", None)
+        super().__init__(*args, **kwargs)
+        self.fields["team"].required = True
+        if team_queryset is not None:
+            self.fields["team"].queryset = team_queryset
+
+        for field_name in self.fields:
+            field = self.fields[field_name]
+            if isinstance(field.widget, (forms.TextInput, forms.URLInput, forms.DateInput)):
+                field.widget.attrs.setdefault("class", "form-control")
+            if isinstance(field.widget, forms.Select):
+                field.widget.attrs.setdefault("class", "form-select")
+            if isinstance(field.widget, forms.Textarea):
+                field.widget.attrs.setdefault("class", "form-control")
+
+        self.fields["first_date"].widget.attrs.setdefault("type", "date")
+        self.fields["last_date"].widget.attrs.setdefault("type", "date")
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+def backfill_age_groups(apps, schema_editor):
+    TryoutEvent = apps.get_model("tryouts", "TryoutEvent")
+    Team = apps.get_model("organizations", "Team")
+    TryoutEvent.objects.filter(team__isnull=False).update(
+        age_group=models.Subquery(Team.objects.filter(pk=models.OuterRef("team_id")).values("age_group")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_alter_association_logo_url'),
+        ('regions', '0003_region_season_rules'),
+        ('tryouts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tryoutevent',
+            name='age_group',
+            field=models.CharField(blank=True, editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='tryoutevent',
+            index=models.Index(fields=['region', 'age_group', 'start_date'], name='tryout_region_age_group'),
+        ),
+        migrations.RunPython(backfill_age_groups, migrations.RunPython.noop),
+    ]
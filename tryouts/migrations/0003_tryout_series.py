@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0007_association_domain_index'),
+        ('regions', '0003_region_season_rules'),
+        ('tryouts', '0002_tryoutevent_age_group'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TryoutSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('weekdays', models.JSONField(default=list)),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('location', models.TextField()),
+                ('registration_url', models.URLField()),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('association', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tryout_series', to='organizations.association')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tryout_series', to=settings.AUTH_USER_MODEL)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tryout_series', to='regions.region')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tryout_series', to='organizations.team')),
+            ],
+            options={
+                'verbose_name_plural': 'tryout series',
+                'ordering': ['first_date', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='tryoutevent',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='tryouts.tryoutseries'),
+        ),
+    ]
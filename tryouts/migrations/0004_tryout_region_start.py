@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0007_association_domain_index'),
+        ('regions', '0003_region_season_rules'),
+        ('tryouts', '0003_tryout_series'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tryoutevent',
+            index=models.Index(fields=['region', 'start_date', 'name', 'id'], name='tryout_region_start'),
+        ),
+    ]
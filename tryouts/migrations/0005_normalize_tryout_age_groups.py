@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-19 13:10
+
+from django.db import migrations
+from django.db.models.functions import Trim, Upper
+
+
+def normalize_age_groups(apps, schema_editor):
+    TryoutEvent = apps.get_model("tryouts", "TryoutEvent")
+    normalized = Upper(Trim("age_group"))
+    TryoutEvent.objects.using(schema_editor.connection.alias).exclude(age_group=normalized).update(age_group=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0008_normalize_team_age_groups'),
+        ('tryouts', '0004_tryout_region_start'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_age_groups, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,103 @@
-from django.core.exceptions import ValidationError
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
 
 from organizations.models import Association, Team
+from regions.consistency import RegionConsistentModel, RegionConsistentQuerySet
 from regions.models import Region
 
 
-class TryoutEvent(models.Model):
+class TryoutSeries(RegionConsistentModel):
+    """Recurring tryouts, e.g. every Saturday in March; each date is its own TryoutEvent."""
+
+    MAX_OCCURRENCES = 60
+
+    class Weekdays(models.IntegerChoices):
+        MONDAY = 0, "Monday"
+        TUESDAY = 1, "Tuesday"
+        WEDNESDAY = 2, "Wednesday"
+        THURSDAY = 3, "Thursday"
+        FRIDAY = 4, "Friday"
+        SATURDAY = 5, "Saturday"
+        SUNDAY = 6, "Sunday"
+
+    region = models.ForeignKey(Region, on_delete=models.PROTECT, related_name="tryout_series")
+    association = models.ForeignKey(Association, on_delete=models.PROTECT, related_name="tryout_series")
+    team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="tryout_series", null=True, blank=True)
+    name = models.CharField(max_length=200)
+    weekdays = models.JSONField(default=list)
+    first_date = models.DateField()
+    last_date = models.DateField()
+    location = models.TextField()
+    registration_url = models.URLField()
+    notes = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="tryout_series",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    region_checks = {
+        "association": ("region", "Series region must match association region."),
+        "team": ("team", "Team region must match series region."),
+    }
+
+    class Meta:
+        ordering = ["first_date", "name"]
+        verbose_name_plural = "tryout series"
+
+    def dates(self):
+        weekdays = set(self.weekdays)
+        day = self.first_date
+        while day <= self.last_date:
+            if day.weekday() in weekdays:
+                yield day
+            day += timedelta(days=1)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class TryoutEventQuerySet(RegionConsistentQuerySet):
+    def _attach_teams(self, objs):
+        """Load missing teams in one query and refresh each row's age group."""
+        team_field = TryoutEvent._meta.get_field("team")
+        missing = {obj.team_id for obj in objs if obj.team_id and not team_field.is_cached(obj)}
+        teams = Team._base_manager.using(self.db).in_bulk(missing) if missing else {}
+        for obj in objs:
+            if obj.team_id in teams:
+                obj.team = teams[obj.team_id]
+            obj.age_group = obj.team.age_group if obj.team_id else ""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self._attach_teams(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if {"team", "team_id"} & set(fields):
+            self._attach_teams(objs)
+            fields = [*fields, "age_group"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class TryoutEvent(RegionConsistentModel):
     region = models.ForeignKey(Region, on_delete=models.PROTECT, related_name="tryouts")
     association = models.ForeignKey(Association, on_delete=models.PROTECT, related_name="tryouts")
     team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="tryouts", null=True, blank=True)
+    series = models.ForeignKey(
+        TryoutSeries,
+        on_delete=models.SET_NULL,
+        related_name="events",
+        null=True,
+        blank=True,
+    )
+    age_group = models.CharField(max_length=10, blank=True, editable=False)
     name = models.CharField(max_length=200)
     start_date = models.DateField()
     end_date = models.DateField()
@@ -19,17 +108,27 @@ class TryoutEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TryoutEventQuerySet.as_manager()
+
+    region_checks = {
+        "association": ("region", "Tryout region must match association region."),
+        "team": ("team", "Team region must match tryout region."),
+    }
+
     class Meta:
         ordering = ["start_date", "name"]
-
-    def clean(self):
-        if self.association_id and self.region_id and self.association.region_id != self.region_id:
-            raise ValidationError({"region": "Tryout region must match association region."})
-        if self.team_id and self.region_id and self.team.region_id != self.region_id:
-            raise ValidationError({"team": "Team region must match tryout region."})
+        indexes = [
+            models.Index(fields=["region", "age_group", "start_date"], name="tryout_region_age_group"),
+            models.Index(fields=["region", "start_date", "name", "id"], name="tryout_region_start"),
+        ]
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"team", "team_id"} & set(update_fields):
+            # Loads the team first, so the region check reuses it.
+            self.age_group = self.team.age_group if self.team_id else ""
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "age_group"}
         return super().save(*args, **kwargs)
 
     def __str__(self) -> str:
@@ -5,6 +5,18 @@ from organizations.models import TeamCoach
 from regions.utils import get_request_region
 
 
+def posted_team_ids(data) -> set[int]:
+    """Team ids a create request writes to; empty if any row lacks a valid one."""
+    rows = data.get("tryouts") if isinstance(data.get("tryouts"), list) else [data]
+    team_ids = set()
+    for row in rows:
+        try:
+            team_ids.add(int(row.get("team")))
+        except (AttributeError, TypeError, ValueError):
+            return set()
+    return team_ids
+
+
 class TryoutWritePermission(BasePermission):
     def has_permission(self, request, view) -> bool:
         if request.method in SAFE_METHODS:
@@ -15,18 +27,19 @@ class TryoutWritePermission(BasePermission):
             return False
 
         if request.method == "POST":
-            team_id = request.data.get("team")
-            if not team_id:
+            team_ids = posted_team_ids(request.data)
+            if not team_ids:
                 return False
             region = get_request_region(request)
             if region is None:
                 return False
-            return TeamCoach.objects.filter(
+            coached = TeamCoach.objects.filter(
                 user=request.user,
-                team_id=team_id,
+                team_id__in=team_ids,
                 team__region=region,
                 is_active=True,
-            ).exists()
+            )
+            return coached.values("team_id").distinct().count() == len(team_ids)
         return True
 
     def has_object_permission(self, request, view, obj) -> bool:
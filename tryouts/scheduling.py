@@ -0,0 +1,130 @@
+"""Batch creation of tryouts, one-off or as a recurring series.
+
+A batch is validated against one query for its teams and one for its
+associations, inserted with ``bulk_create`` and audited with a single entry.
+``bulk_create`` skips ``TryoutEvent``'s signals, so the change feed and cache
+version are handled here; the queryset fills in age groups and checks regions
+against the already-loaded teams and associations.
+"""
+from django.db import router, transaction
+
+from contacts.models import AuditLog
+from feeds.changes import record_changes
+from feeds.models import ChangeEntry
+from organizations.models import Association, Team
+from regions.cache import bump_version
+from regions.sharding import bulk_create_with_references
+from tryouts.models import TryoutEvent, TryoutSeries
+
+MAX_BATCH_SIZE = 200
+EVENT_FIELDS = ("name", "start_date", "end_date", "location", "registration_url", "notes")
+
+
+def _pk(value):
+    return getattr(value, "pk", value)
+
+
+def build_tryouts(region, rows, *, allow_without_team=False):
+    """Unsaved events for ``rows`` plus one error dict per row (empty when valid).
+
+    Rows are dicts with ``team`` and ``association`` as ids or instances and the
+    event's own fields. Teams and associations outside ``region`` are treated as
+    unknown.
+    """
+    team_ids = {_pk(row.get("team")) for row in rows} - {None}
+    association_ids = {_pk(row.get("association")) for row in rows} - {None}
+    teams = (
+        Team.objects.filter(region=region, pk__in=team_ids).select_related("association").in_bulk()
+        if team_ids
+        else {}
+    )
+    associations = (
+        Association.objects.filter(region=region, pk__in=association_ids).in_bulk() if association_ids else {}
+    )
+
+    events, errors = [], []
+    for row in rows:
+        row_errors = {}
+        team = teams.get(_pk(row.get("team")))
+        association = associations.get(_pk(row.get("association")))
+        if row.get("team") is not None and team is None:
+            row_errors["team"] = "Team must belong to the current region."
+        elif team is None and not allow_without_team:
+            row_errors["team"] = "Team is required."
+        elif team is None and association is None:
+            if row.get("association") is None:
+                row_errors["association"] = "Association is required."
+            else:
+                row_errors["association"] = "Association must belong to the current region."
+        if row.get("start_date") and row.get("end_date") and row["end_date"] < row["start_date"]:
+            row_errors["end_date"] = "End date cannot be earlier than start date."
+        errors.append(row_errors)
+        if row_errors:
+            continue
+        events.append(TryoutEvent(
+            region=region,
+            association=team.association if team else association,
+            team=team,
+            series=row.get("series"),
+            is_active=True,
+            **{name: row.get(name, "") for name in EVENT_FIELDS},
+        ))
+    return events, errors
+
+
+def series_errors(series) -> dict:
+    errors = {}
+    weekdays = set(series.weekdays or [])
+    if not weekdays or not weekdays <= set(TryoutSeries.Weekdays.values):
+        errors["weekdays"] = "Choose at least one day of the week."
+    if series.last_date < series.first_date:
+        errors["last_date"] = "Last date cannot be earlier than first date."
+    elif not errors:
+        count = sum(1 for _ in series.dates())
+        if count == 0:
+            errors["weekdays"] = "None of these days fall between the first and last date."
+        elif count > TryoutSeries.MAX_OCCURRENCES:
+            errors["last_date"] = f"A series can have at most {TryoutSeries.MAX_OCCURRENCES} tryouts."
+    return errors
+
+
+def series_rows(series) -> list[dict]:
+    return [
+        {
+            "team": series.team,
+            "association": series.association_id,
+            "series": series,
+            "name": series.name,
+            "start_date": day,
+            "end_date": day,
+            "location": series.location,
+            "registration_url": series.registration_url,
+            "notes": series.notes,
+        }
+        for day in series.dates()
+    ]
+
+
+def save_tryouts(region, events, actor, *, series=None):
+    """Insert ``events`` (and ``series`` first, if given) with one audit entry."""
+    if not events:
+        return events
+    with transaction.atomic(using=router.db_for_write(TryoutEvent)):
+        if series is not None:
+            series.save()
+            for event in events:
+                event.series = series
+        bulk_create_with_references(TryoutEvent, events)
+        tryout_ids = [event.pk for event in events]
+        target = series if series is not None else events[0]
+        AuditLog.objects.create(
+            actor=actor,
+            action="TRYOUT_SERIES_CREATED" if series is not None else "TRYOUTS_CREATED",
+            target_type=target.__class__.__name__,
+            target_id=target.pk,
+            region=region,
+            metadata={"tryout_ids": tryout_ids},
+        )
+        record_changes(region.id, ChangeEntry.Streams.TRYOUTS, tryout_ids)
+        bump_version(region, TryoutEvent)
+    return events
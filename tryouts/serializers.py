@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from tryouts.models import TryoutEvent
+from tryouts.models import TryoutEvent, TryoutSeries
+from tryouts.scheduling import MAX_BATCH_SIZE
 
 
 class TryoutEventSerializer(serializers.ModelSerializer):
@@ -11,6 +12,7 @@ class TryoutEventSerializer(serializers.ModelSerializer):
             "region",
             "association",
             "team",
+            "series",
             "name",
             "start_date",
             "end_date",
@@ -21,7 +23,55 @@ class TryoutEventSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("id", "created_at", "updated_at", "region")
+        read_only_fields = ("id", "created_at", "updated_at", "region", "series")
+        extra_kwargs = {
+            "association": {"required": False, "allow_null": True},
+            "team": {"required": False, "allow_null": True},
+        }
+
+
+class TryoutBulkItemSerializer(serializers.Serializer):
+    """One row of a bulk create; ids stay plain integers so the batch is resolved in one query."""
+
+    team = serializers.IntegerField(required=False, allow_null=True)
+    association = serializers.IntegerField(required=False, allow_null=True)
+    name = serializers.CharField(max_length=200)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    location = serializers.CharField()
+    registration_url = serializers.URLField()
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class TryoutBulkCreateSerializer(serializers.Serializer):
+    tryouts = TryoutBulkItemSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+
+
+class TryoutSeriesSerializer(serializers.ModelSerializer):
+    weekdays = serializers.ListField(
+        child=serializers.ChoiceField(choices=TryoutSeries.Weekdays.choices),
+        allow_empty=False,
+    )
+    events = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = TryoutSeries
+        fields = (
+            "id",
+            "region",
+            "association",
+            "team",
+            "name",
+            "weekdays",
+            "first_date",
+            "last_date",
+            "location",
+            "registration_url",
+            "notes",
+            "events",
+            "created_at",
+        )
+        read_only_fields = ("id", "region", "events", "created_at")
         extra_kwargs = {
             "association": {"required": False, "allow_null": True},
             "team": {"required": False, "allow_null": True},
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from organizations.models import Team
+from tryouts.models import TryoutEvent
+
+
+@receiver(post_save, sender=Team)
+def sync_tryout_age_groups(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    TryoutEvent.objects.filter(team=instance).exclude(age_group=instance.age_group).update(
+        age_group=instance.age_group,
+    )
@@ -2,14 +2,19 @@ from datetime import date
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from accounts.models import AccountProfile
 from contacts.models import AuditLog
+from feeds.models import ChangeEntry
 from organizations.models import Association, Team, TeamCoach
+from profiles.models import PlayerProfile
+from regions.age_groups import season_year
 from regions.models import Region
-from tryouts.models import TryoutEvent
+from tryouts.models import TryoutEvent, TryoutSeries
 
 
 User = get_user_model()
@@ -191,6 +196,43 @@ class TryoutApiTests(TestCase):
         names = [item["name"] for item in response.data]
         self.assertEqual(names, ["15U Tryout"])
 
+    def test_age_group_labels_are_case_insensitive(self):
+        bc = Region.objects.get(code="bc")
+        assoc_bc = Association.objects.create(region=bc, name="BC Assoc")
+        team = Team.objects.create(region=bc, association=assoc_bc, name="Team 13U", age_group=" 13u")
+        self.assertEqual(team.age_group, "13U")
+        self._create_tryout(region=bc, association=assoc_bc, team=team, name="13U Tryout")
+
+        response = self.client.get("/api/v1/tryouts/?age_group=13u", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual([item["name"] for item in response.data], ["13U Tryout"])
+
+    def test_tryout_api_filters_by_player_age_group(self):
+        bc = Region.objects.get(code="bc")
+        assoc_bc = Association.objects.create(region=bc, name="BC Assoc")
+        team_13 = Team.objects.create(region=bc, association=assoc_bc, name="Team 13U", age_group="13U")
+        team_15 = Team.objects.create(region=bc, association=assoc_bc, name="Team 15U", age_group="15U")
+        self._create_tryout(region=bc, association=assoc_bc, team=team_13, name="13U Tryout")
+        self._create_tryout(region=bc, association=assoc_bc, team=team_15, name="15U Tryout")
+        player = User.objects.create_user(username="player1", password="testpass")
+        PlayerProfile.objects.create(user=player, birth_year=season_year(bc) - 13)
+
+        self.client.force_authenticate(user=player)
+        response = self.client.get("/api/v1/tryouts/?age_group=mine", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.data], ["13U Tryout"])
+
+    def test_tryout_age_group_follows_team(self):
+        bc = Region.objects.get(code="bc")
+        assoc_bc = Association.objects.create(region=bc, name="BC Assoc")
+        team = Team.objects.create(region=bc, association=assoc_bc, name="Team", age_group="13U")
+        tryout = self._create_tryout(region=bc, association=assoc_bc, team=team)
+        self.assertEqual(tryout.age_group, "13U")
+
+        team.age_group = "15U"
+        team.save()
+        tryout.refresh_from_db()
+        self.assertEqual(tryout.age_group, "15U")
+
     def test_tryout_cancel_sets_inactive(self):
         bc = Region.objects.get(code="bc")
         assoc_bc = Association.objects.create(region=bc, name="BC Assoc")
@@ -213,6 +255,136 @@ class TryoutApiTests(TestCase):
         self.assertTrue(AuditLog.objects.filter(action="TRYOUT_CANCELED", target_id=tryout.id).exists())
 
 
+class TryoutBatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bc = Region.objects.get(code="bc")
+        self.assoc = Association.objects.create(region=self.bc, name="BC Assoc")
+        self.team = Team.objects.create(region=self.bc, association=self.assoc, name="BC Team", age_group="13U")
+        self.other_team = Team.objects.create(region=self.bc, association=self.assoc, name="Other", age_group="15U")
+        self.coach = User.objects.create_user(username="coach_batch", password="testpass")
+        self.coach.profile.role = AccountProfile.Roles.COACH
+        self.coach.profile.is_coach_approved = True
+        self.coach.profile.save()
+        TeamCoach.objects.create(user=self.coach, team=self.team, is_active=True)
+        self.client.force_authenticate(user=self.coach)
+
+    def _row(self, team, **kwargs):
+        return {
+            "team": team.id,
+            "name": kwargs.get("name", "Batch Tryout"),
+            "start_date": kwargs.get("start_date", "2025-03-01"),
+            "end_date": kwargs.get("end_date", "2025-03-01"),
+            "location": "Field 1",
+            "registration_url": "https://example.com",
+        }
+
+    def test_bulk_create_inserts_batch_with_one_audit_entry(self):
+        rows = [self._row(self.team, name=f"Day {day}", start_date=f"2025-03-0{day}", end_date=f"2025-03-0{day}")
+                for day in range(1, 6)]
+        # Region, coach check, teams, savepoint, one insert each for events,
+        # audit and change feed, release; independent of the batch size.
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                "/api/v1/tryouts/bulk/", {"tryouts": rows}, format="json", HTTP_HOST="bc.localhost:8000"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 5)
+        tryouts = TryoutEvent.objects.filter(team=self.team)
+        self.assertEqual(tryouts.count(), 5)
+        self.assertEqual(set(tryouts.values_list("age_group", flat=True)), {"13U"})
+        self.assertEqual(set(tryouts.values_list("association_id", flat=True)), {self.assoc.id})
+        log = AuditLog.objects.get(action="TRYOUTS_CREATED")
+        self.assertEqual(sorted(log.metadata["tryout_ids"]), sorted(tryouts.values_list("id", flat=True)))
+        self.assertEqual(
+            ChangeEntry.objects.filter(stream=ChangeEntry.Streams.TRYOUTS, object_id__in=log.metadata["tryout_ids"]).count(),
+            5,
+        )
+
+    def test_bulk_create_rejects_unassigned_team_and_bad_rows(self):
+        response = self.client.post(
+            "/api/v1/tryouts/bulk/",
+            {"tryouts": [self._row(self.team), self._row(self.other_team)]},
+            format="json",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post(
+            "/api/v1/tryouts/bulk/",
+            {"tryouts": [self._row(self.team), self._row(self.team, end_date="2025-02-01")]},
+            format="json",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["tryouts"][0], {})
+        self.assertIn("end_date", response.data["tryouts"][1])
+        self.assertFalse(TryoutEvent.objects.exists())
+
+    def test_series_creates_one_event_per_matching_day(self):
+        response = self.client.post(
+            "/api/v1/tryout-series/",
+            {
+                "team": self.team.id,
+                "name": "March Saturdays",
+                "weekdays": [TryoutSeries.Weekdays.SATURDAY],
+                "first_date": "2025-03-01",
+                "last_date": "2025-03-31",
+                "location": "Fields 1-3",
+                "registration_url": "https://example.com",
+            },
+            format="json",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 201)
+        series = TryoutSeries.objects.get(pk=response.data["id"])
+        self.assertEqual(series.association, self.assoc)
+        self.assertEqual(
+            list(series.events.order_by("start_date").values_list("start_date", flat=True)),
+            [date(2025, 3, day) for day in (1, 8, 15, 22, 29)],
+        )
+        self.assertEqual(sorted(response.data["events"]), sorted(series.events.values_list("id", flat=True)))
+        self.assertEqual(AuditLog.objects.filter(action="TRYOUT_SERIES_CREATED", target_id=series.id).count(), 1)
+        self.assertFalse(AuditLog.objects.filter(action="TRYOUT_CREATED").exists())
+
+    def test_series_without_matching_days_is_rejected(self):
+        response = self.client.post(
+            "/api/v1/tryout-series/",
+            {
+                "team": self.team.id,
+                "name": "Nothing",
+                "weekdays": [TryoutSeries.Weekdays.SUNDAY],
+                "first_date": "2025-03-03",
+                "last_date": "2025-03-07",
+                "location": "Field",
+                "registration_url": "https://example.com",
+            },
+            format="json",
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("weekdays", response.data)
+        self.assertFalse(TryoutSeries.objects.exists())
+
+    def test_coach_can_create_series_via_web(self):
+        self.assertTrue(self.client.login(username="coach_batch", password="testpass"))
+        response = self.client.post(
+            "/coach/tryouts/series/new/",
+            {
+                "team": self.team.id,
+                "name": "Weeknights",
+                "weekdays": ["1", "3"],
+                "first_date": "2025-04-01",
+                "last_date": "2025-04-10",
+                "location": "Field",
+                "registration_url": "https://example.com",
+            },
+            HTTP_HOST="bc.localhost:8000",
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(TryoutEvent.objects.filter(series__name="Weeknights").count(), 4)
+
+
 class TryoutModelTests(TestCase):
     def test_region_mismatch_validation(self):
         bc = Region.objects.get(code="bc")
@@ -232,6 +404,86 @@ class TryoutModelTests(TestCase):
         )
         with self.assertRaises(ValidationError):
             tryout.full_clean()
+        with self.assertRaises(ValidationError):
+            tryout.save()
+
+
+class TryoutRegionCheckTests(TestCase):
+    def setUp(self):
+        self.bc = Region.objects.get(code="bc")
+        self.on = Region.objects.create(code="on", name="Ontario", is_active=True)
+        self.assoc = Association.objects.create(region=self.bc, name="BC Assoc")
+        self.team = Team.objects.create(region=self.bc, association=self.assoc, name="BC Team", age_group="13U")
+        self.team_15u = Team.objects.create(region=self.bc, association=self.assoc, name="BC 15U", age_group="15U")
+        on_assoc = Association.objects.create(region=self.on, name="ON Assoc")
+        self.team_on = Team.objects.create(region=self.on, association=on_assoc, name="ON Team", age_group="13U")
+
+    def _tryout(self, **kwargs):
+        values = {
+            "region_id": self.bc.id,
+            "association_id": self.assoc.id,
+            "team_id": self.team.id,
+            "name": "Tryout",
+            "start_date": date(2025, 1, 10),
+            "end_date": date(2025, 1, 10),
+            "location": "Field",
+            "registration_url": "https://example.com",
+        }
+        values.update(kwargs)
+        return TryoutEvent(**values)
+
+    def test_save_checks_ids_in_one_query(self):
+        tryout = self._tryout()
+        # Team (for the age group), the association's region, the insert and
+        # its change-feed entry.
+        with self.assertNumQueries(4):
+            tryout.save()
+        self.assertEqual(tryout.age_group, "13U")
+
+    def test_update_fields_save_skips_region_check(self):
+        tryout = self._tryout()
+        tryout.save()
+        tryout = TryoutEvent.objects.get(pk=tryout.pk)
+        tryout.is_active = False
+        # The update and its change-feed entry; no related rows are loaded.
+        with self.assertNumQueries(2):
+            tryout.save(update_fields=["is_active"])
+
+    def test_save_validates_written_fields(self):
+        with self.assertRaises(ValidationError) as raised:
+            self._tryout(registration_url="not a url", name="x" * 201).save()
+        self.assertEqual(set(raised.exception.message_dict), {"registration_url", "name"})
+        self.assertFalse(TryoutEvent.objects.exists())
+
+        tryout = self._tryout()
+        tryout.save()
+        tryout.registration_url = "not a url"
+        tryout.is_active = False
+        tryout.save(update_fields=["is_active"])
+        with self.assertRaises(ValidationError):
+            tryout.save(update_fields=["registration_url"])
+
+    def test_bulk_create_checks_regions_and_sets_age_groups(self):
+        with self.assertRaises(ValidationError):
+            TryoutEvent.objects.bulk_create([self._tryout(), self._tryout(team_id=self.team_on.id)])
+        self.assertFalse(TryoutEvent.objects.exists())
+
+        TryoutEvent.objects.bulk_create([self._tryout(), self._tryout(team_id=self.team_15u.id)])
+        self.assertEqual(sorted(TryoutEvent.objects.values_list("age_group", flat=True)), ["13U", "15U"])
+
+    def test_bulk_update_checks_changed_relations(self):
+        tryout = self._tryout()
+        tryout.save()
+        tryout.team_id = self.team_on.id
+        with self.assertRaises(ValidationError):
+            TryoutEvent.objects.bulk_update([tryout], ["team"])
+        # Fields other than the checked relations are not validated.
+        TryoutEvent.objects.bulk_update([tryout], ["name"])
+
+        tryout.team_id = self.team_15u.id
+        TryoutEvent.objects.bulk_update([tryout], ["team"])
+        tryout.refresh_from_db()
+        self.assertEqual((tryout.team_id, tryout.age_group), (self.team_15u.id, "15U"))
 
 
 class TryoutWebTests(TestCase):
@@ -311,3 +563,107 @@ class TryoutWebTests(TestCase):
         self.assertTrue(self.client.login(username="coach_blocked", password="testpass"))
         response = self.client.get("/coach/tryouts/", HTTP_HOST="bc.localhost:8000")
         self.assertEqual(response.status_code, 403)
+
+
+class TryoutPaginationTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="bc")
+        self.association = Association.objects.create(region=self.region, name="BC Assoc")
+        self.team = Team.objects.create(
+            region=self.region, association=self.association, name="BC Team", age_group="13U", level="AAA"
+        )
+        # Two tryouts share each date, so the name and id break ties.
+        TryoutEvent.objects.bulk_create([
+            TryoutEvent(
+                region=self.region,
+                association=self.association,
+                team=self.team if index % 3 else None,
+                name=f"Tryout {index:02d}",
+                start_date=date(2025, 3, 1 + index // 2),
+                end_date=date(2025, 3, 1 + index // 2),
+                location="Field",
+                registration_url="https://example.com",
+                is_active=True,
+            )
+            for index in range(55)
+        ])
+
+    def _walk(self, url, query=""):
+        names, queries = [], []
+        while query is not None:
+            response = self.client.get(f"{url}?{query}", HTTP_HOST="bc.localhost:8000")
+            page = response.context["page"]
+            names.extend(tryout.name for tryout in page)
+            queries.append(query)
+            query = page.next_query if page.has_next else None
+        return names, queries
+
+    def test_pages_cover_every_tryout_once_without_counting(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/tryouts/", HTTP_HOST="bc.localhost:8000")
+        sql = [query["sql"] for query in queries]
+        self.assertFalse([statement for statement in sql if "COUNT(" in statement])
+        self.assertEqual(len([statement for statement in sql if "LIMIT 26" in statement]), 1)
+        self.assertEqual(len(response.context["tryouts"]), 25)
+        self.assertContains(response, "Next")
+
+        names, _ = self._walk("/tryouts/")
+        expected = list(
+            TryoutEvent.objects.order_by("start_date", "name", "id").values_list("name", flat=True)
+        )
+        self.assertEqual(names, expected)
+
+    def test_previous_page_returns_the_same_rows(self):
+        first = self.client.get("/tryouts/", HTTP_HOST="bc.localhost:8000").context["page"]
+        second = self.client.get(f"/tryouts/?{first.next_query}", HTTP_HOST="bc.localhost:8000").context["page"]
+        back = self.client.get(f"/tryouts/?{second.previous_query}", HTTP_HOST="bc.localhost:8000").context["page"]
+        self.assertEqual([tryout.pk for tryout in back], [tryout.pk for tryout in first])
+        self.assertFalse(back.has_previous)
+
+    def test_filters_are_kept_in_page_links(self):
+        names, queries = self._walk("/tryouts/", "level=AAA&date_from=2025-03-05")
+        self.assertTrue(all("level=AAA" in query and "date_from=2025-03-05" in query for query in queries))
+        self.assertEqual(
+            names,
+            list(
+                TryoutEvent.objects.filter(team__level="AAA", start_date__gte="2025-03-05")
+                .order_by("start_date", "name", "id")
+                .values_list("name", flat=True)
+            ),
+        )
+
+    def test_tampered_cursor_shows_first_page(self):
+        response = self.client.get("/tryouts/?cursor=nonsense", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["tryouts"][0].name, "Tryout 00")
+
+    def test_api_cursor_pages(self):
+        client = APIClient()
+        response = client.get("/api/v1/tryouts/", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(len(response.json()), 55)
+
+        response = client.get("/api/v1/tryouts/?page_size=20", HTTP_HOST="bc.localhost:8000")
+        body = response.json()
+        self.assertEqual(len(body["results"]), 20)
+        self.assertIsNone(body["previous"])
+        names = [tryout["name"] for tryout in body["results"]]
+        while body["next"]:
+            body = client.get(body["next"], HTTP_HOST="bc.localhost:8000").json()
+            names.extend(tryout["name"] for tryout in body["results"])
+        self.assertEqual(len(names), 55)
+        self.assertEqual(len(set(names)), 55)
+
+        response = client.get("/api/v1/tryouts/?cursor=nonsense", HTTP_HOST="bc.localhost:8000")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cached_rows_change_with_the_tryout_and_its_team(self):
+        self.client.get("/tryouts/", HTTP_HOST="bc.localhost:8000")
+        tryout = TryoutEvent.objects.get(name="Tryout 01")
+        tryout.name = "Renamed Tryout"
+        tryout.save()
+        self.team.level = "AA"
+        self.team.save()
+
+        response = self.client.get("/tryouts/", HTTP_HOST="bc.localhost:8000")
+        self.assertContains(response, "Renamed Tryout")
+        self.assertNotContains(response, "AAA")
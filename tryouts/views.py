@@ -1,47 +1,69 @@
-from rest_framework import serializers, status
+from rest_framework import mixins, serializers, status
+from rest_framework.decorators import action, permission_classes
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import GenericViewSet
 
+from api.async_views import async_api_view, split_by_method
+from api.pagination import InvalidCursor, page_response_data, page_size, wants_page
 from contacts.models import AuditLog
+from profiles.models import PlayerProfile
+from regions.age_groups import age_group_for, normalize_age_group
 from regions.utils import RegionScopedQuerysetMixin
-from tryouts.models import TryoutEvent
+from tryouts.directory import TRYOUT_KEYSET
+from tryouts.models import TryoutEvent, TryoutSeries
 from tryouts.permissions import TryoutWritePermission
-from tryouts.serializers import TryoutEventSerializer
+from tryouts.scheduling import build_tryouts, save_tryouts, series_errors, series_rows
+from tryouts.serializers import TryoutBulkCreateSerializer, TryoutEventSerializer, TryoutSeriesSerializer
 
 
-class TryoutEventViewSet(RegionScopedQuerysetMixin, ModelViewSet):
+def _request_region_or_error(request):
+    region = getattr(request, "region", None)
+    if region is None:
+        raise serializers.ValidationError("Region is required.")
+    return region
+
+
+def _may_skip_team(user) -> bool:
+    return user.is_staff or user.is_superuser
+
+
+def filter_tryouts(queryset, params, age_group=None):
+    """Apply the public tryout list filters; ``age_group`` is already resolved."""
+    level = params.get("level")
+    date_from = params.get("date_from")
+    date_to = params.get("date_to")
+    if age_group:
+        queryset = queryset.filter(age_group=normalize_age_group(age_group))
+    if level:
+        queryset = queryset.filter(team__level=level)
+    if date_from:
+        queryset = queryset.filter(start_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(start_date__lte=date_to)
+    return queryset
+
+
+class TryoutEventViewSet(
+    RegionScopedQuerysetMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """Tryout writes and detail reads; listing is the async ``tryout_list``."""
+
     queryset = TryoutEvent.objects.filter(is_active=True).order_by("start_date")
     serializer_class = TryoutEventSerializer
     permission_classes = [TryoutWritePermission]
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        params = self.request.query_params
-        age_group = params.get("age_group")
-        level = params.get("level")
-        date_from = params.get("date_from")
-        date_to = params.get("date_to")
-
-        if age_group:
-            queryset = queryset.filter(team__age_group=age_group)
-        if level:
-            queryset = queryset.filter(team__level=level)
-        if date_from:
-            queryset = queryset.filter(start_date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(start_date__lte=date_to)
-
-        return queryset
-
     def perform_create(self, serializer):
-        region = getattr(self.request, "region", None)
-        if region is None:
-            raise serializers.ValidationError("Region is required.")
+        region = _request_region_or_error(self.request)
 
         team = serializer.validated_data.get("team")
         association = serializer.validated_data.get("association")
         if team is None:
-            if not (self.request.user.is_staff or self.request.user.is_superuser):
+            if not _may_skip_team(self.request.user):
                 raise serializers.ValidationError({"team": "Team is required."})
             if association is None:
                 raise serializers.ValidationError({"association": "Association is required."})
@@ -63,6 +85,19 @@ class TryoutEventViewSet(RegionScopedQuerysetMixin, ModelViewSet):
             region=region,
         )
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        """Create up to ``MAX_BATCH_SIZE`` tryouts in one batch with one audit entry."""
+        region = _request_region_or_error(request)
+        serializer = TryoutBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data["tryouts"]
+        events, errors = build_tryouts(region, rows, allow_without_team=_may_skip_team(request.user))
+        if any(errors):
+            raise serializers.ValidationError({"tryouts": errors})
+        save_tryouts(region, events, request.user)
+        return Response(TryoutEventSerializer(events, many=True).data, status=status.HTTP_201_CREATED)
+
     def perform_update(self, serializer):
         region = getattr(self.request, "region", None)
         if region is None:
@@ -99,3 +134,75 @@ class TryoutEventViewSet(RegionScopedQuerysetMixin, ModelViewSet):
             region=instance.region,
         )
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TryoutSeriesViewSet(
+    RegionScopedQuerysetMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
+    queryset = TryoutSeries.objects.prefetch_related("events").order_by("first_date")
+    serializer_class = TryoutSeriesSerializer
+    permission_classes = [TryoutWritePermission]
+
+    def perform_create(self, serializer):
+        region = _request_region_or_error(self.request)
+        data = serializer.validated_data
+        series = TryoutSeries(region=region, created_by=self.request.user, **data)
+        if series.team is not None:
+            series.association_id = series.team.association_id
+        errors = series_errors(series)
+        if not errors:
+            events, row_errors = build_tryouts(
+                region,
+                series_rows(series),
+                allow_without_team=_may_skip_team(self.request.user),
+            )
+            errors = next((row for row in row_errors if row), {})
+        if errors:
+            raise serializers.ValidationError(errors)
+        save_tryouts(region, events, self.request.user, series=series)
+        serializer.instance = series
+
+
+@async_api_view(["GET"])
+@permission_classes([TryoutWritePermission])
+async def tryout_list(request):
+    """Active tryouts; ``cursor``/``page_size`` switch to keyset pages (``{next, previous, results}``)."""
+    region = getattr(request, "region", None)
+    paginated = wants_page(request.query_params)
+    queryset = TryoutEventViewSet.queryset.all()
+    if region is not None:
+        queryset = queryset.filter(region=region)
+
+    age_group = request.query_params.get("age_group")
+    if age_group == "mine":
+        age_group = ""
+        if region is not None and request.user.is_authenticated:
+            birth_year = await (
+                PlayerProfile.objects.filter(user=request.user).values_list("birth_year", flat=True).afirst()
+            )
+            age_group = age_group_for(birth_year, region)
+        if not age_group:
+            return Response(page_response_data(request, None, []) if paginated else [])
+
+    queryset = filter_tryouts(queryset, request.query_params, age_group)
+    if paginated:
+        try:
+            page = await TRYOUT_KEYSET.apaginate(
+                queryset,
+                request.query_params.get("cursor"),
+                page_size(request.query_params),
+                request.query_params,
+            )
+        except InvalidCursor as exc:
+            raise serializers.ValidationError({"cursor": str(exc)})
+        return Response(page_response_data(request, page, TryoutEventSerializer(page.items, many=True).data))
+
+    tryouts = [tryout async for tryout in queryset]
+    return Response(TryoutEventSerializer(tryouts, many=True).data)
+
+
+tryout_collection = split_by_method(tryout_list, TryoutEventViewSet.as_view({"post": "create"}))
@@ -4,10 +4,14 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
 from accounts.web_helpers import get_region_or_404, require_approved_coach
+from api.pagination import paginate_request
 from contacts.models import AuditLog
 from organizations.models import Team
-from tryouts.forms import TryoutEventForm
+from regions.age_groups import normalize_age_group
+from tryouts.directory import TRYOUT_KEYSET, tryout_facets
+from tryouts.forms import TryoutEventForm, TryoutSeriesForm
 from tryouts.models import TryoutEvent
+from tryouts.scheduling import build_tryouts, save_tryouts, series_errors, series_rows
 
 
 def _get_region(request):
@@ -20,13 +24,11 @@ def tryout_list(request):
     region = _get_region(request)
     if region is None:
         queryset = TryoutEvent.objects.none()
-        base_queryset = queryset
     else:
-        queryset = TryoutEvent.objects.filter(region=region, is_active=True).order_by(
-            "start_date",
-            "name",
+        queryset = TryoutEvent.objects.filter(region=region, is_active=True).select_related(
+            "association",
+            "team",
         )
-        base_queryset = TryoutEvent.objects.filter(region=region, is_active=True)
 
     age_group = request.GET.get("age_group") or ""
     level = request.GET.get("level") or ""
@@ -34,7 +36,7 @@ def tryout_list(request):
     date_to = request.GET.get("date_to") or ""
 
     if age_group:
-        queryset = queryset.filter(team__age_group=age_group)
+        queryset = queryset.filter(age_group=normalize_age_group(age_group))
     if level:
         queryset = queryset.filter(team__level=level)
     if date_from:
@@ -42,22 +44,14 @@ def tryout_list(request):
     if date_to:
         queryset = queryset.filter(start_date__lte=date_to)
 
-    age_groups = (
-        base_queryset.filter(team__isnull=False)
-        .values_list("team__age_group", flat=True)
-        .distinct()
-    )
-    levels = (
-        base_queryset.filter(team__isnull=False)
-        .exclude(team__level="")
-        .values_list("team__level", flat=True)
-        .distinct()
-    )
+    facets = tryout_facets(region) if region is not None else {"age_groups": [], "levels": []}
+    page = paginate_request(request, queryset, TRYOUT_KEYSET)
 
     context = {
-        "tryouts": queryset,
-        "age_groups": sorted(age_groups),
-        "levels": sorted(levels),
+        "tryouts": page.items,
+        "page": page,
+        "age_groups": facets["age_groups"],
+        "levels": facets["levels"],
         "filters": {
             "age_group": age_group,
             "level": level,
@@ -113,9 +107,11 @@ def coach_tryout_list(request):
         region=region,
         team__in=teams,
         is_active=True,
-    ).order_by("start_date", "name")
+    ).select_related("team")
+    page = paginate_request(request, tryouts, TRYOUT_KEYSET)
     context = {
-        "tryouts": tryouts,
+        "tryouts": page.items,
+        "page": page,
         "page_title": "My Tryouts",
         "page_subtitle": "Manage tryouts for your teams.",
     }
@@ -151,6 +147,39 @@ def coach_tryout_create(request):
     return render(request, "coaches/tryout_form.html", context)
 
 
+@require_approved_coach
+def coach_tryout_series_create(request):
+    region = get_region_or_404(request)
+    teams = _coach_teams_queryset(request.user, region)
+    if not teams.exists():
+        raise Http404
+
+    if request.method == "POST":
+        form = TryoutSeriesForm(request.POST, team_queryset=teams)
+        if form.is_valid():
+            series = form.save(commit=False)
+            series.region = region
+            series.association = series.team.association
+            series.created_by = request.user
+            errors = series_errors(series)
+            for field, message in errors.items():
+                form.add_error(field, message)
+            if not errors:
+                events, _ = build_tryouts(region, series_rows(series))
+                save_tryouts(region, events, request.user, series=series)
+                messages.success(request, f"Created {len(events)} tryouts.")
+                return redirect("coach_tryout_list")
+    else:
+        form = TryoutSeriesForm(team_queryset=teams)
+
+    context = {
+        "form": form,
+        "page_title": "New Tryout Series",
+        "page_subtitle": "Schedule the same tryout on several days at once.",
+    }
+    return render(request, "coaches/tryout_series_form.html", context)
+
+
 @require_approved_coach
 def coach_tryout_edit(request, tryout_id: int):
     region = get_region_or_404(request)